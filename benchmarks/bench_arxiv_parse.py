@@ -0,0 +1,92 @@
+"""Compare the streaming arXiv Atom parser with the previous feedparser path.
+
+Usage:
+    python benchmarks/bench_arxiv_parse.py [recorded_feed.xml]
+
+Without an argument a 2,000-entry feed in the arXiv API format is generated.
+A recorded feed can be captured with e.g.
+    curl -o feed.xml "http://export.arxiv.org/api/query?search_query=all:learning&max_results=2000"
+"""
+from __future__ import annotations
+
+import io
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import feedparser
+from dateutil import parser as date_parser
+
+from papers_digest.sources.arxiv import entry_to_paper, iter_feed_entries
+
+_WORDS = (
+    "transformer diffusion graph neural network retrieval multimodal reinforcement learning "
+    "benchmark robust efficient sparse attention language model vision contrastive"
+).split()
+
+
+def synthetic_feed(entries: int = 2000) -> bytes:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+        "  <title>ArXiv Query</title>\n  <id>http://arxiv.org/api/benchmark</id>\n"
+    ]
+    day = date(2026, 1, 22)
+    for idx in range(entries):
+        words = [_WORDS[(idx * 7 + k) % len(_WORDS)] for k in range(120)]
+        published = (day - timedelta(days=idx // 400)).isoformat()
+        parts.append(
+            "  <entry>\n"
+            f"    <id>http://arxiv.org/abs/2601.{idx:05d}v1</id>\n"
+            f"    <updated>{published}T12:00:00Z</updated>\n"
+            f"    <published>{published}T12:00:00Z</published>\n"
+            f"    <title>{escape(' '.join(words[:10]).title())}</title>\n"
+            f"    <summary>{escape(' '.join(words))}.</summary>\n"
+            + "".join(f"    <author><name>Author {idx}-{a}</name></author>\n" for a in range(4))
+            + f'    <link href="http://arxiv.org/abs/2601.{idx:05d}v1" rel="alternate" type="text/html"/>\n'
+            f'    <link title="pdf" href="http://arxiv.org/pdf/2601.{idx:05d}v1" rel="related" type="application/pdf"/>\n'
+            "  </entry>\n"
+        )
+    parts.append("</feed>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def parse_feedparser(content: bytes) -> int:
+    feed = feedparser.parse(content)
+    count = 0
+    for entry in feed.entries:
+        date_parser.parse(entry.published).date()
+        _ = (entry.id, entry.title.strip(), entry.summary.strip(), [a.name for a in entry.authors], entry.link)
+        count += 1
+    return count
+
+
+def parse_streaming(content: bytes) -> int:
+    return sum(1 for entry in iter_feed_entries(io.BytesIO(content)) if entry_to_paper(entry, "arxiv"))
+
+
+def _measure(name: str, parse, content: bytes, repeat: int = 3) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = parse(content)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {count:>6} entries  {best * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MiB")
+
+
+def main() -> None:
+    content = Path(sys.argv[1]).read_bytes() if len(sys.argv) > 1 else synthetic_feed()
+    print(f"feed size: {len(content) / 1024 / 1024:.1f} MiB")
+    _measure("feedparser", parse_feedparser, content)
+    _measure("streaming", parse_streaming, content)
+
+
+if __name__ == "__main__":
+    main()
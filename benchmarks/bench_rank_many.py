@@ -0,0 +1,62 @@
+"""Rank many channel queries against one day's pool: one pass vs. one ranking per channel.
+
+Usage:
+    python benchmarks/bench_rank_many.py [papers] [channels]
+
+Defaults to 20,000 synthetic papers and 500 channels with 2-4 word areas.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import date
+
+from papers_digest.models import Paper
+from papers_digest.ranking import CorpusIndex, ScoredPaper, top_k
+
+_VOCABULARY = [f"term{idx}" for idx in range(5000)]
+
+
+def synthetic_pool(papers: int, rng: random.Random) -> list[Paper]:
+    day = date(2026, 1, 22)
+    return [
+        Paper(
+            paper_id=str(idx),
+            title=" ".join(rng.choices(_VOCABULARY, k=10)),
+            abstract=" ".join(rng.choices(_VOCABULARY, k=150)),
+            authors=["A"],
+            url="",
+            published_date=day,
+            source="bench",
+        )
+        for idx in range(papers)
+    ]
+
+
+def main() -> None:
+    papers = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    channels = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = random.Random(7)
+    pool = synthetic_pool(papers, rng)
+    queries = {f"@channel{idx}": " ".join(rng.choices(_VOCABULARY, k=rng.randint(2, 4))) for idx in range(channels)}
+
+    started = time.perf_counter()
+    index = CorpusIndex(pool)
+    print(f"index        {papers:>6} papers    {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+    started = time.perf_counter()
+    index.rank_many(queries, 8)
+    print(f"rank_many    {channels:>6} channels  {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+    sample = list(queries.values())[:50]
+    started = time.perf_counter()
+    for query in sample:
+        scores = index.scores(query)
+        top_k((ScoredPaper(index.papers[idx], score) for idx, score in scores.items()), 8)
+    per_query = (time.perf_counter() - started) / len(sample)
+    print(f"per channel  {channels:>6} channels  {per_query * channels * 1000:8.1f} ms (extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-from .pipeline import run_digest
-
-__all__ = ["run_digest"]
+from .pipeline import arun_digest, iter_digest_batch, run_digest, run_digest_batch, stream_digest
 
+__all__ = ["arun_digest", "iter_digest_batch", "run_digest", "run_digest_batch", "stream_digest"]
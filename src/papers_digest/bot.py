@@ -1,19 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import partial
+from itertools import chain
+from typing import AsyncIterator, Callable, Iterator, TypeVar
 from zoneinfo import ZoneInfo
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.constants import ChatType
-from telegram.error import NetworkError, TelegramError, TimedOut
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError, TimedOut
 from telegram.ext import Application, CommandHandler, ContextTypes
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from papers_digest.health import CLOSED, get_health_registry
 from papers_digest.metrics import get_metrics_collector
-from papers_digest.pipeline import run_digest
+from papers_digest.pipeline import iter_digest_batch, run_digest, stream_digest
 from papers_digest.settings import (
     Settings,
     ChannelConfig,
@@ -23,10 +29,26 @@ from papers_digest.settings import (
     add_channel,
     remove_channel,
 )
-from papers_digest.summarizer import OllamaSummarizer, OpenAISummarizer, SimpleSummarizer, Summarizer
+from papers_digest.store import PaperStore, get_paper_store
+from papers_digest.summarizer import (
+    ExtractiveSummarizer,
+    OllamaSummarizer,
+    OpenAISummarizer,
+    SimpleSummarizer,
+    Summarizer,
+)
 
 logger = logging.getLogger(__name__)
 _SCHEDULER: AsyncIOScheduler | None = None
+# Digest builds block for the whole fetch-and-summarize time, so they run here
+# instead of on the event loop; only the Telegram calls stay on the loop.
+_DIGEST_EXECUTOR: ThreadPoolExecutor | None = None
+# Background tasks that keep editing progressively published digests.
+_REVISION_TASKS: set[asyncio.Task] = set()
+# How long a published digest keeps being edited while LLM summaries are still coming in.
+_MAX_REVISION_TIME = 15 * 60
+
+_T = TypeVar("_T")
 
 
 def _admin_ids() -> set[int]:
@@ -391,6 +413,11 @@ async def show_metrics(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             if daily_summary['sources_used']:
                 msg += f"Источники: {', '.join(sorted(daily_summary['sources_used']))}\n"
         
+        unhealthy = {name: state for name, state in get_health_registry().states().items() if state != CLOSED}
+        if unhealthy:
+            msg += "\n⚠️ Отключенные источники: "
+            msg += ", ".join(f"{name} ({state})" for name, state in sorted(unhealthy.items())) + "\n"
+        
         if system_metrics.last_digest_time:
             from datetime import datetime
             last_time = datetime.fromisoformat(system_metrics.last_digest_time)
@@ -407,6 +434,8 @@ def _pick_summarizer(config: ChannelConfig | Settings) -> Summarizer:
     use_llm = config.use_llm if isinstance(config, ChannelConfig) else config.use_llm
     provider = config.summarizer_provider if isinstance(config, ChannelConfig) else (config.summarizer_provider or "auto")
     
+    if provider == "extractive":
+        return ExtractiveSummarizer()
     if use_llm and provider == "openai" and api_key:
         return OpenAISummarizer(api_key)
     if use_llm and provider == "ollama":
@@ -418,62 +447,280 @@ def _pick_summarizer(config: ChannelConfig | Settings) -> Summarizer:
     return SimpleSummarizer()
 
 
-def _build_digest(config: ChannelConfig) -> list[str]:
-    """Build digest for a specific channel configuration."""
+def _digest_store() -> PaperStore | None:
+    """The local paper store when digests should be built from ingested papers."""
+    if os.getenv("PAPERS_DIGEST_USE_STORE", "").lower() in ("1", "true", "yes"):
+        return get_paper_store()
+    return None
+
+
+def _progressive() -> bool:
+    """Whether digests are posted with extractive summaries first and edited as LLM summaries arrive."""
+    return os.getenv("PAPERS_DIGEST_PROGRESSIVE", "").lower() in ("1", "true", "yes")
+
+
+class _Revisions:
+    """Latest re-rendered parts of a published digest, handed from summarizer threads to the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._changed = asyncio.Event()
+        self.parts: list[str] | None = None
+        self.final = False
+
+    def push(self, parts: list[str], final: bool) -> None:
+        """Record a new revision; safe to call from any thread."""
+        self._loop.call_soon_threadsafe(self._set, parts, final)
+
+    def _set(self, parts: list[str], final: bool) -> None:
+        self.parts, self.final = parts, final
+        self._changed.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a revision newer than the last one waited for; ``False`` on timeout."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+
+def _channel_query(config: ChannelConfig) -> str:
     query = config.science_area.strip()
     if not query:
         raise ValueError(f"Область науки не установлена для канала {config.channel_id}. Используйте /channel_set_area.")
-    return run_digest(query=query, target_date=date.today(), limit=8, summarizer=_pick_summarizer(config))
+    return query
 
 
-async def _safe_send_message(
+def _stream_digest(config: ChannelConfig) -> Iterator[str]:
+    """Digest parts of a channel, each built only when it is asked for (see ``stream_digest``)."""
+    return stream_digest(
+        query=_channel_query(config), target_date=date.today(), limit=8, summarizer=_pick_summarizer(config),
+        store=_digest_store(),
+    )
+
+
+def _build_digest(config: ChannelConfig, revisions: _Revisions | None = None) -> list[str]:
+    """Build digest for a specific channel configuration.
+
+    With ``revisions`` the digest is returned without waiting for LLM
+    summaries, and later versions are pushed to ``revisions``.
+    """
+    query = _channel_query(config)
+    if revisions is None:
+        return run_digest(
+            query=query, target_date=date.today(), limit=8, summarizer=_pick_summarizer(config), store=_digest_store()
+        )
+    return run_digest(
+        query=query, target_date=date.today(), limit=8, summarizer=_pick_summarizer(config), store=_digest_store(),
+        summary_deadline=0, on_revision=revisions.push,
+    )
+
+
+def _build_digests(
+    configs: list[ChannelConfig], revisions: dict[str, _Revisions] | None = None
+) -> Iterator[tuple[str, list[str]]]:
+    """Build digests for several channels at once, sharing upstream requests between them.
+
+    Digests are yielded per channel as soon as each is ready (see ``iter_digest_batch``).
+    """
+    queries = {config.channel_id: config.science_area.strip() for config in configs}
+    summarizers = {config.channel_id: _pick_summarizer(config) for config in configs}
+    if revisions is None:
+        return iter_digest_batch(
+            queries, target_date=date.today(), limit=8, summarizers=summarizers, store=_digest_store()
+        )
+    return iter_digest_batch(
+        queries, target_date=date.today(), limit=8, summarizers=summarizers, store=_digest_store(),
+        summary_deadline=0, on_revision=lambda key, parts, final: revisions[key].push(parts, final),
+    )
+
+
+def _digest_executor() -> ThreadPoolExecutor:
+    global _DIGEST_EXECUTOR
+    if _DIGEST_EXECUTOR is None:
+        workers = max(1, int(os.getenv("PAPERS_DIGEST_BOT_WORKERS", "2")))
+        _DIGEST_EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="digest")
+    return _DIGEST_EXECUTOR
+
+
+async def _in_executor(func: Callable[..., _T], *args: object) -> _T:
+    """Run a blocking digest build on the digest executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_digest_executor(), partial(func, *args))
+
+
+async def _start_digest(config: ChannelConfig, revisions: _Revisions | None) -> list[str] | Iterator[str]:
+    """Digest parts of a channel, ready to send.
+
+    With ``revisions`` the whole digest is built first (with extractive
+    summaries) and edited later. Otherwise it is streamed: only the first
+    part is built here, so build errors still surface to the caller, and
+    later parts are built while the earlier ones are being sent.
+    """
+    if revisions is not None:
+        return await _in_executor(_build_digest, config, revisions)
+    parts = _stream_digest(config)
+    first = await _in_executor(next, parts, None)
+    return chain([first], parts) if first is not None else iter(())
+
+
+async def _send_message(
     bot, chat_id: str | int, text: str, parse_mode: str | None = "MarkdownV2", max_retries: int = 3
-) -> bool:
-    """Safely send a message with retry logic."""
+) -> int | None:
+    """Send a message with retry logic; returns its message id, or ``None`` if it could not be sent."""
     # Ensure text doesn't exceed Telegram limit
     if len(text) > 4096:
         text = text[:4093] + "..."
     
     for attempt in range(max_retries):
         try:
-            await bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
-            return True
+            message = await bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+            return message.message_id
         except (TimedOut, NetworkError) as e:
             logger.warning(f"Network error sending message (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt == max_retries - 1:
                 logger.error(f"Failed to send message after {max_retries} attempts")
-                return False
+                return None
         except TelegramError as e:
             logger.error(f"Telegram error sending message: {e}")
             # Try without parse_mode if MarkdownV2 fails
             if parse_mode == "MarkdownV2" and attempt == 0:
                 try:
-                    await bot.send_message(chat_id=chat_id, text=text, parse_mode=None)
-                    return True
+                    message = await bot.send_message(chat_id=chat_id, text=text, parse_mode=None)
+                    return message.message_id
                 except Exception:
                     pass
-            return False
+            return None
+    return None
+
+
+async def _safe_send_message(
+    bot, chat_id: str | int, text: str, parse_mode: str | None = "MarkdownV2", max_retries: int = 3
+) -> bool:
+    """Safely send a message with retry logic."""
+    return await _send_message(bot, chat_id, text, parse_mode, max_retries) is not None
+
+
+async def _safe_edit_message(bot, chat_id: str | int, message_id: int, text: str) -> bool:
+    """Replace the text of a sent message, waiting out Telegram's flood control once."""
+    if len(text) > 4096:
+        text = text[:4093] + "..."
+    for parse_mode in ("MarkdownV2", None):
+        for attempt in range(2):
+            try:
+                await bot.edit_message_text(text=text, chat_id=chat_id, message_id=message_id, parse_mode=parse_mode)
+                return True
+            except RetryAfter as e:
+                if attempt:
+                    return False
+                retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+                await asyncio.sleep(retry_after)
+            except BadRequest as e:
+                if "not modified" in str(e).lower():
+                    return True
+                logger.warning(f"Failed to edit message {message_id} in {chat_id} ({parse_mode}): {e}")
+                break
+            except TelegramError as e:
+                logger.warning(f"Failed to edit message {message_id} in {chat_id}: {e}")
+                return False
     return False
 
 
-async def _send_multiple_messages(bot, chat_id: str | int, messages: list[str], record_metrics: bool = True) -> tuple[bool, int, int]:
-    """Send multiple messages sequentially. Returns (success, parts_sent, total_chars)."""
+async def _apply_revision(
+    bot, chat_id: str | int, message_ids: list[int], sent: list[str], parts: list[str]
+) -> None:
+    """Bring a published digest to ``parts``: edit changed messages, send extra parts, delete surplus ones."""
+    for idx, part in enumerate(parts):
+        if idx < len(message_ids):
+            if sent[idx] != part and await _safe_edit_message(bot, chat_id, message_ids[idx], part):
+                sent[idx] = part
+            continue
+        message_id = await _send_message(bot, chat_id, part)
+        if message_id is not None:
+            message_ids.append(message_id)
+            sent.append(part)
+    while len(message_ids) > max(len(parts), 1):
+        try:
+            await bot.delete_message(chat_id=chat_id, message_id=message_ids[-1])
+        except TelegramError as e:
+            logger.warning(f"Failed to delete surplus digest message in {chat_id}: {e}")
+            break
+        message_ids.pop()
+        sent.pop()
+
+
+async def _follow_revisions(
+    bot, chat_id: str | int, message_ids: list[int], sent: list[str], revisions: _Revisions
+) -> None:
+    """Edit a published digest as its LLM summaries arrive.
+
+    Revisions are coalesced: after each round of edits the task waits
+    ``PAPERS_DIGEST_EDIT_INTERVAL`` seconds and then applies only the latest
+    revision, which keeps a channel well under Telegram's edit rate limits.
+    """
+    interval = float(os.getenv("PAPERS_DIGEST_EDIT_INTERVAL", "10"))
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + _MAX_REVISION_TIME
+    while await revisions.wait(max(0.0, give_up_at - loop.time())):
+        final = revisions.final
+        await _apply_revision(bot, chat_id, message_ids, sent, revisions.parts or [])
+        if final:
+            logger.info(f"Digest in {chat_id} updated with LLM summaries")
+            return
+        await asyncio.sleep(interval)
+    logger.warning(f"Stopped updating digest in {chat_id}: LLM summaries still pending")
+
+
+async def _digest_parts(messages: list[str] | Iterator[str]) -> AsyncIterator[str]:
+    """Parts of a digest; parts of a streamed one are built on the digest executor."""
+    if isinstance(messages, list):
+        for message in messages:
+            yield message
+        return
+    while (message := await _in_executor(next, messages, None)) is not None:
+        yield message
+
+
+async def _send_multiple_messages(
+    bot,
+    chat_id: str | int,
+    messages: list[str] | Iterator[str],
+    record_metrics: bool = True,
+    revisions: _Revisions | None = None,
+) -> tuple[bool, int, int]:
+    """Send multiple messages sequentially. Returns (success, parts_sent, total_chars).
+
+    ``messages`` may be a streamed digest, whose parts are then built while
+    the earlier ones are being sent. With ``revisions`` the sent messages keep
+    being edited in the background as later versions of the digest arrive.
+    """
     success = True
     parts_sent = 0
     total_chars = 0
     error_message = ""
+    message_ids: list[int] = []
+    sent: list[str] = []
     
-    for msg in messages:
-        if await _safe_send_message(bot, chat_id, msg):
-            parts_sent += 1
-            total_chars += len(msg)
-        else:
-            success = False
-            if not error_message:
-                error_message = "Failed to send some parts"
-            # Small delay between messages to avoid rate limiting
-            import asyncio
-            await asyncio.sleep(0.5)
+    try:
+        async for msg in _digest_parts(messages):
+            sent.append(msg)
+            message_id = await _send_message(bot, chat_id, msg)
+            if message_id is not None:
+                message_ids.append(message_id)
+                parts_sent += 1
+                total_chars += len(msg)
+            else:
+                success = False
+                if not error_message:
+                    error_message = "Failed to send some parts"
+                # Small delay between messages to avoid rate limiting
+                await asyncio.sleep(0.5)
+    except Exception as e:
+        logger.error(f"Failed to build the rest of the digest for {chat_id}: {e}", exc_info=True)
+        success = False
+        error_message = error_message or f"Failed to build digest: {e}"
     
     if record_metrics:
         try:
@@ -488,6 +735,10 @@ async def _send_multiple_messages(bot, chat_id: str | int, messages: list[str],
         except Exception as e:
             logger.warning(f"Failed to record post metrics: {e}", exc_info=True)
     
+    if revisions is not None and success:
+        task = asyncio.create_task(_follow_revisions(bot, chat_id, message_ids, sent, revisions))
+        _REVISION_TASKS.add(task)
+        task.add_done_callback(_REVISION_TASKS.discard)
     return success, parts_sent, total_chars
 
 
@@ -516,8 +767,10 @@ async def preview_today(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
                 summarizer_provider=settings.summarizer_provider,
             )
     
+    await _safe_send_message(context.bot, update.effective_chat.id, "Готовлю дайджест, это может занять пару минут…", parse_mode=None)
+    revisions = _Revisions(asyncio.get_running_loop()) if _progressive() else None
     try:
-        digest_parts = _build_digest(config)
+        digest_parts = await _start_digest(config, revisions)
     except ValueError as exc:
         await _safe_send_message(context.bot, update.effective_chat.id, str(exc), parse_mode=None)
         return
@@ -527,7 +780,9 @@ async def preview_today(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             context.bot, update.effective_chat.id, f"Ошибка генерации дайджеста: {e}. Некоторые источники могут быть недоступны.", parse_mode=None
         )
         return
-    success, _, _ = await _send_multiple_messages(context.bot, update.effective_chat.id, digest_parts, record_metrics=False)
+    success, _, _ = await _send_multiple_messages(
+        context.bot, update.effective_chat.id, digest_parts, record_metrics=False, revisions=revisions
+    )
     if not success:
         await _safe_send_message(context.bot, update.effective_chat.id, "Дайджест сгенерирован, но не удалось отправить некоторые части. Проверьте логи.", parse_mode=None)
 
@@ -562,8 +817,10 @@ async def post_today(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
                 summarizer_provider=settings.summarizer_provider,
             )
     
+    await _safe_send_message(context.bot, update.effective_chat.id, "Готовлю дайджест, это может занять пару минут…", parse_mode=None)
+    revisions = _Revisions(asyncio.get_running_loop()) if _progressive() else None
     try:
-        digest_parts = _build_digest(config)
+        digest_parts = await _start_digest(config, revisions)
     except ValueError as exc:
         await _safe_send_message(context.bot, update.effective_chat.id, str(exc), parse_mode=None)
         return
@@ -573,7 +830,9 @@ async def post_today(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
             context.bot, update.effective_chat.id, f"Ошибка генерации дайджеста: {e}. Некоторые источники могут быть недоступны.", parse_mode=None
         )
         return
-    success, parts_sent, total_chars = await _send_multiple_messages(context.bot, channel_id, digest_parts)
+    success, parts_sent, total_chars = await _send_multiple_messages(
+        context.bot, channel_id, digest_parts, revisions=revisions
+    )
     if success:
         await _safe_send_message(context.bot, update.effective_chat.id, f"Опубликовано в канале {channel_id} ({parts_sent} частей, {total_chars} символов).", parse_mode=None)
     else:
@@ -640,12 +899,12 @@ async def set_summarizer(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not await _require_admin(update):
         return
     value = " ".join(context.args).strip().lower()
-    if value not in {"auto", "openai", "ollama", "simple"}:
-        await update.message.reply_text("Использование: /set_summarizer auto|openai|ollama|simple")
+    if value not in {"auto", "openai", "ollama", "extractive", "simple"}:
+        await update.message.reply_text("Использование: /set_summarizer auto|openai|ollama|extractive|simple")
         return
     settings = load_settings()
     settings.summarizer_provider = value
-    if value == "simple":
+    if value in ("extractive", "simple"):
         settings.use_llm = False
     save_settings(settings)
     await update.message.reply_text(f"Саммаризатор установлен: {value}")
@@ -664,23 +923,42 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
             logger.error("Failed to send error message to user")
 
 
-async def _scheduled_post(app: Application, channel_id: str) -> None:
-    """Post digest to a specific channel."""
+async def _scheduled_post(app: Application, channel_ids: list[str]) -> None:
+    """Post digests to all channels scheduled for the same time, built in one batch."""
     settings = load_settings()
-    config = get_channel_config(settings, channel_id)
-    if not config or not config.enabled:
-        return
-    if not config.post_time:
+    configs = []
+    for channel_id in channel_ids:
+        config = get_channel_config(settings, channel_id)
+        if not config or not config.enabled or not config.post_time:
+            continue
+        if not config.science_area.strip():
+            logger.warning(f"Scheduled post skipped for {channel_id}: science area not set")
+            continue
+        configs.append(config)
+    if not configs:
         return
+    revisions = None
+    if _progressive():
+        loop = asyncio.get_running_loop()
+        revisions = {config.channel_id: _Revisions(loop) for config in configs}
+    # Each channel is sent as soon as its digest is ready, while the others are still being built.
+    sends: list[asyncio.Task] = []
     try:
-        digest_parts = _build_digest(config)
-    except ValueError:
-        logger.warning(f"Scheduled post skipped for {channel_id}: science area not set")
-        return
+        digests = _build_digests(configs, revisions)
+        while (digest := await _in_executor(next, digests, None)) is not None:
+            channel_id, parts = digest
+            sends.append(asyncio.create_task(
+                _send_scheduled_post(app, channel_id, parts, revisions[channel_id] if revisions else None)
+            ))
     except Exception as e:
-        logger.error(f"Scheduled post failed for {channel_id}: {e}", exc_info=True)
-        return
-    success, parts_sent, total_chars = await _send_multiple_messages(app.bot, channel_id, digest_parts)
+        logger.error(f"Scheduled post failed for {', '.join(c.channel_id for c in configs)}: {e}", exc_info=True)
+    await asyncio.gather(*sends)
+
+
+async def _send_scheduled_post(
+    app: Application, channel_id: str, parts: list[str], revisions: _Revisions | None
+) -> None:
+    success, parts_sent, total_chars = await _send_multiple_messages(app.bot, channel_id, parts, revisions=revisions)
     if not success:
         logger.error(f"Failed to send scheduled post to channel {channel_id}")
     else:
@@ -700,12 +978,22 @@ async def _post_init(app: Application) -> None:
         _SCHEDULER.start()
 
 
+async def _post_shutdown(app: Application) -> None:
+    """Stop the digest executor; builds still running are left to finish in the background."""
+    global _DIGEST_EXECUTOR
+    if _DIGEST_EXECUTOR is not None:
+        _DIGEST_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _DIGEST_EXECUTOR = None
+
+
 def _apply_schedule(scheduler: AsyncIOScheduler, app: Application) -> None:
     """Apply schedule for all channels."""
     settings = load_settings()
     scheduler.remove_all_jobs()
     
-    # Schedule posts for each channel
+    # Channels posting at the same local time share one job, so their digests
+    # are built in a single batch with shared upstream requests.
+    groups: dict[tuple[int, int, str], list[str]] = {}
     for channel_id, config in settings.channels.items():
         if not config.enabled or not config.post_time:
             continue
@@ -715,23 +1003,26 @@ def _apply_schedule(scheduler: AsyncIOScheduler, app: Application) -> None:
         hour, minute = parsed
         
         # Get timezone for this channel
+        timezone = config.timezone
         try:
-            tz = ZoneInfo(config.timezone)
+            ZoneInfo(timezone)
         except Exception:
             logger.warning(f"Invalid timezone {config.timezone} for channel {channel_id}, using UTC")
-            tz = ZoneInfo("UTC")
-        
+            timezone = "UTC"
+        groups.setdefault((hour, minute, timezone), []).append(channel_id)
+        logger.info(f"Scheduled post for {channel_id} at {hour:02d}:{minute:02d} {timezone}")
+    
+    for (hour, minute, timezone), channel_ids in groups.items():
         scheduler.add_job(
             _scheduled_post,
             "cron",
-            args=[app, channel_id],
+            args=[app, channel_ids],
             hour=hour,
             minute=minute,
-            timezone=tz,
-            id=f"daily_post_{channel_id}",
+            timezone=ZoneInfo(timezone),
+            id=f"daily_post_{hour:02d}{minute:02d}_{timezone}",
             replace_existing=True,
         )
-        logger.info(f"Scheduled post for {channel_id} at {hour:02d}:{minute:02d} {config.timezone}")
     
     # Legacy: support old single channel format
     if not settings.channels and settings.post_time:
@@ -744,7 +1035,7 @@ def _apply_schedule(scheduler: AsyncIOScheduler, app: Application) -> None:
                 scheduler.add_job(
                     _scheduled_post,
                     "cron",
-                    args=[app, channel_id],
+                    args=[app, [channel_id]],
                     hour=hour,
                     minute=minute,
                     timezone=tz,
@@ -776,7 +1067,7 @@ def main() -> None:
     if not token:
         raise RuntimeError("PAPERS_DIGEST_BOT_TOKEN is not set.")
 
-    app = Application.builder().token(token).post_init(_post_init).build()
+    app = Application.builder().token(token).post_init(_post_init).post_shutdown(_post_shutdown).build()
     app.add_error_handler(error_handler)
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("app", open_app))
@@ -795,8 +1086,9 @@ def main() -> None:
     # Other commands
     app.add_handler(CommandHandler("status", status))
     app.add_handler(CommandHandler("metrics", show_metrics))
-    app.add_handler(CommandHandler("preview_today", preview_today))
-    app.add_handler(CommandHandler("post_today", post_today))
+    # Non-blocking: other updates are handled while a digest is being built.
+    app.add_handler(CommandHandler("preview_today", preview_today, block=False))
+    app.add_handler(CommandHandler("post_today", post_today, block=False))
     app.add_handler(CommandHandler("set_post_time", set_post_time))
     app.add_handler(CommandHandler("disable_post_time", disable_post_time))
     app.add_handler(CommandHandler("enable_llm", enable_llm))
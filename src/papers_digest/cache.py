@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Mapping
+
+from papers_digest.db import connect, evict_lru
+
+# How long a response stays fresh, by age of the requested date in days.
+# Results for past days barely change, so they can be kept much longer.
+_TTL_TODAY = 15 * 60
+_TTL_YESTERDAY = 6 * 60 * 60
+_TTL_RECENT = 24 * 60 * 60
+_TTL_ARCHIVE = 30 * 24 * 60 * 60
+
+
+def ttl_for(target_date: date, today: date | None = None) -> float:
+    """Freshness lifetime in seconds for responses about ``target_date``."""
+    age = ((today or date.today()) - target_date).days
+    if age <= 0:
+        return _TTL_TODAY
+    if age == 1:
+        return _TTL_YESTERDAY
+    if age < 7:
+        return _TTL_RECENT
+    return _TTL_ARCHIVE
+
+
+def cache_key(source: str, target_date: date, query: str, url: str, params: Mapping[str, Any] | None) -> str:
+    """Stable key for a source request; the query is normalized so equivalent areas share entries."""
+    normalized = " ".join(query.lower().split())
+    payload = json.dumps(
+        [source, target_date.isoformat(), normalized, url, sorted((str(k), str(v)) for k, v in (params or {}).items())],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """A response body stored in the cache together with its validators."""
+    content: bytes
+    etag: str
+    last_modified: str
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """On-disk cache of upstream responses backed by SQLite.
+
+    SQLite handles locking, so the CLI, the bot and the web app can share one
+    cache file. Entries are evicted least-recently-used once the total body
+    size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    content BLOB NOT NULL,
+                    etag TEXT NOT NULL DEFAULT '',
+                    last_modified TEXT NOT NULL DEFAULT '',
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+    def get(self, key: str) -> CachedResponse | None:
+        with connect(self.path) as conn:
+            row = conn.execute(
+                "SELECT content, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        return CachedResponse(content=row[0], etag=row[1], last_modified=row[2], expires_at=row[3])
+
+    def put(self, key: str, content: bytes, ttl: float, etag: str = "", last_modified: str = "") -> None:
+        now = time.time()
+        with connect(self.path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, etag, last_modified, expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, content, etag, last_modified, now + ttl, now, len(content)),
+            )
+            evict_lru(conn, "responses", self.max_bytes)
+
+    def refresh(self, key: str, ttl: float) -> None:
+        """Extend the lifetime of an entry that the server confirmed unchanged (304)."""
+        now = time.time()
+        with connect(self.path) as conn:
+            conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?", (now + ttl, now, key)
+            )
+
+
+def summary_key(paper_key: str, provider: str, model: str, prompt_hash: str) -> str:
+    """Stable key for a summary of one paper by one provider, model and prompt."""
+    payload = json.dumps([paper_key, provider, model, prompt_hash], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """Persistent cache of paper summaries backed by SQLite.
+
+    Lets every channel, preview and post reuse a summary instead of asking the
+    LLM again. Entries are evicted least-recently-used once the total text size
+    exceeds ``max_bytes``; with a ``ttl`` (seconds) older entries are treated as
+    missing.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 64 * 1024 * 1024, ttl: float | None = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS summaries_last_access ON summaries (last_access)")
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with connect(self.path) as conn:
+            row = conn.execute("SELECT summary, created_at FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE summaries SET last_access = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, summary: str) -> None:
+        now = time.time()
+        with connect(self.path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at, last_access, size) VALUES (?, ?, ?, ?, ?)",
+                (key, summary, now, now, len(summary.encode("utf-8"))),
+            )
+            evict_lru(conn, "summaries", self.max_bytes)
+
+
+# Global response cache instance
+_response_cache: ResponseCache | None = None
+# Global summary cache instance
+_summary_cache: SummaryCache | None = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Get or create the global response cache; ``None`` when disabled via an empty cache dir."""
+    global _response_cache
+    if _response_cache is None:
+        cache_dir = os.getenv("PAPERS_DIGEST_CACHE_DIR", "data/cache")
+        if not cache_dir:
+            return None
+        max_mb = int(os.getenv("PAPERS_DIGEST_CACHE_MAX_MB", "256"))
+        _response_cache = ResponseCache(Path(cache_dir) / "responses.sqlite3", max_bytes=max_mb * 1024 * 1024)
+    return _response_cache
+
+
+def get_summary_cache() -> SummaryCache | None:
+    """Get or create the global summary cache; ``None`` when disabled via an empty cache dir."""
+    global _summary_cache
+    if _summary_cache is None:
+        cache_dir = os.getenv("PAPERS_DIGEST_CACHE_DIR", "data/cache")
+        if not cache_dir:
+            return None
+        max_mb = int(os.getenv("PAPERS_DIGEST_SUMMARY_CACHE_MAX_MB", "64"))
+        ttl_days = os.getenv("PAPERS_DIGEST_SUMMARY_CACHE_TTL_DAYS", "")
+        _summary_cache = SummaryCache(
+            Path(cache_dir) / "summaries.sqlite3",
+            max_bytes=max_mb * 1024 * 1024,
+            ttl=float(ttl_days) * 24 * 60 * 60 if ttl_days else None,
+        )
+    return _summary_cache
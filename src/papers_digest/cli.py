@@ -4,7 +4,9 @@ import argparse
 from datetime import date, datetime
 from pathlib import Path
 
-from papers_digest.pipeline import run_digest
+from papers_digest.pipeline import DEFAULT_SUMMARY_DEADLINE, ingest_papers, run_digest
+from papers_digest.settings import load_settings
+from papers_digest.store import get_paper_store
 
 
 def _parse_date(value: str) -> date:
@@ -22,15 +24,45 @@ def _build_parser() -> argparse.ArgumentParser:
     run_parser.add_argument("--date", default="today", help="Date in YYYY-MM-DD or 'today'.")
     run_parser.add_argument("--limit", type=int, default=10, help="Max papers to include.")
     run_parser.add_argument("--output", help="Write digest to file.")
+    run_parser.add_argument(
+        "--from-store", action="store_true", help="Use papers saved by 'ingest' instead of querying the APIs."
+    )
+    run_parser.add_argument(
+        "--summary-deadline",
+        type=float,
+        default=DEFAULT_SUMMARY_DEADLINE,
+        help="Seconds to wait for LLM summaries before using extractive ones.",
+    )
+
+    ingest_parser = subparsers.add_parser("ingest", help="Save a day's papers to the local paper store.")
+    ingest_parser.add_argument(
+        "--query", action="append", help="Area to ingest; repeatable. Defaults to the areas of all channels."
+    )
+    ingest_parser.add_argument("--date", default="today", help="Date in YYYY-MM-DD or 'today'.")
     return parser
 
 
+def _ingest_queries(queries: list[str] | None) -> list[str]:
+    if queries:
+        return queries
+    settings = load_settings()
+    areas = [config.science_area for config in settings.channels.values() if config.science_area.strip()]
+    return areas or [settings.science_area]
+
+
 def main() -> None:
     parser = _build_parser()
     args = parser.parse_args()
     target_date = _parse_date(args.date)
 
-    digest = run_digest(args.query, target_date, args.limit)
+    if args.command == "ingest":
+        changed = ingest_papers(target_date, _ingest_queries(args.query))
+        print(f"{changed} papers added or updated for {target_date}.")
+        return
+
+    store = get_paper_store() if args.from_store else None
+    parts = run_digest(args.query, target_date, args.limit, store=store, summary_deadline=args.summary_deadline)
+    digest = "\n\n".join(parts)
     if args.output:
         Path(args.output).write_text(digest, encoding="utf-8")
     else:
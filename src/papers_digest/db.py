@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+@contextmanager
+def connect(path: str | Path) -> Iterator[sqlite3.Connection]:
+    """Open a short-lived connection that commits on success and is always closed.
+
+    A connection per operation keeps the SQLite-backed stores safe to use from
+    worker threads and from several processes at once.
+    """
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def evict_lru(conn: sqlite3.Connection, table: str, max_bytes: int) -> None:
+    """Delete the least recently used rows of ``table`` until its total ``size`` fits in ``max_bytes``.
+
+    The table needs ``key``, ``size`` and ``last_access`` columns.
+    """
+    total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+    if total <= max_bytes:
+        return
+    stale: list[tuple[str]] = []
+    for key, size in conn.execute(f"SELECT key, size FROM {table} ORDER BY last_access"):
+        if total <= max_bytes:
+            break
+        stale.append((key,))
+        total -= size
+    conn.executemany(f"DELETE FROM {table} WHERE key = ?", stale)
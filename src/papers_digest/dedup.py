@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import random
+import re
+import unicodedata
+import zlib
+from dataclasses import replace
+from typing import Iterable, Sequence
+
+from papers_digest.models import Paper
+
+# MinHash signature length and LSH banding: 8 bands of 4 rows put two titles in
+# the same bucket with high probability once their word Jaccard is above ~0.6.
+_NUM_PERM = 32
+_BANDS = 8
+_ROWS = _NUM_PERM // _BANDS
+# Candidates from LSH are only merged when their word sets really are this similar.
+_NEAR_DUPLICATE_JACCARD = 0.8
+# Titles shorter than this (after normalization) are too generic to match on title alone.
+_MIN_TITLE_WORDS = 3
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(_NUM_PERM)]
+
+_ARXIV_DOI = re.compile(r"^10\.48550/arxiv\.(.+)$")
+_ARXIV_VERSION = re.compile(r"v\d+$")
+
+
+def normalize_doi(value: str) -> str:
+    """Lowercase DOI without resolver prefix, e.g. ``https://doi.org/10.1/X`` → ``10.1/x``."""
+    doi = value.strip().lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:"):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi
+
+
+def normalize_arxiv_id(value: str) -> str:
+    """Bare arXiv id without URL, ``arXiv:`` prefix or version, e.g. ``2401.01234``."""
+    arxiv_id = value.strip().lower()
+    for prefix in ("http://arxiv.org/abs/", "https://arxiv.org/abs/", "arxiv:"):
+        if arxiv_id.startswith(prefix):
+            arxiv_id = arxiv_id[len(prefix):]
+    return _ARXIV_VERSION.sub("", arxiv_id)
+
+
+def normalize_title(title: str) -> str:
+    """Title reduced to lowercase ASCII words, so punctuation, accents and spacing do not matter."""
+    text = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def paper_keys(paper: Paper) -> list[str]:
+    """Identifier keys of a paper; two papers sharing any key are the same work.
+
+    arXiv DOIs (``10.48550/arXiv.*``) map to the arXiv key so they match the
+    arXiv record itself. Source-native ids (OpenAlex, Semantic Scholar, ...)
+    only match within their own source.
+    """
+    keys: list[str] = []
+    doi = normalize_doi(paper.doi)
+    arxiv_id = normalize_arxiv_id(paper.arxiv_id)
+    arxiv_doi = _ARXIV_DOI.match(doi)
+    if arxiv_doi:
+        arxiv_id = arxiv_id or normalize_arxiv_id(arxiv_doi.group(1))
+    elif doi:
+        keys.append(f"doi:{doi}")
+    if arxiv_id:
+        keys.append(f"arxiv:{arxiv_id}")
+    native = _native_id(paper)
+    if native:
+        keys.append(f"{paper.source}:{native}")
+    return keys
+
+
+def _native_id(paper: Paper) -> str:
+    """The source's own id of a paper, without URL prefix (OpenAlex and arXiv ids are URLs).
+
+    Ids that are not URLs are kept whole: Crossref's are DOIs, whose suffix
+    alone (``abc.1`` of ``10.1000/abc.1``) is shared by unrelated works.
+    """
+    native = paper.paper_id.strip().lower()
+    if paper.source == "arxiv":
+        return normalize_arxiv_id(native)
+    if "://" in native:
+        return native.rstrip("/").rsplit("/", 1)[-1]
+    return native
+
+
+def canonical_key(paper: Paper) -> str:
+    """The single most stable identifier key of a paper: arXiv id, then DOI, then the source's own id."""
+    keys = paper_keys(paper)
+    for prefix in ("arxiv:", "doi:"):
+        for key in keys:
+            if key.startswith(prefix):
+                return key
+    return keys[-1] if keys else "title:" + normalize_title(paper.title)
+
+
+def _minhash(words: set[str]) -> list[int]:
+    hashes = [zlib.crc32(word.encode("utf-8")) for word in words]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+class _DisjointSet:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Keep the earliest record as root so groups come out in input order.
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def merge_papers(group: Sequence[Paper]) -> Paper:
+    """Merge records of one work into the one with the richest abstract, filling its gaps from the rest."""
+    best = max(group, key=lambda paper: len(paper.abstract or ""))
+    return replace(
+        best,
+        title=best.title or next((p.title for p in group if p.title), ""),
+        authors=max((p.authors for p in group), key=len),
+        url=best.url or next((p.url for p in group if p.url), ""),
+        doi=best.doi or next((p.doi for p in group if p.doi), ""),
+        arxiv_id=best.arxiv_id or next((p.arxiv_id for p in group if p.arxiv_id), ""),
+    )
+
+
+def dedup_papers(papers: Iterable[Paper]) -> list[Paper]:
+    """Collapse records of the same work coming from different sources.
+
+    Three passes, each linear in the number of papers: shared identifiers
+    (DOI, arXiv id, source-native ids), equal normalized titles, and
+    near-duplicate titles found with MinHash/LSH and confirmed by word
+    Jaccard similarity. Merged records keep the position of their first
+    occurrence.
+    """
+    papers = list(papers)
+    groups = _DisjointSet(len(papers))
+
+    seen: dict[str, int] = {}
+    titles: list[list[str]] = []
+    for idx, paper in enumerate(papers):
+        words = normalize_title(paper.title).split()
+        titles.append(words)
+        keys = paper_keys(paper)
+        if len(words) >= _MIN_TITLE_WORDS:
+            keys.append("title:" + " ".join(words))
+        for key in keys:
+            if key in seen:
+                groups.union(seen[key], idx)
+            else:
+                seen[key] = idx
+
+    buckets: dict[tuple[int, tuple[int, ...]], int] = {}
+    word_sets = [set(words) for words in titles]
+    for idx, words in enumerate(word_sets):
+        if len(titles[idx]) < _MIN_TITLE_WORDS:
+            continue
+        signature = _minhash(words)
+        for band in range(_BANDS):
+            bucket = (band, tuple(signature[band * _ROWS:(band + 1) * _ROWS]))
+            first = buckets.setdefault(bucket, idx)
+            # Comparing against the bucket's first title keeps this pass linear.
+            if first != idx and groups.find(first) != groups.find(idx):
+                other = word_sets[first]
+                if len(words & other) / len(words | other) >= _NEAR_DUPLICATE_JACCARD:
+                    groups.union(first, idx)
+
+    members: dict[int, list[Paper]] = {}
+    for idx, paper in enumerate(papers):
+        members.setdefault(groups.find(idx), []).append(paper)
+    return [group[0] if len(group) == 1 else merge_papers(group) for group in members.values()]
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import re
 from datetime import date
-from typing import Sequence
+from itertools import chain
+from typing import Iterable, Iterator, Sequence
 
 from papers_digest.models import Paper
 
@@ -32,8 +33,21 @@ def format_digest(
     recommendations: Sequence[str],
 ) -> list[str]:
     """Format digest as Telegram MarkdownV2 messages. Returns list of message parts."""
-    messages = []
-    
+    entries = ((paper, summaries.get(paper.paper_id, "Краткое содержание недоступно.")) for paper in papers)
+    return list(iter_digest(query, target_date, entries, recommendations))
+
+
+def iter_digest(
+    query: str,
+    target_date: date,
+    entries: Iterable[tuple[Paper, str]],
+    recommendations: Sequence[str],
+) -> Iterator[str]:
+    """Yield the message parts of ``format_digest`` one by one from ``(paper, summary)`` pairs in rank order.
+
+    A part is yielded as soon as it is full, so the first parts can be sent
+    while summaries of later papers are still being made.
+    """
     # Header - escape all text, translate to Russian
     date_str = _escape_markdown_v2(target_date.isoformat())
     header_text = _escape_markdown_v2("Дайджест статей за")
@@ -42,18 +56,18 @@ def format_digest(
     query_escaped = _escape_markdown_v2(query)
     header += f"{query_text} *{query_escaped}*\n\n"
     
-    if not papers:
+    entries = iter(entries)
+    first = next(entries, None)
+    if first is None:
         no_papers_text = _escape_markdown_v2("Сегодня статей не найдено.")
-        header += no_papers_text
-        messages.append(header)
-        return messages
+        yield header + no_papers_text
+        return
 
     top_papers_text = _escape_markdown_v2("Топ статей")
     header += f"*{top_papers_text}*\n\n"
     current_message = header
     
-    for idx, paper in enumerate(papers, start=1):
-        summary = summaries.get(paper.paper_id, "Краткое содержание недоступно.")
+    for idx, (paper, summary) in enumerate(chain([first], entries), start=1):
         authors = ", ".join(paper.authors) if paper.authors else "Авторы неизвестны"
         
         # Clean HTML tags and escape all text fields
@@ -80,13 +94,20 @@ def format_digest(
         
         # Check if adding this paper would exceed 4096 characters
         if len(current_message) + len(paper_entry) > 4000:  # Leave some margin
-            messages.append(current_message.rstrip())
+            yield current_message.rstrip()
             current_message = ""
         
         current_message += paper_entry
     
+    if recommendations:
+        topics_text = _escape_markdown_v2("Набирающие популярность темы")
+        topics = ", ".join(_escape_markdown_v2(topic) for topic in recommendations)
+        topics_entry = f"*{topics_text}*\n{topics}\n"
+        if len(current_message) + len(topics_entry) > 4000:
+            yield current_message.rstrip()
+            current_message = ""
+        current_message += topics_entry
+
     if current_message.strip():
-        messages.append(current_message.rstrip())
-    
-    return messages if messages else [header]
+        yield current_message.rstrip()
 
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves rely on write-then-rename alone
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class SourceHealth:
+    """Circuit breaker state and recent latencies of one source."""
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+
+
+class HealthRegistry:
+    """Per-source health tracking with a circuit breaker and adaptive deadlines.
+
+    After ``failure_threshold`` consecutive failures a source's breaker opens and
+    the source is skipped; after ``cooldown`` seconds it half-opens and the next
+    fetch is a probe that either closes the breaker again or re-opens it. The
+    deadline of a healthy source follows its recent latency (twice the p95, at
+    least ``min_timeout`` but never more than the source's own deadline). State
+    is persisted to a JSON file so it survives restarts of the CLI and the bot;
+    every update re-reads the file under a lock, so processes sharing it do not
+    overwrite each other's updates.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        failure_threshold: int = 3,
+        cooldown: float = 300.0,
+        window: int = 20,
+        min_timeout: float = 5.0,
+    ) -> None:
+        self.path = Path(path)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.window = window
+        self.min_timeout = min_timeout
+        self._lock = threading.Lock()
+        self._sources: dict[str, SourceHealth] = {}
+        self._load()
+
+    def allow(self, name: str) -> bool:
+        """Whether a fetch from ``name`` should be attempted now."""
+        with self._lock:
+            health = self._sources.setdefault(name, SourceHealth())
+            if health.state == OPEN and time.time() - health.opened_at >= self.cooldown:
+                health.state = HALF_OPEN
+                logger.info(f"Circuit for {name} half-open, probing")
+            return health.state != OPEN
+
+    def timeout_for(self, name: str, default: float) -> float:
+        """Deadline for the next fetch from ``name`` based on its recent latencies, never longer than ``default``."""
+        with self._lock:
+            latencies = sorted(self._sources.get(name, SourceHealth()).latencies)
+        if len(latencies) < 5:
+            return default
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return min(default, max(self.min_timeout, p95 * 2))
+
+    def record_success(self, name: str, latency: float | None = None) -> None:
+        """Close ``name``'s breaker; ``latency`` is the fetch's network time, ``None`` when it was served from cache."""
+        def change(health: SourceHealth) -> None:
+            if health.state != CLOSED:
+                logger.info(f"Circuit for {name} closed")
+            health.state = CLOSED
+            health.consecutive_failures = 0
+            if latency is not None:
+                self._add_latency(health, latency)
+
+        self._update(name, change)
+
+    def record_latency(self, name: str, latency: float) -> None:
+        """Add a latency sample without changing the breaker, e.g. for a fetch cut off by its deadline."""
+        self._update(name, lambda health: self._add_latency(health, latency))
+
+    def record_failure(self, name: str) -> None:
+        def change(health: SourceHealth) -> None:
+            health.consecutive_failures += 1
+            if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                if health.state != OPEN:
+                    logger.warning(f"Circuit for {name} opened after {health.consecutive_failures} failures")
+                health.state = OPEN
+                health.opened_at = time.time()
+
+        self._update(name, change)
+
+    def _add_latency(self, health: SourceHealth, latency: float) -> None:
+        health.latencies = (health.latencies + [round(latency, 3)])[-self.window:]
+
+    def states(self) -> dict[str, str]:
+        """Breaker state per known source."""
+        with self._lock:
+            return {name: health.state for name, health in self._sources.items()}
+
+    def _update(self, name: str, change: Callable[[SourceHealth], None]) -> None:
+        """Apply ``change`` to the latest saved state of ``name`` and save it."""
+        with self._lock, _file_lock(self.path.with_suffix(".lock")):
+            self._sources.update(self._read())
+            change(self._sources.setdefault(name, SourceHealth()))
+            self._save()
+
+    def _load(self) -> None:
+        self._sources = self._read()
+
+    def _read(self) -> dict[str, SourceHealth]:
+        if not self.path.exists():
+            return {}
+        try:
+            data: dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+            return {name: SourceHealth(**values) for name, values in data.items()}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable source health file {self.path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {name: asdict(health) for name, health in self._sources.items()}
+        # Write-then-rename so a concurrent reader never sees a half-written file.
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Exclusive lock on ``path`` shared with other processes, where the platform supports it."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# Global health registry instance
+_health_registry: HealthRegistry | None = None
+
+
+def get_health_registry() -> HealthRegistry:
+    """Get or create the global source health registry."""
+    global _health_registry
+    if _health_registry is None:
+        path = os.getenv("PAPERS_DIGEST_HEALTH_FILE", "data/health/source_health.json")
+        _health_registry = HealthRegistry(path)
+    return _health_registry
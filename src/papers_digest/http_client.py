@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterator, Mapping
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from papers_digest.ratelimit import RateLimiter, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+_USER_AGENT = "papers-digest-ai/0.1 (+https://github.com/RaySkarken/papers-digest-ai)"
+
+# Statuses that are worth retrying: rate limiting and transient server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Durations of the requests sent in the current ``network_time`` context.
+_request_times: ContextVar[list[float] | None] = ContextVar("request_times", default=None)
+
+
+@contextmanager
+def network_time() -> Iterator[list[float]]:
+    """Collect the duration of every request sent in this context (thread or task).
+
+    Only the requests themselves are timed: rate-limit waits, retry backoff and
+    responses served from the cache are not, so the durations reflect the
+    upstream's latency rather than local queueing.
+    """
+    times: list[float] = []
+    token = _request_times.set(times)
+    try:
+        yield times
+    finally:
+        _request_times.reset(token)
+
+
+def _record_request_time(started: float) -> None:
+    times = _request_times.get()
+    if times is not None:
+        times.append(time.monotonic() - started)
+
+
+def _retry_after(headers: Mapping[str, str]) -> float | None:
+    """Parse the Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    value = (headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _RetryPolicy:
+    """Retry decisions shared by the sync and async clients."""
+
+    max_retries: int
+    backoff: float
+    max_backoff: float
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # "Full jitter": spreads retries of concurrent callers over the whole window.
+        return random.uniform(0.0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def _retry_delay(self, attempt: int, status_code: int, headers: Mapping[str, str]) -> float | None:
+        """Seconds to wait before retrying a response, or ``None`` if it should be returned as is."""
+        if status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+            return None
+        retry_after = _retry_after(headers)
+        return min(self.max_backoff, retry_after) if retry_after is not None else self._backoff_delay(attempt)
+
+
+class HttpClient(_RetryPolicy):
+    """Shared HTTP client for source adapters.
+
+    Keeps a bounded pool of keep-alive connections per host, negotiates
+    compressed responses and retries 429/5xx responses and connection errors
+    with jittered exponential backoff, honouring ``Retry-After``. With a
+    ``rate_limiter`` every attempt first waits for a token of its host.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        session: requests.Session | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._session = session or requests.Session()
+        # pool_block keeps the number of open connections per host at pool_size
+        # even when many threads fetch at once.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(
+            {
+                "User-Agent": _USER_AGENT,
+                "Accept-Encoding": "gzip, deflate",
+            }
+        )
+
+    def get(
+        self,
+        url: str,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float = 30.0,
+        stream: bool = False,
+    ) -> requests.Response:
+        """GET ``url``, retrying transient failures. The final response is returned as is."""
+        host = urlsplit(url).hostname or ""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(host)
+            started = time.monotonic()
+            try:
+                response = self._session.get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                _record_request_time(started)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"GET {url} failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            else:
+                _record_request_time(started)
+                delay = self._retry_delay(attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+                logger.warning(
+                    f"GET {url} returned {response.status_code}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class AsyncHttpClient(_RetryPolicy):
+    """Asyncio counterpart of :class:`HttpClient` built on ``httpx``.
+
+    Same pooling, compression, retry and rate-limit behaviour, but waits with
+    ``asyncio.sleep`` so many fetches can share one event loop.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        rate_limiter: RateLimiter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            headers={"User-Agent": _USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+            transport=transport,
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+        json: Any = None,
+        timeout: float = 30.0,
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures. The final response is returned as is."""
+        host = urlsplit(url).hostname or ""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                # The reservation is a SQLite write transaction that may wait on other processes.
+                wait = await asyncio.to_thread(self.rate_limiter.reserve, host)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            started = time.monotonic()
+            try:
+                response = await self._client.request(
+                    method, url, params=params, headers=headers, json=json, timeout=timeout
+                )
+            except httpx.TransportError as e:
+                _record_request_time(started)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"{method} {url} failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            else:
+                _record_request_time(started)
+                delay = self._retry_delay(attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+                logger.warning(
+                    f"{method} {url} returned {response.status_code}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# Global HTTP client instance
+_http_client: HttpClient | None = None
+# Async clients are bound to the event loop they were created on.
+_async_http_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient] = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> HttpClient:
+    """Get or create the global HTTP client."""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient(
+            pool_size=int(os.getenv("PAPERS_DIGEST_HTTP_POOL_SIZE", "10")),
+            max_retries=int(os.getenv("PAPERS_DIGEST_HTTP_RETRIES", "3")),
+            rate_limiter=get_rate_limiter(),
+        )
+    return _http_client
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """Get or create the async HTTP client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None:
+        client = AsyncHttpClient(
+            pool_size=int(os.getenv("PAPERS_DIGEST_HTTP_POOL_SIZE", "10")),
+            max_retries=int(os.getenv("PAPERS_DIGEST_HTTP_RETRIES", "3")),
+            rate_limiter=get_rate_limiter(),
+        )
+        _async_http_clients[loop] = client
+    return client
+
+
+async def aclose_async_http_client() -> None:
+    """Close the async HTTP client of the running event loop, if it has one; call before the loop ends."""
+    client = _async_http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def set_http_client(client: HttpClient | None) -> None:
+    """Replace the global HTTP client (e.g. with one pointed at a test server)."""
+    global _http_client
+    _http_client = client
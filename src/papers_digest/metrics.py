@@ -9,7 +9,6 @@ from pathlib import Path
 from typing import Sequence
 
 from papers_digest.models import Paper
-from papers_digest.ranking import score_paper
 
 
 @dataclass
@@ -27,9 +26,12 @@ class DigestMetrics:
     max_relevance_score: float = 0.0
     generation_time_seconds: float = 0.0
     source_errors: dict[str, str] = field(default_factory=dict)
+    source_health: dict[str, str] = field(default_factory=dict)
     summarizer_used: str = "unknown"
     digest_length_chars: int = 0
     digest_parts_count: int = 0
+    summary_cache_hits: int = 0
+    summary_cache_misses: int = 0
 
 
 @dataclass
@@ -80,9 +82,13 @@ class MetricsCollector:
         generation_time: float,
         summarizer_name: str,
         digest_parts: Sequence[str],
+        source_health: dict[str, str] | None = None,
+        scores: Sequence[float] | None = None,
+        summary_cache_hits: int = 0,
+        summary_cache_misses: int = 0,
     ) -> DigestMetrics:
-        """Record metrics for a digest generation."""
-        scores = [score_paper(query, paper) for paper in ranked] if ranked else [0.0]
+        """Record metrics for a digest generation; ``scores`` are the ranking scores of ``ranked``."""
+        scores = list(scores) if scores else [0.0]
         
         metrics = DigestMetrics(
             timestamp=datetime.now().isoformat(),
@@ -97,9 +103,12 @@ class MetricsCollector:
             max_relevance_score=max(scores) if scores else 0.0,
             generation_time_seconds=generation_time,
             source_errors=source_errors,
+            source_health=source_health or {},
             summarizer_used=summarizer_name,
             digest_length_chars=sum(len(part) for part in digest_parts),
             digest_parts_count=len(digest_parts),
+            summary_cache_hits=summary_cache_hits,
+            summary_cache_misses=summary_cache_misses,
         )
         
         self._save_digest_metrics(metrics)
@@ -234,6 +243,8 @@ class MetricsCollector:
                 sum(d.get("generation_time_seconds", 0) for d in digests) / len(digests)
                 if digests else 0.0
             ),
+            "summary_cache_hits": sum(d.get("summary_cache_hits", 0) for d in digests),
+            "summary_cache_misses": sum(d.get("summary_cache_misses", 0) for d in digests),
             "sources_used": set(
                 source
                 for d in digests
@@ -14,4 +14,7 @@ class Paper:
     url: str
     published_date: date
     source: str
+    # Cross-source identifiers, when the source reports them (see dedup.py).
+    doi: str = ""
+    arxiv_id: str = ""
 
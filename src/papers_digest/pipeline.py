@@ -1,48 +1,834 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import threading
 import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import aclosing
+from dataclasses import dataclass
 from datetime import date
-from typing import Iterable, Sequence
+from functools import partial
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
 
-from papers_digest.formatter import format_digest
+from papers_digest.cache import SummaryCache, get_summary_cache, summary_key
+from papers_digest.dedup import canonical_key, dedup_papers
+from papers_digest.formatter import format_digest, iter_digest
+from papers_digest.health import CLOSED, HealthRegistry, get_health_registry
+from papers_digest.http_client import network_time
 from papers_digest.metrics import get_metrics_collector
 from papers_digest.models import Paper
-from papers_digest.ranking import extract_keywords, rank_papers
+from papers_digest.ranking import CorpusIndex, ScoredPaper, rank_scored, score_paper
+from papers_digest.ratelimit import RateLimitExceeded
 from papers_digest.sources.arxiv import ArxivSource
-from papers_digest.sources.base import PaperSource
+from papers_digest.sources.base import PaperSource, normalize_query
 from papers_digest.sources.crossref import CrossrefSource
 from papers_digest.sources.openalex import OpenAlexSource
 from papers_digest.sources.semantic_scholar import SemanticScholarSource
-from papers_digest.summarizer import OpenAISummarizer, SimpleSummarizer, Summarizer
+from papers_digest.store import PaperStore, get_paper_store
+from papers_digest.summarizer import OpenAISummarizer, SimpleSummarizer, Summarizer, prompt_hash, token_batches
+from papers_digest.trending import get_trend_tracker
+from papers_digest.vectors import VectorCorpus, get_vector_index, vector_ranking_enabled
 
 logger = logging.getLogger(__name__)
 
+# Default per-source fetch deadline in seconds, used when a source does not set its own.
+DEFAULT_SOURCE_DEADLINE = 30.0
+# Default time a digest waits for LLM summaries before using extractive ones, in seconds.
+DEFAULT_SUMMARY_DEADLINE = 20.0
+# Candidates taken from each source per paper of the digest, unless set explicitly.
+# Sources stop paging once they have them, which keeps rate-limited sources
+# (arXiv allows one request every three seconds) within their deadline.
+CANDIDATES_PER_RESULT = 10
+
+# Summaries run here rather than on a per-digest pool, so calls that miss a
+# digest's deadline can finish in the background and fill the summary cache.
+_SUMMARY_EXECUTOR: ThreadPoolExecutor | None = None
+# Async summaries that missed their deadline, kept referenced until they finish.
+_background_summaries: set[asyncio.Task] = set()
+
 
 def _default_sources() -> list[PaperSource]:
     return [ArxivSource(), CrossrefSource(), SemanticScholarSource(), OpenAlexSource()]
 
 
-def _collect_papers(target_date: date, query: str, sources: Sequence[PaperSource]) -> tuple[list[Paper], dict[str, int], dict[str, str]]:
-    """Collect papers from sources and return papers, papers_per_source, and source_errors."""
+def _drain(
+    fetch: Callable[[], Iterable[Paper]],
+    sink: list[Paper],
+    cancelled: threading.Event,
+    max_candidates: int | None = None,
+) -> float | None:
+    """Consume a fetch into ``sink`` until it is exhausted, has given enough candidates,
+    or the collector gives up on it. Stopping early also stops the source from paging further.
+    Returns the network time of the fetch, ``None`` if it sent no request (e.g. all cached)."""
+    with network_time() as times:
+        for paper in fetch():
+            if cancelled.is_set():
+                break
+            sink.append(paper)
+            if max_candidates is not None and len(sink) >= max_candidates:
+                break
+    return sum(times) if times else None
+
+
+_Outcome = float | None | BaseException
+
+
+def _missed_deadline(outcome: _Outcome) -> bool:
+    return isinstance(outcome, (FutureTimeoutError, asyncio.TimeoutError))
+
+
+def _held_up(outcome: _Outcome) -> bool:
+    """Whether a fetch was cut short by its deadline or by a local rate-limit queue rather than by the source."""
+    return _missed_deadline(outcome) or isinstance(outcome, RateLimitExceeded)
+
+
+def _log_outcome(source: PaperSource, limit: float, fetched: int, outcome: _Outcome) -> str:
+    """Log how a fetch ended: its network time or the exception it ended with.
+    Returns the error message for the digest, empty on success."""
+    if not isinstance(outcome, BaseException):
+        logger.info(f"Fetched {fetched} papers from {source.name}")
+        return ""
+    if _missed_deadline(outcome):
+        logger.warning(f"{source.name} missed its {limit:.1f}s deadline, using {fetched} partial results")
+        return f"Deadline of {limit:.1f}s exceeded, partial results used"
+    logger.warning(f"Failed to fetch from {source.name}: {outcome}", exc_info=outcome)
+    return str(outcome)
+
+
+def _record_health(health: HealthRegistry, jobs: Iterable[tuple[PaperSource, float, _Outcome]]) -> None:
+    """Record one breaker outcome per source from the ``(source, limit, outcome)`` of its fetch jobs.
+
+    Only errors count as failures. A missed deadline, or a rate-limit queue
+    longer than the limiter allows, means the source was slow or queued behind
+    the rate limiter, not broken: it adds the deadline as a latency sample, so
+    the adaptive deadline grows back, and leaves the breaker as it is.
+    Otherwise the slowest job's network time is recorded.
+    """
+    by_source: dict[str, list[tuple[float, _Outcome]]] = {}
+    for source, limit, outcome in jobs:
+        by_source.setdefault(source.name, []).append((limit, outcome))
+    for name, outcomes in by_source.items():
+        if any(isinstance(outcome, BaseException) and not _held_up(outcome) for _, outcome in outcomes):
+            health.record_failure(name)
+            continue
+        missed = [limit for limit, outcome in outcomes if _held_up(outcome)]
+        if missed:
+            health.record_latency(name, max(missed))
+            continue
+        latencies = [outcome for _, outcome in outcomes if outcome is not None]
+        health.record_success(name, max(latencies) if latencies else None)
+
+
+def _fetch_limits(sources: Sequence[PaperSource], deadline: float, health: HealthRegistry | None) -> list[float]:
+    """Deadline of every source: its own or the default, adapted to its recent latency."""
+    limits: list[float] = []
+    for source in sources:
+        limit = source.deadline if source.deadline is not None else deadline
+        limits.append(health.timeout_for(source.name, limit) if health is not None else limit)
+    return limits
+
+
+def _run_fetches(
+    fetches: Sequence[tuple[PaperSource, Callable[[], Iterable[Paper]], int | None]],
+    deadline: float,
+    health: HealthRegistry | None = None,
+) -> tuple[list[list[Paper]], list[str]]:
+    """Run ``(source, fetch, max_candidates)`` jobs concurrently, each under its source's deadline.
+
+    With a ``health`` registry, sources whose circuit is open are skipped
+    without a request, deadlines adapt to each source's recent latency, and
+    every outcome is recorded. Returns the papers of every job (partial for
+    jobs that missed their deadline) and an error message per job, empty when
+    it completed.
+    """
+    started = time.monotonic()
+    cancelled = threading.Event()
+    sinks: list[list[Paper]] = [[] for _ in fetches]
+    fetched: list[list[Paper]] = [[] for _ in fetches]
+    errors = ["" for _ in fetches]
+    limits = _fetch_limits([source for source, _, _ in fetches], deadline, health)
+    allowed = _allowed_sources([source for source, _, _ in fetches], health)
+    outcomes: dict[int, _Outcome] = {}
+    executor = ThreadPoolExecutor(max_workers=len(fetches), thread_name_prefix="papers-source")
+    try:
+        futures = {}
+        for idx, ((source, fetch, cap), sink) in enumerate(zip(fetches, sinks)):
+            if source.name not in allowed:
+                errors[idx] = "Circuit open, source skipped"
+                continue
+            futures[idx] = executor.submit(_drain, fetch, sink, cancelled, cap)
+        # Wait on the tightest deadlines first so that every job gets its full budget.
+        for idx in sorted(futures, key=lambda i: limits[i]):
+            source = fetches[idx][0]
+            remaining = started + limits[idx] - time.monotonic()
+            try:
+                outcomes[idx] = futures[idx].result(timeout=max(0.0, remaining))
+            except Exception as e:
+                outcomes[idx] = e
+            errors[idx] = _log_outcome(source, limits[idx], len(sinks[idx]), outcomes[idx])
+            # Snapshot: a late worker may keep appending until it notices the cancellation.
+            fetched[idx] = list(sinks[idx])
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+    if health is not None:
+        _record_health(health, ((fetches[idx][0], limits[idx], outcome) for idx, outcome in outcomes.items()))
+    return fetched, errors
+
+
+def _allowed_sources(sources: Sequence[PaperSource], health: HealthRegistry | None) -> set[str]:
+    """Names of the sources to fetch from now; sources whose circuit is open are skipped (asked once per source)."""
+    allowed: set[str] = set()
+    for name in dict.fromkeys(source.name for source in sources):
+        if health is not None and not health.allow(name):
+            logger.info(f"Skipping {name}: circuit open")
+            continue
+        allowed.add(name)
+    return allowed
+
+
+def _collect_papers(
+    target_date: date,
+    query: str,
+    sources: Sequence[PaperSource],
+    deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates: int | None = None,
+    health: HealthRegistry | None = None,
+) -> tuple[list[Paper], dict[str, int], dict[str, str]]:
+    """Collect papers from sources and return papers, papers_per_source, and source_errors.
+
+    All sources are fetched concurrently, each on its own worker thread and with
+    its own deadline (``source.deadline`` or ``deadline``). A source that is still
+    running when its deadline expires contributes whatever it has yielded so far,
+    so the total wall-clock time is bounded by the slowest deadline rather than
+    by the sum of all fetches. ``max_candidates`` caps how many papers are taken
+    from each source; ``health`` enables the per-source circuit breaker.
+    """
     papers: list[Paper] = []
     papers_per_source: dict[str, int] = {}
     source_errors: dict[str, str] = {}
-    
+    if not sources:
+        return papers, papers_per_source, source_errors
+
+    fetched, errors = _run_fetches(
+        [(source, partial(source.fetch, target_date, query), max_candidates) for source in sources],
+        deadline,
+        health,
+    )
+    for source, source_papers, error in zip(sources, fetched, errors):
+        papers.extend(source_papers)
+        papers_per_source[source.name] = len(source_papers)
+        if error:
+            source_errors[source.name] = error
+    return papers, papers_per_source, source_errors
+
+
+async def _acollect_papers(
+    target_date: date,
+    query: str,
+    sources: Sequence[PaperSource],
+    deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates: int | None = None,
+    health: HealthRegistry | None = None,
+) -> tuple[list[Paper], dict[str, int], dict[str, str]]:
+    """Async counterpart of ``_collect_papers``: all sources run as tasks on the current event loop.
+
+    Deadlines, partial results, candidate caps and the circuit breaker behave
+    exactly as in the threaded version.
+    """
+    sinks: list[list[Paper]] = [[] for _ in sources]
+    errors = ["" for _ in sources]
+    limits = _fetch_limits(sources, deadline, health)
+
+    async def drain(source: PaperSource, sink: list[Paper]) -> float | None:
+        with network_time() as times:
+            async with aclosing(source.afetch(target_date, query)) as papers:
+                async for paper in papers:
+                    sink.append(paper)
+                    if max_candidates is not None and len(sink) >= max_candidates:
+                        break
+        return sum(times) if times else None
+
+    allowed = _allowed_sources(sources, health)
+    tasks = {}
+    for idx, (source, sink) in enumerate(zip(sources, sinks)):
+        if source.name not in allowed:
+            errors[idx] = "Circuit open, source skipped"
+            continue
+        tasks[idx] = asyncio.wait_for(drain(source, sink), limits[idx])
+    outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    for idx, outcome in zip(tasks, outcomes):
+        errors[idx] = _log_outcome(sources[idx], limits[idx], len(sinks[idx]), outcome)
+    if health is not None:
+        await asyncio.to_thread(
+            _record_health, health, ((sources[idx], limits[idx], outcome) for idx, outcome in zip(tasks, outcomes))
+        )
+
+    papers: list[Paper] = []
+    papers_per_source: dict[str, int] = {}
+    source_errors: dict[str, str] = {}
+    for source, sink, error in zip(sources, sinks, errors):
+        papers.extend(sink)
+        papers_per_source[source.name] = len(sink)
+        if error:
+            source_errors[source.name] = error
+    return papers, papers_per_source, source_errors
+
+
+def collect_papers_batch(
+    target_date: date,
+    queries: Mapping[str, str],
+    sources: Sequence[PaperSource],
+    deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates: int | None = None,
+    health: HealthRegistry | None = None,
+) -> tuple[dict[str, list[Paper]], dict[str, int], dict[str, str]]:
+    """Collect candidates for many ``{key: query}`` pairs (e.g. channels) with shared upstream requests.
+
+    Equal queries (after normalization) are fetched once, and sources that can
+    OR several queries together cover up to ``source.batch_size`` distinct
+    topics per search. Results are demultiplexed locally: papers from a merged
+    search go to every topic whose terms they contain. Returns candidates per
+    key, papers_per_source and source_errors for the whole batch.
+    """
+    topics = sorted({normalize_query(query) for query in queries.values()})
+    jobs: list[tuple[PaperSource, list[str]]] = []
     for source in sources:
+        size = max(1, source.batch_size)
+        jobs.extend((source, topics[i:i + size]) for i in range(0, len(topics), size))
+
+    papers_per_source: dict[str, int] = {source.name: 0 for source in sources}
+    source_errors: dict[str, str] = {}
+    by_topic: dict[str, list[Paper]] = {topic: [] for topic in topics}
+    if not jobs:
+        return {key: [] for key in queries}, papers_per_source, source_errors
+
+    fetched, errors = _run_fetches(
+        [
+            (
+                source,
+                partial(source.fetch_batch, target_date, chunk),
+                max_candidates * len(chunk) if max_candidates is not None else None,
+            )
+            for source, chunk in jobs
+        ],
+        deadline,
+        health,
+    )
+    for (source, chunk), job_papers, error in zip(jobs, fetched, errors):
+        papers_per_source[source.name] += len(job_papers)
+        if error:
+            source_errors.setdefault(source.name, error)
+        if len(chunk) == 1:
+            by_topic[chunk[0]].extend(job_papers)
+            continue
+        index = CorpusIndex(job_papers)
+        for topic in chunk:
+            by_topic[topic].extend(job_papers[idx] for idx in sorted(index.scores(topic)))
+
+    candidates = {key: by_topic[normalize_query(query)] for key, query in queries.items()}
+    return candidates, papers_per_source, source_errors
+
+
+def _rank(query: str, papers: Sequence[Paper], limit: int) -> list[ScoredPaper]:
+    """Rank candidates with BM25, or by embedding similarity when vector ranking is enabled."""
+    if vector_ranking_enabled():
+        return VectorCorpus(papers).rank(query, limit)
+    return rank_scored(query, papers, limit)
+
+
+def _stored_papers(store: PaperStore, query: str, target_date: date, limit: int) -> list[Paper]:
+    """Candidates from the paper store: full-text matches plus, in vector mode, nearest neighbours
+    from the embedding index, which also finds papers that share no keyword with the query."""
+    papers = store.search(normalize_query(query), target_date)
+    if vector_ranking_enabled():
+        nearest = get_vector_index().search(normalize_query(query), limit * 10, published_date=target_date)
+        papers = dedup_papers(papers + store.get(key for key, _ in nearest))
+    return papers
+
+
+def _use_store(store: PaperStore | None, target_date: date) -> bool:
+    """Whether digests for ``target_date`` can be built from the paper store."""
+    if store is None:
+        return False
+    if store.count(target_date) == 0:
+        logger.info(f"Paper store has nothing for {target_date}, falling back to live sources")
+        return False
+    return True
+
+
+def ingest_papers(
+    target_date: date,
+    queries: Sequence[str],
+    sources: Sequence[PaperSource] | None = None,
+    store: PaperStore | None = None,
+    source_deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates_per_source: int | None = None,
+    health: HealthRegistry | None = None,
+) -> int:
+    """Fetch ``target_date``'s papers for ``queries`` once and save them in the paper store.
+
+    Meant to run once a day (``papers-digest ingest``) for the areas of all
+    channels; digests built with ``store`` then read from disk instead of the
+    APIs. Safe to repeat: known papers are updated in place. Returns the
+    number of rows added or changed.
+    """
+    sources = list(sources) if sources is not None else _default_sources()
+    store = store or get_paper_store()
+    health = health or get_health_registry()
+    candidates, papers_per_source, source_errors = collect_papers_batch(
+        target_date, {query: query for query in queries}, sources, source_deadline, max_candidates_per_source, health
+    )
+    for name, error in source_errors.items():
+        logger.warning(f"Ingest from {name} incomplete: {error}")
+    papers = dedup_papers(paper for papers in candidates.values() for paper in papers)
+    changed = store.upsert(papers)
+    if vector_ranking_enabled():
+        get_vector_index().add([canonical_key(paper) for paper in papers], papers)
+    logger.info(f"Ingested {len(papers)} papers for {target_date} ({changed} new or updated), per source: {papers_per_source}")
+    return changed
+
+
+def _health_states(health: HealthRegistry, sources: Sequence[PaperSource]) -> dict[str, str]:
+    states = health.states()
+    return {source.name: states.get(source.name, CLOSED) for source in sources}
+
+
+def _candidate_cap(limit: int, max_candidates_per_source: int | None) -> int:
+    if max_candidates_per_source is not None:
+        return max_candidates_per_source
+    return max(1, limit) * CANDIDATES_PER_RESULT
+
+
+def _default_summarizer() -> Summarizer:
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    return OpenAISummarizer(api_key) if api_key else SimpleSummarizer()
+
+
+@dataclass
+class _DigestContext:
+    """What one digest is built from, as needed to render it and record its metrics."""
+
+    query: str
+    target_date: date
+    papers: list[Paper]
+    summarizer: Summarizer
+    sources: Sequence[PaperSource]
+    papers_per_source: dict[str, int]
+    source_errors: dict[str, str]
+    source_health: dict[str, str]
+    start_time: float
+    collect_metrics: bool
+
+
+@dataclass
+class _PendingDigest:
+    """A digest whose summaries are being made; ``finish`` renders it with whatever has landed by then."""
+
+    context: _DigestContext
+    ranked: list[ScoredPaper]
+    recommendations: list[str]
+    summaries: dict[str, str]
+    futures: dict[Future, list[Paper]]
+    summary_deadline: float | None
+    on_revision: Callable[[list[str], bool], None] | None = None
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures)
+
+    def finish(self) -> list[str]:
+        """Summaries still pending become extractive ones (see ``_gather_summaries``); returns the message parts.
+
+        With ``on_revision``, the late summaries re-render the digest when they
+        land: ``on_revision(parts, final)`` is called from a worker thread,
+        ``final`` being true once nothing is pending any more.
+        """
+        ranked_papers = [scored.paper for scored in self.ranked]
+        on_late = self._revise if self.on_revision is not None else None
+        summaries = _gather_summaries(
+            self.context.summarizer, ranked_papers, self.summaries, self.futures, self.summary_deadline, on_late
+        )
+        return _format_digest(self.context, self.ranked, summaries, len(self.summaries), self.recommendations)
+
+    def _revise(self, summaries: dict[str, str], pending: int) -> None:
+        """Re-render the digest with the summaries landed so far and hand it to ``on_revision``."""
+        ranked_papers = [scored.paper for scored in self.ranked]
+        parts = format_digest(self.context.query, self.context.target_date, ranked_papers, summaries, self.recommendations)
+        self.on_revision(parts, pending == 0)
+
+
+def _start_digest(
+    context: _DigestContext,
+    ranked: list[ScoredPaper],
+    summary_deadline: float | None = DEFAULT_SUMMARY_DEADLINE,
+    on_revision: Callable[[list[str], bool], None] | None = None,
+    calls: dict[str, Future] | None = None,
+) -> _PendingDigest:
+    """Compute the recommendations of a digest and start summarizing its ranked papers.
+
+    Digests given the same ``calls`` share the summaries in flight (see ``_submit_summaries``).
+    """
+    recommendations = _recommendations(context.query, context.target_date, context.papers)
+    summaries, futures = _submit_summaries(
+        context.summarizer, [scored.paper for scored in ranked], get_summary_cache(), calls
+    )
+    return _PendingDigest(
+        context=context,
+        ranked=ranked,
+        recommendations=recommendations,
+        summaries=summaries,
+        futures=futures,
+        summary_deadline=summary_deadline,
+        on_revision=on_revision,
+    )
+
+
+def _max_concurrency(summarizer: Summarizer) -> int:
+    return max(1, int(getattr(summarizer, "max_concurrency", 1)))
+
+
+# Concurrent calls per summarizer class, shared by all digests built in this process.
+_provider_slots: dict[str, threading.BoundedSemaphore] = {}
+_provider_slots_lock = threading.Lock()
+
+
+def _slots(summarizer: Summarizer) -> threading.BoundedSemaphore:
+    name = type(summarizer).__name__
+    with _provider_slots_lock:
+        if name not in _provider_slots:
+            _provider_slots[name] = threading.BoundedSemaphore(_max_concurrency(summarizer))
+        return _provider_slots[name]
+
+
+# The same for async digests; asyncio semaphores are bound to the event loop they are used on.
+_async_provider_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _async_slots(summarizer: Summarizer) -> asyncio.Semaphore:
+    """Semaphore capping the calls to ``summarizer``'s provider from all digests of the running loop."""
+    slots = _async_provider_slots.setdefault(asyncio.get_running_loop(), {})
+    name = type(summarizer).__name__
+    if name not in slots:
+        slots[name] = asyncio.Semaphore(_max_concurrency(summarizer))
+    return slots[name]
+
+
+def _fallback_summary(summarizer: Summarizer, paper: Paper, error: Exception) -> str:
+    logger.warning(f"{type(summarizer).__name__} failed on {paper.paper_id!r}, using the abstract: {error}")
+    return SimpleSummarizer().summarize(paper)
+
+
+def _summary_key(summarizer: Summarizer, paper: Paper) -> str:
+    return summary_key(canonical_key(paper), type(summarizer).__name__, getattr(summarizer, "model", ""), prompt_hash(paper))
+
+
+def _summary_groups(summarizer: Summarizer, papers: Sequence[Paper]) -> list[list[Paper]]:
+    """Papers to summarize per provider call: token-sized batches when the summarizer has ``summarize_many``."""
+    batch_size = getattr(summarizer, "batch_size", 1)
+    if batch_size > 1 and hasattr(summarizer, "summarize_many"):
+        return token_batches(papers, summarizer.batch_tokens, batch_size)
+    return [[paper] for paper in papers]
+
+
+def _summarize_group(summarizer: Summarizer, group: Sequence[Paper], cache: SummaryCache | None) -> list[str]:
+    """Summaries of ``group`` from one provider call; papers it failed on fall back. Fallbacks are not cached."""
+    error: Exception = ValueError("missing from the batched answer")
+    with _slots(summarizer):
         try:
-            fetched = list(source.fetch(target_date, query))
-            papers.extend(fetched)
-            papers_per_source[source.name] = len(fetched)
-            logger.info(f"Fetched {len(fetched)} papers from {source.name}")
+            if len(group) > 1:
+                texts = summarizer.summarize_many(group)
+            else:
+                texts = {group[0].paper_id: summarizer.summarize(group[0])}
         except Exception as e:
-            error_msg = str(e)
-            source_errors[source.name] = error_msg
-            papers_per_source[source.name] = 0
-            logger.warning(f"Failed to fetch from {source.name}: {e}", exc_info=True)
+            texts, error = {}, e
+    summaries = []
+    for paper in group:
+        text = texts.get(paper.paper_id)
+        if text is None:
+            summaries.append(_fallback_summary(summarizer, paper, error))
             continue
-    return papers, papers_per_source, source_errors
+        if cache is not None:
+            cache.put(_summary_key(summarizer, paper), text)
+        summaries.append(text)
+    return summaries
+
+
+def _summary_executor() -> ThreadPoolExecutor:
+    global _SUMMARY_EXECUTOR
+    if _SUMMARY_EXECUTOR is None:
+        workers = max(1, int(os.getenv("PAPERS_DIGEST_SUMMARY_WORKERS", "8")))
+        _SUMMARY_EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize")
+    return _SUMMARY_EXECUTOR
+
+
+def _log_late_summaries(summarizer: Summarizer, late: int, deadline: float | None) -> None:
+    if late:
+        logger.info(
+            f"{late} summaries by {type(summarizer).__name__} missed the {deadline:.0f}s deadline, "
+            "using extractive ones; they keep filling the summary cache in the background"
+        )
+
+
+def _cached_summaries(summarizer: Summarizer, papers: Sequence[Paper], cache: SummaryCache | None) -> dict[str, str]:
+    summaries: dict[str, str] = {}
+    if cache is not None:
+        for paper in papers:
+            cached = cache.get(_summary_key(summarizer, paper))
+            if cached is not None:
+                summaries[paper.paper_id] = cached
+    return summaries
+
+
+def _resolve_group(
+    summarizer: Summarizer, group: Sequence[Paper], cache: SummaryCache | None, futures: Sequence[Future]
+) -> None:
+    """Summarize ``group`` in one provider call and hand every summary to its paper's future."""
+    try:
+        texts = _summarize_group(summarizer, group, cache)
+    except BaseException as e:
+        for future in futures:
+            future.set_exception(e)
+        return
+    for future, text in zip(futures, texts):
+        future.set_result(text)
+
+
+def _submit_summaries(
+    summarizer: Summarizer,
+    papers: Sequence[Paper],
+    cache: SummaryCache | None,
+    calls: dict[str, Future] | None = None,
+) -> tuple[dict[str, str], dict[Future, list[Paper]]]:
+    """Cached summaries by paper id, and a future per summary still to make with the papers waiting on it.
+
+    Cache misses are sent in batches when the summarizer supports
+    ``summarize_many``. At most ``summarizer.max_concurrency`` calls to the
+    provider run at once across the process, so a digest takes about as long
+    as its slowest call rather than the sum of all. Papers whose summary fails
+    fall back to ``SimpleSummarizer`` one by one; calls that outlive a digest's
+    deadline go on in the background and cache the summaries for later digests.
+    ``calls`` holds the futures of summaries already requested by summary key:
+    digests that share it (e.g. the keys of one batch) wait on the same call
+    instead of asking the provider again for a summary that is on its way.
+    """
+    summaries = _cached_summaries(summarizer, papers, cache)
+    calls = {} if calls is None else calls
+    futures: dict[Future, list[Paper]] = {}
+    missing: list[Paper] = []
+    for paper in papers:
+        if paper.paper_id in summaries:
+            continue
+        key = _summary_key(summarizer, paper)
+        if key not in calls:
+            calls[key] = Future()
+            missing.append(paper)
+        futures.setdefault(calls[key], []).append(paper)
+    for group in _summary_groups(summarizer, missing):
+        group_futures = [calls[_summary_key(summarizer, paper)] for paper in group]
+        for future in group_futures:
+            future.set_running_or_notify_cancel()
+        _summary_executor().submit(_resolve_group, summarizer, group, cache, group_futures)
+    return summaries, futures
+
+
+def _stream_summaries(
+    summarizer: Summarizer, papers: Sequence[Paper], cache: SummaryCache | None, deadline: float | None
+) -> Iterator[tuple[Paper, str, bool]]:
+    """``(paper, summary, cached)`` in the order of ``papers``, each as soon as its summary is ready.
+
+    Summaries are requested at once through ``_submit_summaries``, with one
+    deadline for the whole digest and the same extractive fallback as
+    ``_gather_summaries``.
+    """
+    summaries, futures = _submit_summaries(summarizer, papers, cache)
+    cached = set(summaries)
+    pending = {paper.paper_id: future for future, waiting in futures.items() for paper in waiting}
+    due = None if deadline is None else time.monotonic() + deadline
+    late = 0
+    for paper in papers:
+        if paper.paper_id not in summaries:
+            future = pending[paper.paper_id]
+            try:
+                text = future.result(timeout=None if due is None else max(0.0, due - time.monotonic()))
+                summaries.update((member.paper_id, text) for member in futures[future])
+            except FutureTimeoutError:
+                late += 1
+                summaries[paper.paper_id] = SimpleSummarizer().summarize(paper)
+        yield paper, summaries[paper.paper_id], paper.paper_id in cached
+    _log_late_summaries(summarizer, late, deadline)
+
+
+def _follow_late_summaries(
+    futures: Mapping[Future, list[Paper]],
+    late: set[Future],
+    summaries: dict[str, str],
+    on_late: Callable[[dict[str, str], int], None],
+) -> None:
+    """Call ``on_late(summaries, pending)`` each time a late summary lands, or once right away if none is late."""
+    if not late:
+        on_late(dict(summaries), 0)
+        return
+    lock = threading.Lock()
+    pending = set(late)
+    summaries = dict(summaries)
+
+    def landed(future: Future) -> None:
+        with lock:
+            pending.discard(future)
+            if not future.cancelled() and future.exception() is None:
+                summaries.update((paper.paper_id, future.result()) for paper in futures[future])
+            on_late(dict(summaries), len(pending))
+
+    for future in late:
+        future.add_done_callback(landed)
+
+
+def _gather_summaries(
+    summarizer: Summarizer,
+    papers: Sequence[Paper],
+    summaries: dict[str, str],
+    futures: Mapping[Future, list[Paper]],
+    deadline: float | None,
+    on_late: Callable[[dict[str, str], int], None] | None = None,
+) -> dict[str, str]:
+    """Summaries by paper id in the order of ``papers``, from the cached ones and the finished calls.
+
+    Calls still running are late: their papers get the extractive summary now,
+    and ``on_late`` is told about each late summary as it lands.
+    """
+    summaries = dict(summaries)
+    late = {future for future in futures if not future.done()}
+    for future, waiting in futures.items():
+        if future in late:
+            summaries.update((paper.paper_id, SimpleSummarizer().summarize(paper)) for paper in waiting)
+        else:
+            summaries.update((paper.paper_id, future.result()) for paper in waiting)
+    _log_late_summaries(summarizer, sum(len(futures[future]) for future in late), deadline)
+    summaries = {paper.paper_id: summaries[paper.paper_id] for paper in papers}
+    if on_late is not None:
+        _follow_late_summaries(futures, late, summaries, on_late)
+    return summaries
+
+
+async def _asummarize_group(
+    summarizer: Summarizer, group: Sequence[Paper], slots: asyncio.Semaphore, cache: SummaryCache | None
+) -> list[str]:
+    """Async counterpart of ``_summarize_group``: batches go through ``summarize_many`` on a worker thread."""
+    error: Exception = ValueError("missing from the batched answer")
+    async with slots:
+        try:
+            if len(group) > 1:
+                texts = await asyncio.to_thread(summarizer.summarize_many, group)
+            else:
+                asummarize = getattr(summarizer, "asummarize", None)
+                if asummarize is not None:
+                    text = await asummarize(group[0])
+                else:
+                    text = await asyncio.to_thread(summarizer.summarize, group[0])
+                texts = {group[0].paper_id: text}
+        except Exception as e:
+            texts, error = {}, e
+    summaries = []
+    for paper in group:
+        text = texts.get(paper.paper_id)
+        if text is None:
+            summaries.append(_fallback_summary(summarizer, paper, error))
+            continue
+        if cache is not None:
+            await asyncio.to_thread(cache.put, _summary_key(summarizer, paper), text)
+        summaries.append(text)
+    return summaries
+
+
+def _recommendations(query: str, target_date: date, papers: Sequence[Paper]) -> list[str]:
+    """Update the area's trending terms with the day's candidates and return its rising topics."""
+    try:
+        area = normalize_query(query)
+        tracker = get_trend_tracker()
+        tracker.observe(area, target_date, papers)
+        return tracker.rising(area, exclude=area.split())
+    except Exception as e:
+        logger.warning(f"Failed to update trending topics: {e}", exc_info=True)
+        return []
+
+
+def _format_digest(
+    context: _DigestContext,
+    ranked: list[ScoredPaper],
+    summaries: dict[str, str],
+    summary_cache_hits: int,
+    recommendations: Sequence[str],
+) -> list[str]:
+    """Format ranked and summarized papers into message parts and record digest metrics."""
+    digest_parts = format_digest(
+        context.query, context.target_date, [scored.paper for scored in ranked], summaries, recommendations
+    )
+    _record_digest_metrics(context, ranked, digest_parts, summary_cache_hits)
+    return digest_parts
+
+
+def _record_digest_metrics(
+    context: _DigestContext, ranked: list[ScoredPaper], digest_parts: list[str], summary_cache_hits: int
+) -> None:
+    if not context.collect_metrics:
+        return
+    try:
+        metrics = get_metrics_collector()
+        metrics.record_digest(
+            query=context.query,
+            target_date=context.target_date,
+            papers=context.papers,
+            ranked=[scored.paper for scored in ranked],
+            scores=[scored.score for scored in ranked],
+            sources_used=[s.name for s in context.sources],
+            papers_per_source=context.papers_per_source,
+            source_errors=context.source_errors,
+            source_health=context.source_health,
+            generation_time=time.time() - context.start_time,
+            summarizer_name=context.summarizer.__class__.__name__,
+            digest_parts=digest_parts,
+            summary_cache_hits=summary_cache_hits,
+            summary_cache_misses=len(ranked) - summary_cache_hits,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record metrics: {e}", exc_info=True)
+
+
+def _stored_candidates(
+    store: PaperStore, query: str, target_date: date, limit: int, sources: Sequence[PaperSource]
+) -> tuple[list[Paper], dict[str, int], dict[str, str]]:
+    papers = _stored_papers(store, query, target_date, limit)
+    papers_per_source = {source.name: 0 for source in sources}
+    for paper in papers:
+        papers_per_source[paper.source] = papers_per_source.get(paper.source, 0) + 1
+    return papers, papers_per_source, {}
+
+
+def _digest_candidates(
+    query: str,
+    target_date: date,
+    limit: int,
+    sources: Sequence[PaperSource],
+    source_deadline: float,
+    max_candidates_per_source: int | None,
+    health: HealthRegistry,
+    store: PaperStore | None,
+) -> tuple[list[Paper], dict[str, int], dict[str, str]]:
+    """Deduplicated candidates of one digest from the paper store or the live sources, with per-source stats."""
+    if _use_store(store, target_date):
+        papers, papers_per_source, source_errors = _stored_candidates(store, query, target_date, limit, sources)
+    else:
+        papers, papers_per_source, source_errors = _collect_papers(
+            target_date, query, sources, source_deadline, _candidate_cap(limit, max_candidates_per_source), health
+        )
+    return dedup_papers(papers), papers_per_source, source_errors
 
 
 def run_digest(
@@ -52,41 +838,297 @@ def run_digest(
     sources: Sequence[PaperSource] | None = None,
     summarizer: Summarizer | None = None,
     collect_metrics: bool = True,
+    source_deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates_per_source: int | None = None,
+    health: HealthRegistry | None = None,
+    store: PaperStore | None = None,
+    summary_deadline: float | None = DEFAULT_SUMMARY_DEADLINE,
+    on_revision: Callable[[list[str], bool], None] | None = None,
 ) -> list[str]:
-    """Run digest and return list of message parts for Telegram."""
+    """Run digest and return list of message parts for Telegram.
+
+    With a ``store``, candidates come from the local paper store filled by
+    ``ingest_papers`` instead of the live APIs (which are only used when
+    nothing was ingested for ``target_date``). Each source gives at most
+    ``max_candidates_per_source`` candidates (by default ``CANDIDATES_PER_RESULT``
+    per paper of the digest). Papers whose summary is not
+    ready after ``summary_deadline`` seconds (``None``: no limit) get an
+    extractive summary instead; ``on_revision(parts, final)`` then receives
+    the re-rendered digest each time some of the late summaries arrive, so
+    an already published digest can be updated in place.
+    """
     start_time = time.time()
     sources = list(sources) if sources is not None else _default_sources()
-    if summarizer is None:
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        summarizer = OpenAISummarizer(api_key) if api_key else SimpleSummarizer()
-    
-    summarizer_name = summarizer.__class__.__name__
-
-    papers, papers_per_source, source_errors = _collect_papers(target_date, query, sources)
-    ranked = rank_papers(query, papers, limit)
-    summaries = {paper.paper_id: summarizer.summarize(paper) for paper in ranked}
-    digest_parts = format_digest(query, target_date, ranked, summaries, [])
-    
-    generation_time = time.time() - start_time
-    
-    # Collect metrics
-    if collect_metrics:
-        try:
-            metrics = get_metrics_collector()
-            metrics.record_digest(
-                query=query,
-                target_date=target_date,
-                papers=papers,
-                ranked=ranked,
-                sources_used=[s.name for s in sources],
-                papers_per_source=papers_per_source,
-                source_errors=source_errors,
-                generation_time=generation_time,
-                summarizer_name=summarizer_name,
-                digest_parts=digest_parts,
-            )
-        except Exception as e:
-            logger.warning(f"Failed to record metrics: {e}", exc_info=True)
-    
-    return digest_parts
+    summarizer = summarizer or _default_summarizer()
+    health = health or get_health_registry()
+
+    papers, papers_per_source, source_errors = _digest_candidates(
+        query, target_date, limit, sources, source_deadline, max_candidates_per_source, health, store
+    )
+    context = _DigestContext(
+        query=query,
+        target_date=target_date,
+        papers=papers,
+        summarizer=summarizer,
+        sources=sources,
+        papers_per_source=papers_per_source,
+        source_errors=source_errors,
+        source_health=_health_states(health, sources),
+        start_time=start_time,
+        collect_metrics=collect_metrics,
+    )
+    digest = _start_digest(context, _rank(query, papers, limit), summary_deadline, on_revision)
+    wait(digest.futures, timeout=summary_deadline)
+    return digest.finish()
+
+
+def stream_digest(
+    query: str,
+    target_date: date,
+    limit: int = 10,
+    sources: Sequence[PaperSource] | None = None,
+    summarizer: Summarizer | None = None,
+    collect_metrics: bool = True,
+    source_deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates_per_source: int | None = None,
+    health: HealthRegistry | None = None,
+    store: PaperStore | None = None,
+    summary_deadline: float | None = DEFAULT_SUMMARY_DEADLINE,
+) -> Iterator[str]:
+    """Streaming variant of ``run_digest``: yields the same message parts, each as soon as it is complete.
+
+    All summaries are requested at once, but a part only waits for the papers
+    it contains (and the next one, to know it is full), so the first part can
+    be sent while later papers are still being summarized. Metrics are
+    recorded once the last part has been yielded.
+    """
+    start_time = time.time()
+    sources = list(sources) if sources is not None else _default_sources()
+    summarizer = summarizer or _default_summarizer()
+    health = health or get_health_registry()
+
+    papers, papers_per_source, source_errors = _digest_candidates(
+        query, target_date, limit, sources, source_deadline, max_candidates_per_source, health, store
+    )
+    ranked = _rank(query, papers, limit)
+    recommendations = _recommendations(query, target_date, papers)
+    cache_hits = 0
+
+    def entries() -> Iterator[tuple[Paper, str]]:
+        nonlocal cache_hits
+        ranked_papers = [scored.paper for scored in ranked]
+        for paper, summary, cached in _stream_summaries(summarizer, ranked_papers, get_summary_cache(), summary_deadline):
+            cache_hits += cached
+            yield paper, summary
+
+    digest_parts: list[str] = []
+    for part in iter_digest(query, target_date, entries(), recommendations):
+        digest_parts.append(part)
+        yield part
+    context = _DigestContext(
+        query=query,
+        target_date=target_date,
+        papers=papers,
+        summarizer=summarizer,
+        sources=sources,
+        papers_per_source=papers_per_source,
+        source_errors=source_errors,
+        source_health=_health_states(health, sources),
+        start_time=start_time,
+        collect_metrics=collect_metrics,
+    )
+    _record_digest_metrics(context, ranked, digest_parts, cache_hits)
+
+
+async def arun_digest(
+    query: str,
+    target_date: date,
+    limit: int = 10,
+    sources: Sequence[PaperSource] | None = None,
+    summarizer: Summarizer | None = None,
+    collect_metrics: bool = True,
+    source_deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates_per_source: int | None = None,
+    health: HealthRegistry | None = None,
+    store: PaperStore | None = None,
+    summary_deadline: float | None = DEFAULT_SUMMARY_DEADLINE,
+) -> list[str]:
+    """Async counterpart of ``run_digest`` for callers that already run an event loop.
+
+    Sources are fetched through ``PaperSource.afetch`` and the ranked papers
+    are summarized concurrently (in batches when the summarizer has
+    ``summarize_many``, up to ``summarizer.max_concurrency`` calls at once per
+    loop), all on the caller's loop; SQLite and ``summarize_many`` run on
+    worker threads. Summaries that miss ``summary_deadline`` keep running on
+    the loop to fill the summary cache. There is no ``on_revision``:
+    progressive publishing uses ``run_digest``. Call
+    ``http_client.aclose_async_http_client()`` before the loop ends.
+    """
+    start_time = time.time()
+    sources = list(sources) if sources is not None else _default_sources()
+    summarizer = summarizer or _default_summarizer()
+    health = health or get_health_registry()
+
+    if store is not None and await asyncio.to_thread(_use_store, store, target_date):
+        papers, papers_per_source, source_errors = await asyncio.to_thread(
+            _stored_candidates, store, query, target_date, limit, sources
+        )
+    else:
+        papers, papers_per_source, source_errors = await _acollect_papers(
+            target_date, query, sources, source_deadline, _candidate_cap(limit, max_candidates_per_source), health
+        )
+    papers = dedup_papers(papers)
+    ranked = _rank(query, papers, limit)
+    ranked_papers = [scored.paper for scored in ranked]
+    slots, cache = _async_slots(summarizer), get_summary_cache()
+    summaries = await asyncio.to_thread(_cached_summaries, summarizer, ranked_papers, cache)
+    cache_hits = len(summaries)
+    groups = _summary_groups(summarizer, [paper for paper in ranked_papers if paper.paper_id not in summaries])
+    tasks = {asyncio.ensure_future(_asummarize_group(summarizer, group, slots, cache)): group for group in groups}
+    late: set[asyncio.Future] = set()
+    if tasks:
+        _, late = await asyncio.wait(tasks, timeout=summary_deadline)
+    for task, group in tasks.items():
+        if task in late:
+            summaries.update((paper.paper_id, SimpleSummarizer().summarize(paper)) for paper in group)
+            _background_summaries.add(task)
+            task.add_done_callback(_background_summaries.discard)
+        else:
+            summaries.update((paper.paper_id, text) for paper, text in zip(group, task.result()))
+    _log_late_summaries(summarizer, sum(len(tasks[task]) for task in late), summary_deadline)
+    recommendations = await asyncio.to_thread(_recommendations, query, target_date, papers)
+    context = _DigestContext(
+        query=query,
+        target_date=target_date,
+        papers=papers,
+        summarizer=summarizer,
+        sources=sources,
+        papers_per_source=papers_per_source,
+        source_errors=source_errors,
+        source_health=_health_states(health, sources),
+        start_time=start_time,
+        collect_metrics=collect_metrics,
+    )
+    return _format_digest(context, ranked, summaries, cache_hits, recommendations)
+
+
+def run_digest_batch(
+    queries: Mapping[str, str],
+    target_date: date,
+    limit: int = 10,
+    sources: Sequence[PaperSource] | None = None,
+    summarizers: Mapping[str, Summarizer] | None = None,
+    collect_metrics: bool = True,
+    source_deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates_per_source: int | None = None,
+    health: HealthRegistry | None = None,
+    store: PaperStore | None = None,
+    summary_deadline: float | None = DEFAULT_SUMMARY_DEADLINE,
+    on_revision: Callable[[str, list[str], bool], None] | None = None,
+) -> dict[str, list[str]]:
+    """Run digests for many ``{key: query}`` pairs (e.g. channels) from one batched collection.
+
+    Upstream requests scale with the number of distinct topics rather than the
+    number of keys. ``summarizers`` may give a summarizer per key; keys without
+    one use the default summarizer. ``store`` and ``on_revision`` (which also
+    gets the key) work as in ``run_digest``; ``summary_deadline`` is shared by
+    all keys. Returns message parts per key.
+    """
+    digests = iter_digest_batch(
+        queries, target_date, limit, sources, summarizers, collect_metrics, source_deadline,
+        max_candidates_per_source, health, store, summary_deadline, on_revision,
+    )
+    ready = dict(digests)
+    return {key: ready[key] for key in queries}
+
+
+def iter_digest_batch(
+    queries: Mapping[str, str],
+    target_date: date,
+    limit: int = 10,
+    sources: Sequence[PaperSource] | None = None,
+    summarizers: Mapping[str, Summarizer] | None = None,
+    collect_metrics: bool = True,
+    source_deadline: float = DEFAULT_SOURCE_DEADLINE,
+    max_candidates_per_source: int | None = None,
+    health: HealthRegistry | None = None,
+    store: PaperStore | None = None,
+    summary_deadline: float | None = DEFAULT_SUMMARY_DEADLINE,
+    on_revision: Callable[[str, list[str], bool], None] | None = None,
+) -> Iterator[tuple[str, list[str]]]:
+    """``(key, message parts)`` of ``run_digest_batch``, each as soon as that key's digest is ready.
+
+    The summaries of every key are requested at once and share one
+    ``summary_deadline``, so the whole batch waits for summaries at most that
+    long however many keys it has, and keys that share a paper wait on a single
+    call for its summary. A digest is ready when all its summaries have landed,
+    or for every key still waiting once the deadline has passed.
+    """
+    start_time = time.time()
+    sources = list(sources) if sources is not None else _default_sources()
+    summarizers = summarizers or {}
+    health = health or get_health_registry()
+
+    if _use_store(store, target_date):
+        candidates = {key: _stored_papers(store, query, target_date, limit) for key, query in queries.items()}
+        source_errors: dict[str, str] = {}
+    else:
+        candidates, _, source_errors = collect_papers_batch(
+            target_date, queries, sources, source_deadline, _candidate_cap(limit, max_candidates_per_source), health
+        )
+    source_health = _health_states(health, sources)
+    # All keys are ranked in one pass over a single index of the day's pool.
+    pool = dedup_papers(paper for papers in candidates.values() for paper in papers)
+    vector_ranking = vector_ranking_enabled()
+    if vector_ranking:
+        corpus = VectorCorpus(pool)
+        ranked_by_key = {key: corpus.rank(query, limit) for key, query in queries.items()}
+    else:
+        ranked_by_key = CorpusIndex(pool).rank_many(queries, limit)
+    pending: dict[str, _PendingDigest] = {}
+    # Keys that share papers wait on the same summary calls rather than each asking the provider.
+    calls: dict[str, Future] = {}
+    for key, query in queries.items():
+        papers = dedup_papers(candidates[key])
+        papers_per_source = {source.name: 0 for source in sources}
+        for paper in papers:
+            papers_per_source[paper.source] = papers_per_source.get(paper.source, 0) + 1
+        ranked = ranked_by_key[key]
+        if not vector_ranking:
+            # Vector ranking already scores every candidate; BM25 leaves out the ones sharing no term.
+            ranked = _pad_ranking(ranked, query, papers, limit)
+        context = _DigestContext(
+            query=query,
+            target_date=target_date,
+            papers=papers,
+            summarizer=summarizers.get(key) or _default_summarizer(),
+            sources=sources,
+            papers_per_source=papers_per_source,
+            source_errors=source_errors,
+            source_health=source_health,
+            start_time=start_time,
+            collect_metrics=collect_metrics,
+        )
+        pending[key] = _start_digest(
+            context, ranked, summary_deadline, partial(on_revision, key) if on_revision is not None else None, calls
+        )
+
+    due = None if summary_deadline is None else time.monotonic() + summary_deadline
+    while pending:
+        ready = [key for key, digest in pending.items() if digest.done()]
+        remaining = None if due is None else due - time.monotonic()
+        if not ready and (remaining is None or remaining > 0):
+            running = [future for digest in pending.values() for future in digest.futures if not future.done()]
+            wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+            continue
+        for key in ready or list(pending):
+            yield key, pending.pop(key).finish()
+
 
+def _pad_ranking(ranked: list[ScoredPaper], query: str, candidates: Sequence[Paper], limit: int) -> list[ScoredPaper]:
+    """Fill a short ``rank_many`` result with the key's own non-matching candidates, as ``rank_scored`` would."""
+    if len(ranked) >= limit:
+        return ranked
+    seen = {canonical_key(scored.paper) for scored in ranked}
+    padding = (paper for paper in candidates if canonical_key(paper) not in seen and score_paper(query, paper) == 0)
+    return ranked + [ScoredPaper(paper, 0.0) for _, paper in zip(range(limit - len(ranked)), padding)]
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import heapq
 import math
 import re
 from collections import Counter
-from typing import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Hashable, Iterable, Iterator, Mapping, Sequence, TypeVar
+
+import numpy as np
 
 from papers_digest.models import Paper
 
@@ -12,26 +16,191 @@ def _tokenize(text: str) -> list[str]:
     return re.findall(r"[a-z0-9]+", text.lower())
 
 
+K = TypeVar("K", bound=Hashable)
+
+# BM25F parameters: title matches count double, both fields are length-normalized.
+TITLE_WEIGHT = 2.0
+ABSTRACT_WEIGHT = 1.0
+K1 = 1.2
+B = 0.75
+
+
+@dataclass(frozen=True)
+class ScoredPaper:
+    paper: Paper
+    score: float
+
+
+class CorpusIndex:
+    """Inverted index over a corpus of papers, scored with BM25F.
+
+    Every paper is tokenized once; postings keep the per-field term counts, so
+    scoring a query only touches the postings lists of its terms.
+    """
+
+    def __init__(self, papers: Iterable[Paper]) -> None:
+        self.papers = list(papers)
+        # Flat (position, title tf, abstract tf) triples per term; cheap to turn into arrays.
+        self._postings: dict[str, list[int]] = {}
+        title_lengths: list[int] = []
+        abstract_lengths: list[int] = []
+        postings = self._postings
+        for idx, paper in enumerate(self.papers):
+            title = Counter(_tokenize(paper.title))
+            abstract = Counter(_tokenize(paper.abstract or ""))
+            title_lengths.append(sum(title.values()))
+            abstract_lengths.append(sum(abstract.values()))
+            for term, tf in abstract.items():
+                postings.setdefault(term, []).extend((idx, title.get(term, 0), tf))
+            for term, tf in title.items():
+                if term not in abstract:
+                    postings.setdefault(term, []).extend((idx, tf, 0))
+        # Field length normalization factors, 1 - b + b * len / avg_len.
+        self._avg_title = max(1.0, sum(title_lengths) / max(1, len(title_lengths)))
+        self._avg_abstract = max(1.0, sum(abstract_lengths) / max(1, len(abstract_lengths)))
+        self._title_norm = [1 - B + B * length / self._avg_title for length in title_lengths]
+        self._abstract_norm = [1 - B + B * length / self._avg_abstract for length in abstract_lengths]
+        self._title_norm_array = np.array(self._title_norm)
+        self._abstract_norm_array = np.array(self._abstract_norm)
+        self._term_cache: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ())) // 3
+        return math.log(1 + (len(self.papers) - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: str) -> dict[int, float]:
+        """BM25F score of every paper matching at least one query term, by position in the corpus."""
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(_tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            triples = iter(postings)
+            for idx, tf_title, tf_abstract in zip(triples, triples, triples):
+                term_score = _bm25f(idf, tf_title, tf_abstract, self._title_norm[idx], self._abstract_norm[idx])
+                scores[idx] = scores.get(idx, 0.0) + term_score
+        return scores
+
+    def _term_scores(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        """Positions and BM25F scores of the papers containing ``term``, computed once per term."""
+        cached = self._term_cache.get(term)
+        if cached is None:
+            postings = np.array(self._postings.get(term, ()), dtype=np.int64).reshape(-1, 3)
+            positions = postings[:, 0]
+            tf = (
+                TITLE_WEIGHT * postings[:, 1] / self._title_norm_array[positions]
+                + ABSTRACT_WEIGHT * postings[:, 2] / self._abstract_norm_array[positions]
+            )
+            cached = positions, self.idf(term) * tf * (K1 + 1) / (tf + K1)
+            self._term_cache[term] = cached
+        return cached
+
+    def rank_many(self, queries: Mapping[K, str], limit: int) -> dict[K, list[ScoredPaper]]:
+        """Top ``limit`` matching papers for each of many queries in one pass over the index.
+
+        The postings of every distinct query term are scored once (vectorized)
+        and added into the score vector of each query that contains it, and
+        queries with the same terms are ranked once, so 500 channels over a
+        day's pool cost about as much as their distinct terms. Unlike
+        ``rank_scored`` only papers matching at least one query term are
+        returned; ties are broken by position in the corpus.
+        """
+        by_terms: dict[tuple[str, ...], list[K]] = {}
+        for key, query in queries.items():
+            by_terms.setdefault(tuple(dict.fromkeys(_tokenize(query))), []).append(key)
+
+        ranked: dict[K, list[ScoredPaper]] = {}
+        for terms, keys in by_terms.items():
+            scores = np.zeros(len(self.papers))
+            for term in terms:
+                if term in self._postings:
+                    positions, term_scores = self._term_scores(term)
+                    scores[positions] += term_scores
+            matched = np.flatnonzero(scores)
+            if len(matched) > limit:
+                # Keep everything tied with the k-th score so the tie-break below stays exact.
+                kth = np.partition(scores[matched], len(matched) - limit)[len(matched) - limit]
+                matched = matched[scores[matched] >= kth]
+            best = matched[np.lexsort((matched, -scores[matched]))][:limit]
+            result = [ScoredPaper(self.papers[idx], float(scores[idx])) for idx in best]
+            for key in keys:
+                ranked[key] = list(result)
+        return ranked
+
+    def score_stream(self, query: str, papers: Iterable[Paper]) -> Iterator[ScoredPaper]:
+        """Score papers one by one against this corpus's statistics without indexing them.
+
+        Lets a large stream (e.g. a backfill straight from the sources) be ranked
+        lazily, using IDF and average field lengths from a reference corpus.
+        """
+        idfs = {term: self.idf(term) for term in dict.fromkeys(_tokenize(query))}
+        for paper in papers:
+            title = _tokenize(paper.title)
+            abstract = _tokenize(paper.abstract or "")
+            title_norm = 1 - B + B * len(title) / self._avg_title
+            abstract_norm = 1 - B + B * len(abstract) / self._avg_abstract
+            title_counts = Counter(term for term in title if term in idfs)
+            abstract_counts = Counter(term for term in abstract if term in idfs)
+            score = sum(
+                _bm25f(idf, title_counts[term], abstract_counts[term], title_norm, abstract_norm)
+                for term, idf in idfs.items()
+                if title_counts[term] or abstract_counts[term]
+            )
+            yield ScoredPaper(paper, score)
+
+
+def _bm25f(idf: float, tf_title: int, tf_abstract: int, title_norm: float, abstract_norm: float) -> float:
+    tf = TITLE_WEIGHT * tf_title / title_norm + ABSTRACT_WEIGHT * tf_abstract / abstract_norm
+    return idf * tf * (K1 + 1) / (tf + K1)
+
+
 def score_paper(query: str, paper: Paper) -> float:
-    query_terms = _tokenize(query)
-    if not query_terms:
-        return 0.0
-    text = f"{paper.title} {paper.abstract}"
-    tokens = _tokenize(text)
-    counts = Counter(tokens)
-
-    score = 0.0
-    for term in query_terms:
-        tf = counts.get(term, 0)
-        if tf == 0:
-            continue
-        score += 1.0 + math.log(tf)
-    return score
+    """BM25F score of a single paper; use ``CorpusIndex`` to score many papers."""
+    return CorpusIndex([paper]).scores(query).get(0, 0.0)
+
+
+def top_k(scored: Iterable[ScoredPaper], k: int) -> list[ScoredPaper]:
+    """The ``k`` best of a stream of scored papers, best first; ties keep the stream order.
+
+    Only a heap of ``k`` entries is kept, so memory is O(k) and time O(n log k).
+    """
+    if k <= 0:
+        return []
+    # Min-heap on (score, -position): the root is the entry to evict, and among
+    # equal scores the later one goes first.
+    heap: list[tuple[float, int, ScoredPaper]] = []
+    for position, item in enumerate(scored):
+        entry = (item.score, -position, item)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return [item for _, _, item in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+def rank_scored(
+    query: str, papers: Iterable[Paper], limit: int, stats: CorpusIndex | None = None
+) -> list[ScoredPaper]:
+    """Top ``limit`` papers with their scores, best first; ties keep the input order.
+
+    ``papers`` may be any iterable. Without ``stats`` the candidates are indexed
+    to get their corpus statistics; with ``stats`` (an index of a reference
+    corpus) they are scored as they stream in and never held in memory beyond
+    the top ``limit``.
+    """
+    if stats is not None:
+        return top_k(stats.score_stream(query, papers), limit)
+    index = CorpusIndex(papers)
+    scores = index.scores(query)
+    return top_k((ScoredPaper(paper, scores.get(idx, 0.0)) for idx, paper in enumerate(index.papers)), limit)
 
 
 def rank_papers(query: str, papers: Iterable[Paper], limit: int) -> list[Paper]:
-    scored = sorted(papers, key=lambda paper: score_paper(query, paper), reverse=True)
-    return list(scored[:limit])
+    return [scored.paper for scored in rank_scored(query, papers, limit)]
 
 
 def extract_keywords(query: str, papers: Sequence[Paper], top_k: int = 5) -> list[str]:
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Mapping
+
+logger = logging.getLogger(__name__)
+
+# Requests per second and burst size per upstream host, from the published limits.
+DEFAULT_RATES: dict[str, tuple[float, float]] = {
+    "export.arxiv.org": (1 / 3, 1),  # arXiv asks for one request every three seconds
+    "api.crossref.org": (5, 5),
+    "api.semanticscholar.org": (1, 1),  # shared pool for unauthenticated clients
+    "api.openalex.org": (10, 10),
+}
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a request would have to queue longer than the limiter allows."""
+
+
+def parse_rates(value: str) -> dict[str, tuple[float, float]]:
+    """Parse ``host=rate[:burst],...`` overrides, e.g. ``api.crossref.org=10:20``."""
+    rates: dict[str, tuple[float, float]] = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        host, spec = item.split("=", 1)
+        rate, _, burst = spec.partition(":")
+        rates[host.strip()] = _checked_rate(host.strip(), float(rate), float(burst or max(1.0, float(rate))))
+    return rates
+
+
+def _checked_rate(host: str, rate: float, burst: float) -> tuple[float, float]:
+    if rate <= 0:
+        raise ValueError(f"Rate limit for {host} must be a positive number of requests per second, got {rate:g}")
+    return rate, burst
+
+
+class RateLimiter:
+    """Token bucket per upstream host, shared by all processes through SQLite.
+
+    Each call reserves the next free slot of its host's bucket inside a write
+    transaction and then sleeps until that slot, so concurrent callers in the
+    bot, the CLI and the web app queue behind each other instead of tripping
+    the upstream limit. Hosts without a configured rate are not limited.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        rates: Mapping[str, tuple[float, float]] | None = None,
+        max_wait: float = 60.0,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rates = {
+            host: _checked_rate(host, *limit) for host, limit in (DEFAULT_RATES if rates is None else rates).items()
+        }
+        self.max_wait = max_wait
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (host TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def reserve(self, host: str) -> float:
+        """Reserve the next slot for ``host`` and return how long to wait for it, without sleeping."""
+        limit = self.rates.get(host)
+        if limit is None:
+            return 0.0
+        return self._reserve(host, *limit)
+
+    def _reserve(self, host: str, rate: float, burst: float) -> float:
+        """Take one token from ``host``'s bucket and return how long to wait for it."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE host = ?", (host,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            # A negative balance is the queue of callers already waiting for a token.
+            wait = max(0.0, (1.0 - tokens) / rate)
+            if wait > self.max_wait:
+                conn.execute("ROLLBACK")
+                raise RateLimitExceeded(f"Rate limit queue for {host} is {wait:.1f}s long")
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (host, tokens, updated_at) VALUES (?, ?, ?)", (host, tokens - 1.0, now)
+            )
+            conn.execute("COMMIT")
+            return wait
+        finally:
+            conn.close()
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to ``host`` is allowed; returns the seconds waited."""
+        wait = self.reserve(host)
+        if wait > 0:
+            logger.debug(f"Rate limit: waiting {wait:.2f}s for {host}")
+            time.sleep(wait)
+        return wait
+
+
+# Global rate limiter instance
+_rate_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the global rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        path = os.getenv("PAPERS_DIGEST_RATE_LIMIT_FILE", "data/ratelimit.sqlite3")
+        rates = dict(DEFAULT_RATES)
+        rates.update(parse_rates(os.getenv("PAPERS_DIGEST_RATE_LIMITS", "")))
+        _rate_limiter = RateLimiter(path, rates)
+    return _rate_limiter
@@ -1,41 +1,106 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Iterable
+from typing import IO, Any, Generator, Sequence
+from xml.etree import ElementTree
 
-import feedparser
-import requests
 from dateutil import parser as date_parser
 
 from papers_digest.models import Paper
-from papers_digest.sources.base import PaperSource
+from papers_digest.sources.base import BodyStream, PagedSource, PageInfo
 
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ARXIV = "{http://arxiv.org/schemas/atom}"
+_ENTRY = f"{_ATOM}entry"
 
-class ArxivSource(PaperSource):
+
+def _parse_date(value: str) -> date:
+    # arXiv always sends "YYYY-MM-DDTHH:MM:SSZ"; only fall back to dateutil for anything else.
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return date_parser.parse(value).date()
+
+
+def _text(element: ElementTree.Element, tag: str) -> str:
+    return " ".join((element.findtext(tag) or "").split())
+
+
+def _alternate_link(entry: ElementTree.Element) -> str:
+    for link in entry.iterfind(f"{_ATOM}link"):
+        if link.get("rel", "alternate") == "alternate":
+            return link.get("href", "")
+    return ""
+
+
+def iter_feed_entries(stream: IO[bytes]) -> Generator[ElementTree.Element, None, None]:
+    """Yield Atom ``<entry>`` elements as soon as each one is fully parsed.
+
+    The stream is parsed incrementally and every entry is dropped from the tree
+    once the consumer is done with it, so memory stays flat however large the
+    feed is.
+    """
+    root = None
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = element
+        if event == "end" and element.tag == _ENTRY:
+            yield element
+            root.clear()
+
+
+def entry_to_paper(entry: ElementTree.Element, source: str, published: date | None = None) -> Paper:
+    paper_id = (entry.findtext(f"{_ATOM}id") or "").strip()
+    return Paper(
+        paper_id=paper_id,
+        title=_text(entry, f"{_ATOM}title"),
+        abstract=(entry.findtext(f"{_ATOM}summary") or "").strip(),
+        authors=[_text(author, f"{_ATOM}name") for author in entry.iterfind(f"{_ATOM}author")],
+        url=_alternate_link(entry),
+        published_date=published or _parse_date(entry.findtext(f"{_ATOM}published") or ""),
+        source=source,
+        doi=(entry.findtext(f"{_ARXIV}doi") or "").strip(),
+        arxiv_id=paper_id.rsplit("/abs/", 1)[-1],
+    )
+
+
+class ArxivSource(PagedSource):
     name = "arxiv"
+    base_url = "http://export.arxiv.org"
+    batch_size = 8
+
+    def _first_request(self, target_date: date, query: str) -> tuple[str, dict[str, Any]]:
+        return self._batch_request(target_date, [query])
+
+    def _batch_request(self, target_date: date, queries: Sequence[str]) -> tuple[str, dict[str, Any]]:
+        day = target_date.strftime("%Y%m%d")
+        search = " OR ".join(f"(all:{query})" for query in queries)
+        params = {
+            # The date range is applied server-side; the check in _parse_page is only a safety net.
+            "search_query": f"({search}) AND submittedDate:[{day}0000 TO {day}2359]",
+            "start": 0,
+            "max_results": self.page_size,
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+        }
+        return f"{self.base_url}/api/query", params
+
+    def _parse_page(
+        self, body: BodyStream, target_date: date, params: dict[str, Any]
+    ) -> Generator[Paper, None, PageInfo]:
+        entries = 0
+        reached_older = False
 
-    def fetch(self, target_date: date, query: str) -> Iterable[Paper]:
-        query = query.strip() or "artificial intelligence"
-        search = f"all:{query}"
-        url = (
-            "http://export.arxiv.org/api/query?"
-            f"search_query={search}&start=0&max_results=50&sortBy=submittedDate&sortOrder=descending"
-        )
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        feed = feedparser.parse(response.text)
-        for entry in feed.entries:
-            published = date_parser.parse(entry.published).date()
+        for entry in iter_feed_entries(body):
+            entries += 1
+            published = _parse_date(entry.findtext(f"{_ATOM}published") or "")
+            if published < target_date:
+                reached_older = True
             if published != target_date:
                 continue
-            yield Paper(
-                paper_id=entry.id,
-                title=entry.title.strip(),
-                abstract=entry.summary.strip(),
-                authors=[author.name for author in entry.authors],
-                url=entry.link,
-                published_date=published,
-                source=self.name,
-            )
+            yield entry_to_paper(entry, self.name, published)
 
+        # Results are sorted newest first, so once older papers show up there is nothing left to find.
+        has_more = entries == params["max_results"] and not reached_older
+        next_params = {**params, "start": params["start"] + entries} if has_more else None
+        return PageInfo(entries, next_params)
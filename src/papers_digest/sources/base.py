@@ -1,16 +1,309 @@
 from __future__ import annotations
 
+import asyncio
+import io
+import logging
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import date
-from typing import Iterable
+from typing import Any, AsyncIterator, Callable, Generator, Iterable, Iterator, Mapping, Sequence
 
+from papers_digest.cache import ResponseCache, cache_key, get_response_cache, ttl_for
+from papers_digest.http_client import AsyncHttpClient, HttpClient, get_async_http_client, get_http_client
 from papers_digest.models import Paper
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY = "artificial intelligence"
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a search query, so equivalent areas hit the same cache entries."""
+    return " ".join(query.lower().split()) or DEFAULT_QUERY
+
+
+@dataclass(frozen=True)
+class FetchBudget:
+    """Upper bounds on how much a single fetch may pull from upstream."""
+    max_items: int = 500
+    max_bytes: int = 20 * 1024 * 1024
+
+
+class BodyStream:
+    """Minimal readable view of a response body.
+
+    Counts the bytes read and, when ``on_complete`` is given, collects the body
+    and hands it over once the reader reaches the end of the stream.
+    """
+
+    def __init__(self, read: Callable[[int | None], bytes], on_complete: Callable[[bytes], None] | None = None) -> None:
+        self._read = read
+        self._on_complete = on_complete
+        self._chunks: list[bytes] = []
+        self.bytes_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        whole = size is None or size < 0
+        data = self._read(None if whole else size)
+        self.bytes_read += len(data)
+        if self._on_complete is not None:
+            if data:
+                self._chunks.append(data)
+            if whole or not data:
+                body = b"".join(self._chunks)
+                self._chunks = []
+                on_complete, self._on_complete = self._on_complete, None
+                on_complete(body)
+        return data
+
 
 class PaperSource(ABC):
     name: str
+    # Root URL of the upstream API; overridable per instance (e.g. for a local test server).
+    base_url: str = ""
+    # Wall-clock budget in seconds for a single fetch. ``None`` means the
+    # collector's default deadline applies.
+    deadline: float | None = None
+    # Timeout in seconds for a single upstream request.
+    timeout: float = 30.0
+    # How many distinct queries a single upstream search can cover in fetch_batch.
+    batch_size: int = 1
+
+    def __init__(
+        self,
+        client: HttpClient | None = None,
+        base_url: str | None = None,
+        cache: ResponseCache | None = None,
+        budget: FetchBudget | None = None,
+        async_client: AsyncHttpClient | None = None,
+    ) -> None:
+        self._client = client
+        self._async_client = async_client
+        self._cache = cache
+        self.budget = budget or FetchBudget()
+        if base_url:
+            self.base_url = base_url.rstrip("/")
+
+    @property
+    def client(self) -> HttpClient:
+        """HTTP client used for upstream requests; the shared pooled client by default."""
+        return getattr(self, "_client", None) or get_http_client()
+
+    @property
+    def async_client(self) -> AsyncHttpClient:
+        """Async HTTP client used by ``afetch``; the event loop's shared client by default."""
+        return getattr(self, "_async_client", None) or get_async_http_client()
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        """Response cache for upstream requests; the shared on-disk cache by default."""
+        return getattr(self, "_cache", None) or get_response_cache()
+
+    @contextmanager
+    def _open(self, url: str, params: Mapping[str, Any], target_date: date, query: str) -> Iterator[BodyStream]:
+        """Open an upstream resource as a readable stream, going through the response cache.
+
+        Fresh entries are served without a request; stale ones are revalidated
+        with ETag / Last-Modified when the server provided them. A body read from
+        the network is stored in the cache once it has been read to the end.
+        """
+        cache = self.cache
+        key = cache_key(self.name, target_date, query, url, params)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None and cached.fresh:
+            yield BodyStream(io.BytesIO(cached.content).read)
+            return
+
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        response = self.client.get(url, params=params, headers=headers, timeout=self.timeout, stream=True)
+        try:
+            ttl = ttl_for(target_date)
+            if cached is not None and response.status_code == 304:
+                cache.refresh(key, ttl)
+                yield BodyStream(io.BytesIO(cached.content).read)
+                return
+            response.raise_for_status()
+
+            etag = response.headers.get("ETag", "")
+            last_modified = response.headers.get("Last-Modified", "")
+
+            def on_complete(body: bytes) -> None:
+                cache.put(key, body, ttl, etag=etag, last_modified=last_modified)
+
+            yield BodyStream(
+                lambda size: response.raw.read(size, decode_content=True), on_complete if cache is not None else None
+            )
+        finally:
+            response.close()
+
+    async def _aopen(self, url: str, params: Mapping[str, Any], target_date: date, query: str) -> bytes:
+        """Async counterpart of ``_open``: same cache and revalidation rules, returns the whole body.
+
+        Cache lookups run on a worker thread so a locked cache file never stalls the event loop.
+        """
+        cache = self.cache
+        key = cache_key(self.name, target_date, query, url, params)
+        cached = await asyncio.to_thread(cache.get, key) if cache is not None else None
+        if cached is not None and cached.fresh:
+            return cached.content
+
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        response = await self.async_client.get(url, params=dict(params), headers=headers, timeout=self.timeout)
+        ttl = ttl_for(target_date)
+        if cached is not None and response.status_code == 304:
+            await asyncio.to_thread(cache.refresh, key, ttl)
+            return cached.content
+        response.raise_for_status()
+        if cache is not None:
+            await asyncio.to_thread(
+                cache.put,
+                key,
+                response.content,
+                ttl,
+                etag=response.headers.get("ETag", ""),
+                last_modified=response.headers.get("Last-Modified", ""),
+            )
+        return response.content
 
     @abstractmethod
     def fetch(self, target_date: date, query: str) -> Iterable[Paper]:
         raise NotImplementedError
 
+    async def afetch(self, target_date: date, query: str) -> AsyncIterator[Paper]:
+        """Async variant of ``fetch``.
+
+        The default adapts the synchronous ``fetch`` by advancing it on a worker
+        thread, so sources that only implement ``fetch`` still work in the async
+        pipeline; paged sources override it with a native implementation.
+        """
+        papers = iter(await asyncio.to_thread(self.fetch, target_date, query))
+        done = object()
+        while True:
+            paper = await asyncio.to_thread(next, papers, done)
+            if paper is done:
+                return
+            yield paper
+
+    def fetch_batch(self, target_date: date, queries: Sequence[str]) -> Iterable[Paper]:
+        """Fetch papers matching any of ``queries`` (at most ``batch_size`` of them).
+
+        The default runs one fetch per query; sources whose API has a boolean OR
+        override it to cover all queries with a single search.
+        """
+        for query in queries:
+            yield from self.fetch(target_date, query)
+
+
+@dataclass
+class PageInfo:
+    """What a parsed upstream page tells the pager: raw item count and the params of the next page."""
+    items: int
+    next_params: dict[str, Any] | None
+
+
+class PagedSource(PaperSource):
+    """Source that streams results page by page from a paginated API.
+
+    Subclasses describe the first request and how to parse one page; ``fetch``
+    then yields papers lazily, parsing each body as it streams in, and only
+    requests the next page once the consumer has used up the current one.
+    Paging stops when the API runs out of results, when the fetch budget is
+    spent, or when the consumer stops iterating, so memory stays bounded by a
+    single page.
+    """
+
+    page_size: int = 50
+
+    def __init__(self, *args: Any, page_size: int | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        if page_size:
+            self.page_size = page_size
+
+    @abstractmethod
+    def _first_request(self, target_date: date, query: str) -> tuple[str, dict[str, Any]]:
+        """Return the URL and params of the first page."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _parse_page(self, body: BodyStream, target_date: date, params: dict[str, Any]) -> Generator[Paper, None, PageInfo]:
+        """Parse one response body, yielding papers as they are parsed and returning the page info.
+
+        ``params`` are the params the page was requested with.
+        """
+        raise NotImplementedError
+
+    def _batch_request(self, target_date: date, queries: Sequence[str]) -> tuple[str, dict[str, Any]]:
+        """Return the URL and params of the first page of a search matching any of ``queries``.
+
+        Only called when ``batch_size`` is greater than one.
+        """
+        raise NotImplementedError
+
+    def fetch(self, target_date: date, query: str) -> Iterator[Paper]:
+        query = normalize_query(query)
+        url, params = self._first_request(target_date, query)
+        return self._paginate(target_date, query, url, params)
+
+    def fetch_batch(self, target_date: date, queries: Sequence[str]) -> Iterator[Paper]:
+        queries = sorted({normalize_query(query) for query in queries})
+        if len(queries) == 1:
+            return self.fetch(target_date, queries[0])
+        url, params = self._batch_request(target_date, queries)
+        return self._paginate(target_date, " OR ".join(queries), url, params)
+
+    async def afetch(self, target_date: date, query: str) -> AsyncIterator[Paper]:
+        """Native async paging: pages are downloaded on the event loop and parsed as they arrive.
+
+        Each page body is read in full before parsing, so memory is bounded by
+        one page as in the synchronous path.
+        """
+        query = normalize_query(query)
+        url, params = self._first_request(target_date, query)
+        items = 0
+        size = 0
+        while True:
+            content = await self._aopen(url, params, target_date, query)
+            body = BodyStream(io.BytesIO(content).read)
+            parser = self._parse_page(body, target_date, params)
+            while True:
+                try:
+                    paper = next(parser)
+                except StopIteration as stop:
+                    page = stop.value
+                    break
+                yield paper
+            items += page.items
+            size += body.bytes_read
+            params = self._next_params(page, items, size)
+            if params is None:
+                return
+
+    def _paginate(self, target_date: date, query: str, url: str, params: dict[str, Any]) -> Iterator[Paper]:
+        items = 0
+        size = 0
+        while True:
+            with self._open(url, params, target_date, query) as body:
+                page = yield from self._parse_page(body, target_date, params)
+                size += body.bytes_read
+            items += page.items
+            params = self._next_params(page, items, size)
+            if params is None:
+                return
+
+    def _next_params(self, page: PageInfo, items: int, size: int) -> dict[str, Any] | None:
+        """Params of the next page to request, or ``None`` when paging should stop."""
+        if page.next_params is None or page.items == 0:
+            return None
+        if items >= self.budget.max_items or size >= self.budget.max_bytes:
+            logger.info(f"{self.name}: fetch budget reached after {items} items / {size} bytes")
+            return None
+        return page.next_params
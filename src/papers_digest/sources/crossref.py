@@ -1,34 +1,40 @@
 from __future__ import annotations
 
+import json
+import re
 from datetime import date
-from typing import Iterable
-
-import requests
+from typing import Any, Generator
 
 from papers_digest.models import Paper
-from papers_digest.sources.base import PaperSource
+from papers_digest.sources.base import BodyStream, PagedSource, PageInfo
 
 
-class CrossrefSource(PaperSource):
+class CrossrefSource(PagedSource):
     name = "crossref"
+    base_url = "https://api.crossref.org"
 
-    def fetch(self, target_date: date, query: str) -> Iterable[Paper]:
+    def _first_request(self, target_date: date, query: str) -> tuple[str, dict[str, Any]]:
         target = target_date.strftime("%Y-%m-%d")
-        url = "https://api.crossref.org/works"
+        # Offset paging rather than cursor=*: Crossref cursors expire after a few
+        # minutes, which would break continuing from a cached first page.
         params = {
             "filter": f"from-pub-date:{target},until-pub-date:{target}",
-            "query": query.strip() or "artificial intelligence",
-            "rows": 50,
+            "query": query,
+            "rows": self.page_size,
+            "offset": 0,
             "select": "DOI,title,author,URL,abstract,published-online,published-print",
         }
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        items = response.json().get("message", {}).get("items", [])
+        return f"{self.base_url}/works", params
+
+    def _parse_page(
+        self, body: BodyStream, target_date: date, params: dict[str, Any]
+    ) -> Generator[Paper, None, PageInfo]:
+        message = json.load(body).get("message", {})
+        items = message.get("items", [])
 
         for item in items:
             title = (item.get("title") or [""])[0]
             # Clean HTML tags from abstract
-            import re
             abstract = (item.get("abstract") or "")
             abstract = re.sub(r"<[^>]+>", "", abstract)  # Remove all HTML tags
             authors = [
@@ -46,5 +52,9 @@ class CrossrefSource(PaperSource):
                 url=item.get("URL", ""),
                 published_date=target_date,
                 source=self.name,
+                doi=item.get("DOI", ""),
             )
 
+        next_offset = params["offset"] + len(items)
+        has_more = len(items) == params["rows"] and next_offset < message.get("total-results", 0)
+        return PageInfo(len(items), {**params, "offset": next_offset} if has_more else None)
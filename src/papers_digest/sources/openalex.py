@@ -1,28 +1,40 @@
 from __future__ import annotations
 
+import json
 from datetime import date
-from typing import Iterable
-
-import requests
+from typing import Any, Generator, Sequence
 
 from papers_digest.models import Paper
-from papers_digest.sources.base import PaperSource
+from papers_digest.sources.base import BodyStream, PagedSource, PageInfo
 
 
-class OpenAlexSource(PaperSource):
+class OpenAlexSource(PagedSource):
     name = "openalex"
+    base_url = "https://api.openalex.org"
+    batch_size = 5
+
+    def _first_request(self, target_date: date, query: str) -> tuple[str, dict[str, Any]]:
+        return self._search_request(target_date, query)
 
-    def fetch(self, target_date: date, query: str) -> Iterable[Paper]:
+    def _batch_request(self, target_date: date, queries: Sequence[str]) -> tuple[str, dict[str, Any]]:
+        # OpenAlex search understands boolean OR between parenthesised groups.
+        return self._search_request(target_date, " OR ".join(f"({query})" for query in queries))
+
+    def _search_request(self, target_date: date, search: str) -> tuple[str, dict[str, Any]]:
         target = target_date.strftime("%Y-%m-%d")
-        url = "https://api.openalex.org/works"
         params = {
             "filter": f"from_publication_date:{target},to_publication_date:{target}",
-            "search": query.strip() or "artificial intelligence",
-            "per-page": 50,
+            "search": search,
+            "per-page": self.page_size,
+            "cursor": "*",
         }
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        items = response.json().get("results", [])
+        return f"{self.base_url}/works", params
+
+    def _parse_page(
+        self, body: BodyStream, target_date: date, params: dict[str, Any]
+    ) -> Generator[Paper, None, PageInfo]:
+        payload = json.load(body)
+        items = payload.get("results", [])
 
         for item in items:
             title = item.get("title", "")
@@ -42,8 +54,22 @@ class OpenAlexSource(PaperSource):
                 url=item.get("id", ""),
                 published_date=target_date,
                 source=self.name,
+                doi=item.get("doi") or "",
+                arxiv_id=_arxiv_id_from_openalex(item),
             )
 
+        next_cursor = (payload.get("meta") or {}).get("next_cursor")
+        return PageInfo(len(items), {**params, "cursor": next_cursor} if next_cursor else None)
+
+
+def _arxiv_id_from_openalex(item: dict) -> str:
+    # arXiv preprints are listed as a location hosted on arxiv.org.
+    for location in item.get("locations") or []:
+        landing_page = (location or {}).get("landing_page_url") or ""
+        if "arxiv.org/abs/" in landing_page:
+            return landing_page.rsplit("/abs/", 1)[-1]
+    return ""
+
 
 def _abstract_from_openalex(item: dict) -> str:
     abstract = item.get("abstract", "")
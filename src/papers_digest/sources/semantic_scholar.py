@@ -1,30 +1,38 @@
 from __future__ import annotations
 
+import json
 from datetime import date
-from typing import Iterable
-
-import requests
+from typing import Any, Generator
 
 from papers_digest.models import Paper
-from papers_digest.sources.base import PaperSource
+from papers_digest.sources.base import BodyStream, PagedSource, PageInfo
 
 
-class SemanticScholarSource(PaperSource):
+class SemanticScholarSource(PagedSource):
     name = "semantic_scholar"
+    base_url = "https://api.semanticscholar.org"
 
-    def fetch(self, target_date: date, query: str) -> Iterable[Paper]:
+    def _first_request(self, target_date: date, query: str) -> tuple[str, dict[str, Any]]:
         target = target_date.strftime("%Y-%m-%d")
-        url = "https://api.semanticscholar.org/graph/v1/paper/search"
         params = {
-            "query": query.strip() or "artificial intelligence",
-            "limit": 50,
-            "fields": "title,abstract,authors,url,publicationDate",
+            "query": query,
+            # Server-side date filter; _parse_page still drops anything outside the target date.
+            "publicationDateOrYear": f"{target}:{target}",
+            "offset": 0,
+            "limit": self.page_size,
+            "fields": "title,abstract,authors,url,publicationDate,externalIds",
         }
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json().get("data", [])
+        return f"{self.base_url}/graph/v1/paper/search", params
+
+    def _parse_page(
+        self, body: BodyStream, target_date: date, params: dict[str, Any]
+    ) -> Generator[Paper, None, PageInfo]:
+        payload = json.load(body)
+        data = payload.get("data", [])
+        target = target_date.strftime("%Y-%m-%d")
 
         for item in data:
+            external_ids = item.get("externalIds") or {}
             pub_date = item.get("publicationDate")
             if pub_date != target:
                 continue
@@ -36,5 +44,10 @@ class SemanticScholarSource(PaperSource):
                 url=item.get("url", ""),
                 published_date=target_date,
                 source=self.name,
+                doi=external_ids.get("DOI") or "",
+                arxiv_id=external_ids.get("ArXiv") or "",
             )
 
+        # The API reports the offset of the next page only while more results exist.
+        next_offset = payload.get("next")
+        return PageInfo(len(data), {**params, "offset": next_offset} if next_offset is not None else None)
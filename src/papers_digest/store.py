@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from datetime import date
+from pathlib import Path
+from typing import Iterable
+
+from papers_digest.db import connect
+from papers_digest.dedup import canonical_key
+from papers_digest.models import Paper
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    key TEXT PRIMARY KEY,
+    paper_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    url TEXT NOT NULL,
+    published_date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    doi TEXT NOT NULL DEFAULT '',
+    arxiv_id TEXT NOT NULL DEFAULT '',
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_published_date ON papers (published_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, content='papers', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract) VALUES ('delete', old.rowid, old.title, old.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract) VALUES ('delete', old.rowid, old.title, old.abstract);
+    INSERT INTO papers_fts (rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+END;
+"""
+
+# Re-ingesting a paper keeps one row; the richer abstract and any newly known ids win.
+_UPSERT = """
+INSERT INTO papers (key, paper_id, title, abstract, authors, url, published_date, source, doi, arxiv_id, ingested_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    abstract = CASE WHEN length(excluded.abstract) > length(papers.abstract) THEN excluded.abstract ELSE papers.abstract END,
+    doi = CASE WHEN papers.doi = '' THEN excluded.doi ELSE papers.doi END,
+    arxiv_id = CASE WHEN papers.arxiv_id = '' THEN excluded.arxiv_id ELSE papers.arxiv_id END
+WHERE length(excluded.abstract) > length(papers.abstract)
+   OR (papers.doi = '' AND excluded.doi != '')
+   OR (papers.arxiv_id = '' AND excluded.arxiv_id != '')
+"""
+
+_COLUMNS = ", ".join(
+    f"papers.{column}"
+    for column in ("paper_id", "title", "abstract", "authors", "url", "published_date", "source", "doi", "arxiv_id")
+)
+
+
+def _row_to_paper(row: tuple) -> Paper:
+    paper_id, title, abstract, authors, url, published, source, doi, arxiv_id = row
+    return Paper(
+        paper_id=paper_id,
+        title=title,
+        abstract=abstract,
+        authors=json.loads(authors),
+        url=url,
+        published_date=date.fromisoformat(published),
+        source=source,
+        doi=doi,
+        arxiv_id=arxiv_id,
+    )
+
+
+def _match_expression(query: str) -> str:
+    """FTS5 query matching any term of ``query``; terms are quoted so user text is never parsed as syntax."""
+    terms = dict.fromkeys(re.findall(r"[a-z0-9]+", query.lower()))
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class PaperStore:
+    """Local store of ingested papers, searchable with SQLite FTS5.
+
+    Papers are keyed by their canonical identifier (see ``dedup.canonical_key``),
+    so ingesting the same paper again updates the existing row instead of
+    adding another one.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def upsert(self, papers: Iterable[Paper]) -> int:
+        """Insert or update papers; returns how many rows were added or changed."""
+        now = time.time()
+        rows = [
+            (
+                canonical_key(paper),
+                paper.paper_id,
+                paper.title,
+                paper.abstract or "",
+                json.dumps(list(paper.authors), ensure_ascii=False),
+                paper.url,
+                paper.published_date.isoformat(),
+                paper.source,
+                paper.doi,
+                paper.arxiv_id,
+                now,
+            )
+            for paper in papers
+        ]
+        with connect(self.path) as conn:
+            return conn.executemany(_UPSERT, rows).rowcount
+
+    def get(self, keys: Iterable[str]) -> list[Paper]:
+        """Papers stored under ``keys``, in the order of ``keys``; unknown keys are skipped."""
+        keys = list(keys)
+        found: dict[str, Paper] = {}
+        with connect(self.path) as conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                sql = f"SELECT papers.key, {_COLUMNS} FROM papers WHERE key IN ({','.join('?' * len(chunk))})"
+                found.update((row[0], _row_to_paper(row[1:])) for row in conn.execute(sql, chunk))
+        return [found[key] for key in keys if key in found]
+
+    def count(self, target_date: date) -> int:
+        with connect(self.path) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM papers WHERE published_date = ?", (target_date.isoformat(),)
+            ).fetchone()[0]
+
+    def search(self, query: str, target_date: date, limit: int | None = None) -> list[Paper]:
+        """Papers of ``target_date`` matching any term of ``query``, best FTS match first."""
+        match = _match_expression(query)
+        sql = (
+            f"SELECT {_COLUMNS} FROM papers_fts JOIN papers ON papers.rowid = papers_fts.rowid "
+            "WHERE papers_fts MATCH ? AND papers.published_date = ? ORDER BY bm25(papers_fts)"
+        )
+        params: list = [match, target_date.isoformat()]
+        if not match:
+            sql = f"SELECT {_COLUMNS} FROM papers WHERE published_date = ? ORDER BY rowid"
+            params = [target_date.isoformat()]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with connect(self.path) as conn:
+            return [_row_to_paper(row) for row in conn.execute(sql, params)]
+
+
+# Global paper store instance
+_paper_store: PaperStore | None = None
+
+
+def get_paper_store() -> PaperStore:
+    """Get or create the global paper store."""
+    global _paper_store
+    if _paper_store is None:
+        _paper_store = PaperStore(os.getenv("PAPERS_DIGEST_STORE_FILE", "data/papers.sqlite3"))
+    return _paper_store
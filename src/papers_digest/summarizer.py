@@ -1,87 +1,367 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import os
 import re
-from typing import Protocol
+from abc import ABC, abstractmethod
+from typing import Any, Protocol, Sequence
 
+import numpy as np
 import requests
 
+from papers_digest.http_client import get_async_http_client
 from papers_digest.models import Paper
 
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT = "Ты помощник, который делает краткие содержания научных статей на русском языке."
+
+
+def _prompt(paper: Paper) -> str:
+    return (
+        "Сделай краткое содержание следующей статьи на русском языке в 2-3 предложениях. "
+        "Сосредоточься на новизне, методах и результатах.\n\n"
+        f"Название: {paper.title}\n"
+        f"Аннотация: {paper.abstract}\n"
+    )
+
+
+_BATCH_INSTRUCTIONS = (
+    "Сделай краткое содержание каждой из следующих статей на русском языке в 2-3 предложениях. "
+    "Сосредоточься на новизне, методах и результатах. Ответь только JSON-объектом вида "
+    '{"summaries": [{"id": <номер статьи>, "summary": "<краткое содержание>"}]}.'
+)
+# Output tokens allowed per paper, in single and batched requests.
+_SUMMARY_TOKENS = 180
+
+
+def _batch_prompt(papers: Sequence[Paper]) -> str:
+    entries = "\n\n".join(
+        f"[{idx}] Название: {paper.title}\nАннотация: {paper.abstract}" for idx, paper in enumerate(papers, start=1)
+    )
+    return f"{_BATCH_INSTRUCTIONS}\n\n{entries}\n"
+
+
+def prompt_hash(paper: Paper) -> str:
+    """Fingerprint of the prompts used for ``paper``; changes when their wording or the abstract does."""
+    text = f"{_SYSTEM_PROMPT}\n{_BATCH_INSTRUCTIONS}\n{_prompt(paper)}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count without a tokenizer: about three characters per token for mixed Russian/English text."""
+    return len(text) // 3 + 1
+
+
+def token_batches(papers: Sequence[Paper], max_tokens: int, max_papers: int) -> list[list[Paper]]:
+    """Split ``papers`` in order into batches of at most ``max_papers`` whose prompts fit ``max_tokens``.
+
+    A paper that alone exceeds the budget gets a batch of its own.
+    """
+    batches: list[list[Paper]] = []
+    batch: list[Paper] = []
+    used = estimate_tokens(_BATCH_INSTRUCTIONS)
+    for paper in papers:
+        cost = estimate_tokens(f"{paper.title}\n{paper.abstract}")
+        if batch and (len(batch) >= max_papers or used + cost > max_tokens):
+            batches.append(batch)
+            batch, used = [], estimate_tokens(_BATCH_INSTRUCTIONS)
+        batch.append(paper)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _parse_batch(text: str, size: int) -> dict[int, str]:
+    """Summaries by position from a batched JSON answer; entries with bad ids or empty text are dropped."""
+    data = json.loads(text)
+    summaries: dict[int, str] = {}
+    for item in data["summaries"]:
+        idx = int(item["id"]) - 1
+        summary = str(item.get("summary", "")).strip()
+        if 0 <= idx < size and summary:
+            summaries[idx] = summary
+    return summaries
+
+
+def _openai_text(data: dict[str, Any]) -> str:
+    text = data["choices"][0]["message"]["content"].strip()
+    if not text:
+        raise ValueError("OpenAI returned an empty summary")
+    return text
+
+
+def _ollama_text(data: dict[str, Any]) -> str:
+    text = data.get("response", "").strip()
+    if not text:
+        raise ValueError("Ollama returned an empty summary")
+    return text
+
 
 class Summarizer(Protocol):
+    """Summarizes one paper; may raise, the pipeline then falls back to ``SimpleSummarizer`` for that paper.
+
+    ``max_concurrency`` caps how many papers are summarized at once with this
+    provider; ``model`` is part of the summary cache key.
+    """
+
+    max_concurrency: int
+    model: str
+
     def summarize(self, paper: Paper) -> str:
         raise NotImplementedError
 
 
 class SimpleSummarizer:
+    max_concurrency = 1
+    model = ""
+
     def summarize(self, paper: Paper) -> str:
         abstract = paper.abstract or ""
         sentences = re.split(r"(?<=[.!?])\s+", abstract.strip())
         summary = " ".join(sentences[:2]).strip()
         return summary or "Краткое содержание недоступно."
 
+    async def asummarize(self, paper: Paper) -> str:
+        return self.summarize(paper)
 
-class OpenAISummarizer:
-    def __init__(self, api_key: str, model: str | None = None) -> None:
-        self._api_key = api_key
-        self._model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+# A sentence ends at ., ! or ? followed by space and a capital, digit or opening
+# bracket, except after common abbreviations, so "e.g. Lean" and "Fig. 3" stay
+# inside one sentence.
+_SENTENCE_END = re.compile(r"(?<=[.!?])(?<!\be\.g\.)(?<!\bi\.e\.)(?<!\bal\.)(?<!\bvs\.)(?<!\bFig\.)\s+(?=[A-ZА-ЯЁ0-9(\[\"'])")
+# Content words; shorter ones are mostly articles and prepositions.
+_WORD = re.compile(r"[a-zа-яё0-9]{3,}")
+
+
+def _centrality(owners: np.ndarray, sentences: np.ndarray, terms: np.ndarray, vocabulary: int) -> np.ndarray:
+    """Dot product of each sentence's normalized TF-IDF vector with the centroid of its abstract."""
+    count = len(owners)
+    # Sublinear TF-IDF sentence vectors as sparse (sentence, term, weight) triples.
+    pairs, tf = np.unique(sentences * vocabulary + terms, return_counts=True)
+    pair_sentences, pair_terms = pairs // vocabulary, pairs % vocabulary
+    df = np.bincount(pair_terms, minlength=vocabulary)
+    weights = (1.0 + np.log(tf)) * (np.log((count + 1) / (df[pair_terms] + 1)) + 1.0)
+    weights /= np.sqrt(np.bincount(pair_sentences, weights ** 2, minlength=count))[pair_sentences]
+    # Centroid of each abstract, then each sentence's dot product with its centroid.
+    centroid_keys, centroid_of = np.unique(owners[pair_sentences] * vocabulary + pair_terms, return_inverse=True)
+    centroids = np.bincount(centroid_of, weights, minlength=len(centroid_keys))
+    return np.bincount(pair_sentences, weights * centroids[centroid_of], minlength=count)
+
+
+class ExtractiveSummarizer:
+    """The most central sentences of each abstract, CPU only.
+
+    Sentences of all papers of a call are embedded as TF-IDF vectors (IDF
+    over every sentence of the call, so a whole day's pool gives better
+    weights than one abstract). Each sentence is scored by its similarity to
+    the centroid of its abstract, and the best ``sentences`` of each abstract
+    are kept in their original order. All scoring is done in a few NumPy
+    passes over the whole batch.
+    """
+
+    max_concurrency = 1
+    model = "extractive"
+    # The whole candidate pool goes into one ``summarize_many`` call.
+    batch_tokens = 1 << 30
+    batch_size = 4096
+
+    def __init__(self, sentences: int = 2) -> None:
+        self.sentences = sentences
 
     def summarize(self, paper: Paper) -> str:
-        prompt = (
-            "Сделай краткое содержание следующей статьи на русском языке в 2-3 предложениях. "
-            "Сосредоточься на новизне, методах и результатах.\n\n"
-            f"Название: {paper.title}\n"
-            f"Аннотация: {paper.abstract}\n"
-        )
+        return self.summarize_many([paper])[paper.paper_id]
+
+    def summarize_many(self, papers: Sequence[Paper]) -> dict[str, str]:
+        """Summaries by paper id; papers without an abstract get the usual placeholder."""
+        texts: list[str] = []
+        owners: list[int] = []
+        words: list[str] = []
+        word_sentences: list[int] = []
+        for idx, paper in enumerate(papers):
+            for sentence in _SENTENCE_END.split((paper.abstract or "").strip()):
+                if sentence:
+                    found = _WORD.findall(sentence.lower())
+                    words += found
+                    word_sentences += [len(texts)] * len(found)
+                    texts.append(sentence)
+                    owners.append(idx)
+        vocabulary = {word: term for term, word in enumerate(dict.fromkeys(words))}
+        terms = np.fromiter(map(vocabulary.__getitem__, words), dtype=np.int64, count=len(words))
+
+        chosen = self._select(np.array(owners, dtype=np.int64), np.array(word_sentences, dtype=np.int64), terms, len(vocabulary))
+        picked: dict[int, list[str]] = {}
+        for sentence in chosen:
+            picked.setdefault(owners[sentence], []).append(texts[sentence])
+        return {
+            paper.paper_id: " ".join(picked.get(idx, [])).strip() or "Краткое содержание недоступно."
+            for idx, paper in enumerate(papers)
+        }
+
+    def _select(self, owners: np.ndarray, sentences: np.ndarray, terms: np.ndarray, vocabulary: int) -> np.ndarray:
+        """Indices of the kept sentences in text order, given each sentence's paper and the (sentence, term) pairs."""
+        count = len(owners)
+        if count == 0:
+            return owners
+        scores = _centrality(owners, sentences, terms, vocabulary) if vocabulary else np.zeros(count)
+        # Best sentences of each paper first (earlier ones on ties), then keep the first ``self.sentences``.
+        order = np.lexsort((np.arange(count), -scores, owners))
+        starts = np.searchsorted(owners[order], owners[order], side="left")
+        kept = order[np.arange(count) - starts < self.sentences]
+        return np.sort(kept)
+
+    async def asummarize(self, paper: Paper) -> str:
+        return self.summarize(paper)
+
+
+class _BatchingSummarizer(ABC):
+    """``summarize_many`` for LLM summarizers: several papers per request with a JSON answer.
+
+    Subclasses build the request with ``_batch_request`` and extract the model's
+    text with ``_text``. When an answer is malformed or misses papers, the
+    missing papers are split in half and retried, down to single-paper
+    requests; papers that still fail are left out for the caller to handle.
+    """
+
+    batch_tokens: int
+    batch_size: int
+
+    def _configure_batching(self) -> None:
+        self.batch_tokens = int(os.getenv("PAPERS_DIGEST_SUMMARY_BATCH_TOKENS", "3000"))
+        self.batch_size = int(os.getenv("PAPERS_DIGEST_SUMMARY_BATCH_SIZE", "4"))
+
+    @abstractmethod
+    def _batch_request(self, papers: Sequence[Paper]) -> dict[str, Any]:
+        """Return the JSON payload of one request summarizing ``papers``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _text(self, data: dict[str, Any]) -> str:
+        """Return the model's text from a decoded response."""
+        raise NotImplementedError
+
+    def summarize_many(self, papers: Sequence[Paper]) -> dict[str, str]:
+        """Summaries by paper id, in batches sized to ``batch_tokens`` and ``batch_size``."""
+        summaries: dict[str, str] = {}
+        for batch in token_batches(papers, self.batch_tokens, self.batch_size):
+            self._summarize_batch(batch, summaries)
+        return summaries
+
+    def _summarize_batch(self, batch: Sequence[Paper], summaries: dict[str, str]) -> None:
+        if len(batch) == 1:
+            try:
+                summaries[batch[0].paper_id] = self.summarize(batch[0])
+            except Exception as e:
+                logger.warning(f"Summary of {batch[0].paper_id!r} failed: {e}")
+            return
         try:
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={"Authorization": f"Bearer {self._api_key}"},
-                json={
-                    "model": self._model,
-                    "messages": [
-                        {"role": "system", "content": "Ты помощник, который делает краткие содержания научных статей на русском языке."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 180,
-                },
-                timeout=30,
-            )
+            response = requests.post(**self._batch_request(batch))
             response.raise_for_status()
             data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
-        except Exception:
-            return SimpleSummarizer().summarize(paper)
+        except Exception as e:
+            # Transport and server errors would hit the smaller batches too.
+            logger.warning(f"Batched summary of {len(batch)} papers failed: {e}")
+            return
+        try:
+            parsed = _parse_batch(self._text(data), len(batch))
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            logger.info(f"Malformed batched summary of {len(batch)} papers ({e}), splitting")
+            parsed = {}
+        for idx, summary in parsed.items():
+            summaries[batch[idx].paper_id] = summary
+        missing = [paper for idx, paper in enumerate(batch) if idx not in parsed]
+        if missing:
+            middle = (len(missing) + 1) // 2
+            self._summarize_batch(missing[:middle], summaries)
+            if missing[middle:]:
+                self._summarize_batch(missing[middle:], summaries)
+
+
+class OpenAISummarizer(_BatchingSummarizer):
+    def __init__(self, api_key: str, model: str | None = None) -> None:
+        self._api_key = api_key
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.max_concurrency = int(os.getenv("PAPERS_DIGEST_OPENAI_CONCURRENCY", "4"))
+        self._configure_batching()
+
+    def _chat(self, prompt: str, max_tokens: int, **options: Any) -> dict[str, Any]:
+        return {
+            "url": "https://api.openai.com/v1/chat/completions",
+            "headers": {"Authorization": f"Bearer {self._api_key}"},
+            "json": {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.2,
+                "max_tokens": max_tokens,
+                **options,
+            },
+            "timeout": 30,
+        }
+
+    def _request(self, paper: Paper) -> dict[str, Any]:
+        return self._chat(_prompt(paper), _SUMMARY_TOKENS)
+
+    def _batch_request(self, papers: Sequence[Paper]) -> dict[str, Any]:
+        return self._chat(
+            _batch_prompt(papers), _SUMMARY_TOKENS * len(papers), response_format={"type": "json_object"}
+        )
+
+    def _text(self, data: dict[str, Any]) -> str:
+        return _openai_text(data)
+
+    def summarize(self, paper: Paper) -> str:
+        response = requests.post(**self._request(paper))
+        response.raise_for_status()
+        return _openai_text(response.json())
 
+    async def asummarize(self, paper: Paper) -> str:
+        response = await get_async_http_client().post(**self._request(paper))
+        response.raise_for_status()
+        return _openai_text(response.json())
 
-class OllamaSummarizer:
+
+class OllamaSummarizer(_BatchingSummarizer):
     def __init__(self, model: str | None = None) -> None:
-        self._model = model or os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+        self.model = model or os.getenv("OLLAMA_MODEL", "llama3.1:8b")
         self._base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        # A local server usually runs one or two generations at a time.
+        self.max_concurrency = int(os.getenv("PAPERS_DIGEST_OLLAMA_CONCURRENCY", "2"))
+        self._configure_batching()
+
+    def _generate(self, prompt: str, **options: Any) -> dict[str, Any]:
+        return {
+            "url": f"{self._base_url}/api/generate",
+            "json": {
+                "model": self.model,
+                "prompt": prompt,
+                "stream": False,
+                "system": _SYSTEM_PROMPT,
+                **options,
+            },
+            "timeout": 60,
+        }
+
+    def _request(self, paper: Paper) -> dict[str, Any]:
+        return self._generate(_prompt(paper))
+
+    def _batch_request(self, papers: Sequence[Paper]) -> dict[str, Any]:
+        return self._generate(_batch_prompt(papers), format="json")
+
+    def _text(self, data: dict[str, Any]) -> str:
+        return _ollama_text(data)
 
     def summarize(self, paper: Paper) -> str:
-        prompt = (
-            "Сделай краткое содержание следующей статьи на русском языке в 2-3 предложениях. "
-            "Сосредоточься на новизне, методах и результатах.\n\n"
-            f"Название: {paper.title}\n"
-            f"Аннотация: {paper.abstract}\n"
-        )
-        try:
-            response = requests.post(
-                f"{self._base_url}/api/generate",
-                json={
-                    "model": self._model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "system": "Ты помощник, который делает краткие содержания научных статей на русском языке.",
-                },
-                timeout=60,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("response", "").strip() or SimpleSummarizer().summarize(paper)
-        except Exception:
-            return SimpleSummarizer().summarize(paper)
+        response = requests.post(**self._request(paper))
+        response.raise_for_status()
+        return _ollama_text(response.json())
 
+    async def asummarize(self, paper: Paper) -> str:
+        response = await get_async_http_client().post(**self._request(paper))
+        response.raise_for_status()
+        return _ollama_text(response.json())
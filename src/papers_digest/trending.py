@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from papers_digest.db import connect
+from papers_digest.models import Paper
+
+logger = logging.getLogger(__name__)
+
+# Words too common in paper titles and abstracts to ever be a topic.
+_STOPWORDS = frozenset(
+    """
+    a about after all also an and are as at be been between both but by can do does for from has have how in
+    into is it its more new not of on or our over such than that the their these this those through to two
+    under using via was we what when where which while with within without
+    approach approaches based data method methods model models paper propose proposed results show study task
+    tasks work
+    """.split()
+)
+
+
+def topic_terms(paper: Paper) -> set[str]:
+    """Candidate topic terms of a paper: content words and adjacent word pairs of its title and abstract."""
+    words = [
+        word
+        for word in re.findall(r"[a-z0-9]+", f"{paper.title} {paper.abstract or ''}".lower())
+        if len(word) > 2 and not word.isdigit() and word not in _STOPWORDS
+    ]
+    return set(words) | {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+class CountMinSketch:
+    """Approximate counts of arbitrary many keys in ``depth x width`` counters.
+
+    Estimates never undercount; they overcount by at most ``e * total / width``
+    with probability ``1 - exp(-depth)``.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, table: np.ndarray | None = None) -> None:
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.float32)
+
+    def _columns(self, key: str) -> np.ndarray:
+        # One CRC32 per row, seeded with the row number, is enough spread for text keys.
+        data = key.encode("utf-8")
+        return np.array([zlib.crc32(data, row) % self.width for row in range(self.depth)])
+
+    def add(self, key: str, count: float = 1.0) -> None:
+        self.table[np.arange(self.depth), self._columns(key)] += count
+
+    def estimate(self, key: str) -> float:
+        return float(self.table[np.arange(self.depth), self._columns(key)].min())
+
+
+class HeavyHitters:
+    """Space-Saving summary of the ``capacity`` most frequent keys of a stream.
+
+    When a new key arrives and the summary is full, it replaces the key with
+    the smallest count and inherits that count, so every key seen more than
+    ``total / capacity`` times is guaranteed to be kept.
+    """
+
+    def __init__(self, capacity: int = 64, counts: dict[str, float] | None = None) -> None:
+        self.capacity = capacity
+        self.counts = counts if counts is not None else {}
+
+    def add(self, key: str, count: float = 1.0) -> None:
+        if key in self.counts or len(self.counts) < self.capacity:
+            self.counts[key] = self.counts.get(key, 0.0) + count
+            return
+        smallest = min(self.counts, key=self.counts.__getitem__)
+        self.counts[key] = self.counts.pop(smallest) + count
+
+
+class TrendTracker:
+    """Rising topics per channel area from streaming term counts.
+
+    Each area keeps the current day's term counts (a Count-Min sketch plus a
+    Space-Saving heavy-hitters summary of its candidates) and a baseline
+    sketch: an exponentially decayed average of the previous days' counts.
+    When a newer day is observed the current day is folded into the baseline,
+    so the state of an area has the same size after one day or after years of
+    history. A term is rising when its count today is well above its baseline.
+    State is kept in SQLite so the CLI and the bot share it.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        width: int = 2048,
+        depth: int = 4,
+        capacity: int = 64,
+        decay: float = 0.8,
+        min_count: int = 2,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.decay = decay
+        self.min_count = min_count
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS areas (
+                    area TEXT PRIMARY KEY,
+                    day TEXT NOT NULL,
+                    days INTEGER NOT NULL,
+                    today BLOB NOT NULL,
+                    baseline BLOB NOT NULL,
+                    hitters TEXT NOT NULL
+                )
+                """
+            )
+
+    def _sketch(self, blob: bytes | None = None) -> CountMinSketch:
+        if blob is None:
+            return CountMinSketch(self.width, self.depth)
+        table = np.frombuffer(blob, dtype=np.float32).reshape(self.depth, self.width).copy()
+        return CountMinSketch(self.width, self.depth, table)
+
+    def observe(self, area: str, day: date, papers: Iterable[Paper]) -> None:
+        """Set ``area``'s term counts for ``day`` from that day's candidate papers.
+
+        Observing the same day again replaces its counts, so repeated digests do
+        not inflate them. Days older than the last observed one are ignored.
+        """
+        today, hitters = self._sketch(), HeavyHitters(self.capacity)
+        for paper in papers:
+            for term in sorted(topic_terms(paper)):
+                today.add(term)
+                hitters.add(term)
+
+        with connect(self.path) as conn:
+            row = conn.execute(
+                "SELECT day, days, today, baseline FROM areas WHERE area = ?", (area,)
+            ).fetchone()
+            if row is None:
+                days, baseline = 0, self._sketch()
+            else:
+                last_day, days, last_today, baseline_blob = date.fromisoformat(row[0]), row[1], row[2], row[3]
+                baseline = self._sketch(baseline_blob)
+                if day < last_day:
+                    logger.debug(f"Trends for {area!r} are at {last_day}, ignoring {day}")
+                    return
+                if day > last_day:
+                    # Days without observations count as zeros in the decayed average.
+                    gap = (day - last_day).days
+                    baseline.table *= self.decay ** gap
+                    baseline.table += (1 - self.decay) * self.decay ** (gap - 1) * self._sketch(last_today).table
+                    days += gap
+            conn.execute(
+                "INSERT OR REPLACE INTO areas (area, day, days, today, baseline, hitters) VALUES (?, ?, ?, ?, ?, ?)",
+                (area, day.isoformat(), days, today.table.tobytes(), baseline.table.tobytes(), json.dumps(hitters.counts)),
+            )
+
+    def rising(self, area: str, limit: int = 5, exclude: Iterable[str] = ()) -> list[str]:
+        """Terms of ``area``'s latest day that grew most over their baseline, best first.
+
+        Before any history exists this is simply the day's most frequent terms.
+        Terms made only of words in ``exclude`` (e.g. the area itself) are skipped.
+        """
+        with connect(self.path) as conn:
+            row = conn.execute("SELECT days, today, baseline, hitters FROM areas WHERE area = ?", (area,)).fetchone()
+        if row is None:
+            return []
+        days, today, baseline, hitters = row[0], self._sketch(row[1]), self._sketch(row[2]), json.loads(row[3])
+        excluded = {word.lower() for word in exclude}
+        scores: list[tuple[float, float, str]] = []
+        for term in hitters:
+            if set(term.split()) <= excluded:
+                continue
+            count = today.estimate(term)
+            if count < self.min_count:
+                continue
+            # The baseline only averages the days seen so far, so correct its start-up bias.
+            expected = baseline.estimate(term) / (1 - self.decay ** days) if days else 0.0
+            scores.append(((count + 1) / (expected + 1), count, term))
+        # On ties word pairs go first: "graph neural" says more than "graph".
+        scores.sort(key=lambda item: (-item[0], -item[1], -item[2].count(" "), item[2]))
+        return _without_overlaps([term for _, _, term in scores], limit)
+
+
+def _without_overlaps(terms: Sequence[str], limit: int) -> list[str]:
+    """First ``limit`` terms, skipping words already covered by a better-ranked pair and vice versa."""
+    chosen: list[str] = []
+    for term in terms:
+        words = set(term.split())
+        if any(words <= set(other.split()) or set(other.split()) <= words for other in chosen):
+            continue
+        chosen.append(term)
+        if len(chosen) == limit:
+            break
+    return chosen
+
+
+# Global trend tracker instance
+_trend_tracker: TrendTracker | None = None
+
+
+def get_trend_tracker() -> TrendTracker:
+    """Get or create the global trend tracker."""
+    global _trend_tracker
+    if _trend_tracker is None:
+        _trend_tracker = TrendTracker(os.getenv("PAPERS_DIGEST_TRENDS_FILE", "data/trends.sqlite3"))
+    return _trend_tracker
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import zlib
+from collections import Counter
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from papers_digest.db import connect
+from papers_digest.models import Paper
+from papers_digest.ranking import ScoredPaper, top_k
+
+# Embedding size; a power of two so a hash can be split into bucket bits.
+DIM = 256
+# Document-frequency sketch size (hashed feature slots) used for IDF weights.
+_DF_SLOTS = 1 << 18
+# Words longer than this also contribute their prefix, a cheap stand-in for stemming
+# ("transformers" and "transformer" share "transf").
+_PREFIX = 6
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_hash(feature: str) -> tuple[int, int, float]:
+    """DF slot, embedding bucket and sign of a feature, all from one stable CRC32."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h & (_DF_SLOTS - 1), (h >> 18) & (DIM - 1), 1.0 if h >> 31 else -1.0
+
+
+def _features(text: str) -> Counter[str]:
+    features: Counter[str] = Counter()
+    for word in _words(text):
+        features[word] += 1
+        if len(word) > _PREFIX:
+            features[word[:_PREFIX] + "*"] += 1
+    return features
+
+
+class HashedEmbedder:
+    """Hashed TF-IDF projection of text into ``DIM`` dimensions, CPU only.
+
+    Features (words and word prefixes) are feature-hashed with a random sign
+    into the embedding, weighted by sublinear TF and by IDF from a hashed
+    document-frequency sketch. Vectors are L2-normalized, so a dot product is
+    the cosine similarity.
+    """
+
+    def __init__(self, df: np.ndarray | None = None, documents: int = 0) -> None:
+        self.df = df if df is not None else np.zeros(_DF_SLOTS, dtype=np.uint32)
+        self.documents = documents
+
+    def observe(self, texts: Iterable[str]) -> None:
+        """Count document frequencies of ``texts`` into the IDF sketch."""
+        for text in texts:
+            slots = {_feature_hash(feature)[0] for feature in _features(text)}
+            self.df[list(slots)] += 1
+            self.documents += 1
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(DIM, dtype=np.float32)
+        for feature, tf in _features(text).items():
+            slot, bucket, sign = _feature_hash(feature)
+            idf = math.log((self.documents + 1) / (int(self.df[slot]) + 1)) + 1.0
+            vector[bucket] += sign * (1.0 + math.log(tf)) * idf
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+
+def paper_text(paper: Paper) -> str:
+    # The title is repeated so it weighs more than any single abstract sentence.
+    return f"{paper.title} {paper.title} {paper.abstract or ''}"
+
+
+class VectorCorpus:
+    """Papers embedded once in memory for exact cosine ranking of a candidate pool."""
+
+    def __init__(self, papers: Iterable[Paper]) -> None:
+        self.papers = list(papers)
+        self.embedder = HashedEmbedder()
+        texts = [paper_text(paper) for paper in self.papers]
+        self.embedder.observe(texts)
+        self.vectors = np.stack([self.embedder.embed(text) for text in texts]) if texts else np.zeros((0, DIM))
+
+    def rank(self, query: str, limit: int) -> list[ScoredPaper]:
+        """Top ``limit`` papers by cosine similarity to ``query``; ties keep the input order."""
+        if not self.papers:
+            return []
+        similarities = self.vectors @ self.embedder.embed(query)
+        return top_k((ScoredPaper(paper, float(score)) for paper, score in zip(self.papers, similarities)), limit)
+
+
+class VectorIndex:
+    """Memory-mapped embedding archive with a random-projection LSH index.
+
+    Vectors live in a float32 file mapped with ``np.memmap`` and grown in
+    chunks, so only the rows touched by a lookup are paged in. Each vector is
+    hashed by ``tables`` sets of ``bits`` random hyperplanes; the bucket codes
+    are kept in SQLite next to the row→paper key mapping. A lookup probes the
+    query's bucket and its one-bit neighbours in every table and scores only
+    those candidates exactly, so its cost follows the bucket sizes rather than
+    the size of the archive.
+    """
+
+    def __init__(self, directory: str | Path, tables: int = 8, bits: int = 12, seed: int = 17) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.tables = tables
+        self.bits = bits
+        self._planes = np.random.default_rng(seed).standard_normal((tables * bits, DIM)).astype(np.float32)
+        self._vectors_path = self.directory / "vectors.f32"
+        self._df_path = self.directory / "df.u32"
+        self._db_path = self.directory / "index.sqlite3"
+        if not self._df_path.exists():
+            np.zeros(_DF_SLOTS, dtype=np.uint32).tofile(self._df_path)
+        with connect(self._db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS rows (
+                    row INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, published_date TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS rows_published_date ON rows (published_date);
+                CREATE TABLE IF NOT EXISTS buckets (band INTEGER NOT NULL, code INTEGER NOT NULL, row INTEGER NOT NULL);
+                CREATE INDEX IF NOT EXISTS buckets_band_code ON buckets (band, code);
+                """
+            )
+
+    def _embedder(self, writable: bool = False) -> HashedEmbedder:
+        with connect(self._db_path) as conn:
+            documents = conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+        return HashedEmbedder(np.memmap(self._df_path, dtype=np.uint32, mode="r+" if writable else "r"), documents)
+
+    def _vectors(self, rows: int) -> np.memmap:
+        """The vector file mapped with room for at least ``rows`` rows, grown in 64k-row chunks."""
+        row_bytes = DIM * 4
+        capacity = self._vectors_path.stat().st_size // row_bytes if self._vectors_path.exists() else 0
+        if rows > capacity:
+            capacity = -(-rows // 65536) * 65536
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+        return np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, DIM))
+
+    def _codes(self, vectors: np.ndarray) -> np.ndarray:
+        """LSH bucket code per table for each vector, shape ``(n, tables)``."""
+        bits = (vectors @ self._planes.T > 0).reshape(len(vectors), self.tables, self.bits)
+        return bits @ (1 << np.arange(self.bits))
+
+    def add(self, keys: Sequence[str], papers: Sequence[Paper]) -> int:
+        """Embed and index papers under their store ``keys``; already indexed keys are skipped."""
+        known: set[str] = set()
+        with connect(self._db_path) as conn:
+            for start in range(0, len(keys), 500):
+                chunk = list(keys[start:start + 500])
+                sql = f"SELECT key FROM rows WHERE key IN ({','.join('?' * len(chunk))})"
+                known.update(row[0] for row in conn.execute(sql, chunk))
+            next_row = conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM rows").fetchone()[0]
+        new = [(key, paper) for key, paper in dict(zip(keys, papers)).items() if key not in known]
+        if not new:
+            return 0
+
+        embedder = self._embedder(writable=True)
+        texts = [paper_text(paper) for _, paper in new]
+        embedder.observe(texts)
+        embedder.df.flush()
+        vectors = np.stack([embedder.embed(text) for text in texts])
+        rows = np.arange(next_row, next_row + len(new))
+        stored = self._vectors(next_row + len(new))
+        stored[rows] = vectors
+        stored.flush()
+
+        codes = self._codes(vectors)
+        with connect(self._db_path) as conn:
+            conn.executemany(
+                "INSERT INTO rows (row, key, published_date) VALUES (?, ?, ?)",
+                [(int(row), key, paper.published_date.isoformat()) for row, (key, paper) in zip(rows, new)],
+            )
+            conn.executemany(
+                "INSERT INTO buckets (band, code, row) VALUES (?, ?, ?)",
+                [(band, int(code), int(row)) for row, row_codes in zip(rows, codes) for band, code in enumerate(row_codes)],
+            )
+        return len(new)
+
+    def search(self, query: str, limit: int, published_date: date | None = None) -> list[tuple[str, float]]:
+        """Approximate nearest papers to ``query`` as ``(key, cosine)`` pairs, best first."""
+        vector = self._embedder().embed(query)
+        codes = self._codes(vector[None, :])[0]
+        probes = [
+            (band, int(code) ^ flip)
+            for band, code in enumerate(codes)
+            for flip in [0] + [1 << bit for bit in range(self.bits)]
+        ]
+        sql = (
+            "SELECT DISTINCT buckets.row, rows.key FROM buckets JOIN rows ON rows.row = buckets.row "
+            "WHERE buckets.band = ? AND buckets.code = ?"
+        )
+        if published_date is not None:
+            sql += " AND rows.published_date = ?"
+        candidates: dict[int, str] = {}
+        with connect(self._db_path) as conn:
+            for band, code in probes:
+                params = (band, code, published_date.isoformat()) if published_date is not None else (band, code)
+                candidates.update(conn.execute(sql, params).fetchall())
+        if not candidates:
+            return []
+        rows = np.fromiter(candidates, dtype=np.int64)
+        rows.sort()
+        similarities = self._vectors(0)[rows] @ vector
+        order = np.lexsort((rows, -similarities))[:limit]
+        return [(candidates[int(rows[i])], float(similarities[i])) for i in order]
+
+
+# Global vector index instance
+_vector_index: VectorIndex | None = None
+
+
+def vector_ranking_enabled() -> bool:
+    return os.getenv("PAPERS_DIGEST_RANKING", "bm25").lower() == "vector"
+
+
+def get_vector_index() -> VectorIndex:
+    """Get or create the global vector index, kept next to the paper store by default."""
+    global _vector_index
+    if _vector_index is None:
+        _vector_index = VectorIndex(os.getenv("PAPERS_DIGEST_VECTOR_DIR", "data/vectors"))
+    return _vector_index
@@ -0,0 +1,53 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator
+
+import pytest
+
+from papers_digest import cache, health, metrics, ratelimit, store, trending, vectors
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Point every on-disk state file at a fresh directory and drop the global instances built from them.
+
+    Without this, digests built in tests write into ``data/`` of the checkout
+    and, through the source health file, affect later runs.
+    """
+    state = tmp_path_factory.mktemp("state")
+    monkeypatch.setenv("PAPERS_DIGEST_CACHE_DIR", str(state / "cache"))
+    monkeypatch.setenv("PAPERS_DIGEST_HEALTH_FILE", str(state / "health.json"))
+    monkeypatch.setenv("PAPERS_DIGEST_TRENDS_FILE", str(state / "trends.sqlite3"))
+    monkeypatch.setenv("PAPERS_DIGEST_METRICS_DIR", str(state / "metrics"))
+    monkeypatch.setenv("PAPERS_DIGEST_RATE_LIMIT_FILE", str(state / "ratelimit.sqlite3"))
+    monkeypatch.setenv("PAPERS_DIGEST_STORE_FILE", str(state / "papers.sqlite3"))
+    monkeypatch.setenv("PAPERS_DIGEST_VECTOR_DIR", str(state / "vectors"))
+    monkeypatch.setenv("PAPERS_DIGEST_SETTINGS", str(state / "settings.json"))
+    for module, name in [
+        (cache, "_response_cache"),
+        (cache, "_summary_cache"),
+        (health, "_health_registry"),
+        (metrics, "_metrics_collector"),
+        (ratelimit, "_rate_limiter"),
+        (store, "_paper_store"),
+        (trending, "_trend_tracker"),
+        (vectors, "_vector_index"),
+    ]:
+        monkeypatch.setattr(module, name, None)
+
+
+@pytest.fixture
+def http_server() -> Iterator[Callable[[type[BaseHTTPRequestHandler]], str]]:
+    """Serve a handler class on a free local port and return its base URL; stopped after the test."""
+    servers: list[ThreadingHTTPServer] = []
+
+    def serve(handler: type[BaseHTTPRequestHandler]) -> str:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+from datetime import date
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+
+from papers_digest.cache import ResponseCache, SummaryCache
+from papers_digest.http_client import HttpClient
+from papers_digest.sources.openalex import OpenAlexSource
+
+_ETAG = '"v1"'
+
+
+class _OpenAlexWithEtag(BaseHTTPRequestHandler):
+    """Serves one OpenAlex work with an ETag and answers matching revalidations with 304."""
+
+    statuses: list[int] = []
+
+    def do_GET(self) -> None:
+        if self.headers.get("If-None-Match") == _ETAG:
+            type(self).statuses.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+        type(self).statuses.append(200)
+        body = json.dumps({"results": [{"id": "https://openalex.org/W1", "title": "Cached work"}]}).encode()
+        self.send_response(200)
+        self.send_header("ETag", _ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def openalex_server(http_server) -> str:
+    _OpenAlexWithEtag.statuses = []
+    return http_server(_OpenAlexWithEtag)
+
+
+def test_fresh_entries_skip_the_network_and_stale_ones_revalidate(openalex_server: str, tmp_path: Path) -> None:
+    cache_path = tmp_path / "responses.sqlite3"
+    source = OpenAlexSource(client=HttpClient(), base_url=openalex_server, cache=ResponseCache(cache_path))
+    target_date = date(2026, 1, 22)
+
+    first = list(source.fetch(target_date, "Graph  Networks"))
+    second = list(source.fetch(target_date, "graph networks"))
+    assert _OpenAlexWithEtag.statuses == [200]
+
+    with sqlite3.connect(cache_path) as conn:
+        conn.execute("UPDATE responses SET expires_at = 0")
+    third = list(source.fetch(target_date, "graph networks"))
+
+    assert _OpenAlexWithEtag.statuses == [200, 304]
+    assert [p.paper_id for p in first] == [p.paper_id for p in second] == [p.paper_id for p in third]
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "responses.sqlite3", max_bytes=10)
+    cache.put("a", b"12345", ttl=60)
+    cache.put("b", b"12345", ttl=60)
+    assert cache.get("a") is not None  # touch "a" so "b" becomes least recently used
+    cache.put("c", b"12345", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_summary_cache_is_size_bounded_and_expires(tmp_path: Path) -> None:
+    cache = SummaryCache(tmp_path / "summaries.sqlite3", max_bytes=10)
+    cache.put("a", "12345")
+    cache.put("b", "12345")
+    assert cache.get("a") == "12345"
+    cache.put("c", "12345")
+    assert cache.get("b") is None
+
+    expired = SummaryCache(tmp_path / "summaries.sqlite3", ttl=-1)
+    assert expired.get("a") is None
@@ -0,0 +1,42 @@
+from datetime import date
+
+from papers_digest.dedup import dedup_papers, paper_keys
+from papers_digest.models import Paper
+
+
+def _paper(paper_id: str, title: str, source: str, abstract: str = "", **ids: str) -> Paper:
+    return Paper(paper_id, title, abstract, ["A"], f"http://example.com/{paper_id}", date(2026, 1, 22), source, **ids)
+
+
+def test_identifiers_are_normalized() -> None:
+    arxiv = _paper("http://arxiv.org/abs/2401.01234v2", "T", "arxiv", arxiv_id="2401.01234v2")
+    datacite = _paper("10.48550/arXiv.2401.01234", "T", "crossref", doi="https://doi.org/10.48550/ARXIV.2401.01234")
+
+    assert "arxiv:2401.01234" in paper_keys(arxiv)
+    assert "arxiv:2401.01234" in paper_keys(datacite)
+
+
+def test_dedup_merges_ids_titles_and_near_duplicates() -> None:
+    papers = [
+        _paper("a1", "Sparse Attention for Long Documents", "arxiv", "Short.", arxiv_id="2401.00001v1"),
+        _paper("s1", "Something else entirely", "semantic_scholar", "A much longer abstract.", arxiv_id="2401.00001"),
+        _paper("c1", "Graph Neural Networks at Scale", "crossref", doi="10.1/GNN"),
+        _paper("o1", "Graph neural networks at scale!", "openalex", "Rich abstract here."),
+        _paper("o2", "Efficient training of large language models on commodity GPUs", "openalex"),
+        _paper("c2", "Efficient training of large language models on commodity GPU", "crossref", "Longest one."),
+        _paper("o3", "Unrelated topic on protein folding", "openalex"),
+    ]
+
+    merged = dedup_papers(papers)
+
+    assert [paper.paper_id for paper in merged] == ["s1", "o1", "c2", "o3"]
+    assert merged[0].arxiv_id == "2401.00001"
+    assert merged[1].doi == "10.1/GNN"
+
+
+def test_doi_keyed_ids_keep_their_prefix() -> None:
+    first = _paper("10.1000/abc.1", "First work on graphs", "crossref")
+    second = _paper("10.2000/abc.1", "Second work on proteins", "crossref")
+
+    assert "crossref:10.1000/abc.1" in paper_keys(first)
+    assert len(dedup_papers([first, second])) == 2
@@ -0,0 +1,100 @@
+import time
+from datetime import date
+from pathlib import Path
+
+from papers_digest.health import CLOSED, HALF_OPEN, OPEN, HealthRegistry
+from papers_digest.pipeline import _collect_papers
+from papers_digest.ratelimit import RateLimitExceeded
+from papers_digest.sources.base import PaperSource
+
+
+class BrokenSource(PaperSource):
+    name = "broken"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fetch(self, target_date: date, query: str):
+        self.calls += 1
+        raise ConnectionError("upstream down")
+
+
+def test_breaker_opens_skips_source_and_persists(tmp_path: Path) -> None:
+    path = tmp_path / "health.json"
+    health = HealthRegistry(path, failure_threshold=2, cooldown=3600)
+    source = BrokenSource()
+
+    for _ in range(3):
+        _, per_source, errors = _collect_papers(date(2026, 1, 22), "q", [source], health=health)
+
+    assert source.calls == 2
+    assert per_source == {"broken": 0}
+    assert errors["broken"] == "Circuit open, source skipped"
+    assert HealthRegistry(path).states() == {"broken": OPEN}
+
+
+def test_breaker_half_opens_after_cooldown_and_timeouts_adapt(tmp_path: Path) -> None:
+    health = HealthRegistry(tmp_path / "health.json", failure_threshold=1, cooldown=0)
+    health.record_failure("slow")
+    assert health.allow("slow")
+    assert health.states() == {"slow": HALF_OPEN}
+
+    for latency in [0.5, 0.6, 0.7, 0.8, 1.0]:
+        health.record_success("slow", latency)
+    assert health.states() == {"slow": CLOSED}
+    assert health.timeout_for("slow", 30.0) == 5.0
+    assert health.timeout_for("unknown", 30.0) == 30.0
+    # A source's own deadline stays the upper bound even below ``min_timeout``.
+    assert health.timeout_for("slow", 2.0) == 2.0
+
+
+class StalledSource(PaperSource):
+    name = "stalled"
+    deadline = 0.1
+
+    def fetch(self, target_date: date, query: str):
+        time.sleep(0.3)
+        return []
+
+
+def test_missed_deadlines_and_cached_fetches_are_not_failures(tmp_path: Path) -> None:
+    health = HealthRegistry(tmp_path / "health.json", failure_threshold=1)
+
+    for _ in range(3):
+        _collect_papers(date(2026, 1, 22), "q", [StalledSource()], health=health)
+    # A fetch that sends no request (e.g. served from the cache) has no network latency to record.
+    health.record_success("cached")
+
+    assert health.states() == {"stalled": CLOSED, "cached": CLOSED}
+    assert HealthRegistry(tmp_path / "health.json")._sources["stalled"].latencies == [0.1, 0.1, 0.1]
+    assert HealthRegistry(tmp_path / "health.json")._sources["cached"].latencies == []
+
+
+class QueuedSource(PaperSource):
+    name = "queued"
+    deadline = 2.0
+
+    def fetch(self, target_date: date, query: str):
+        raise RateLimitExceeded("Rate limit queue for api.example.org is 90.0s long")
+
+
+def test_rate_limit_queues_are_not_failures(tmp_path: Path) -> None:
+    health = HealthRegistry(tmp_path / "health.json", failure_threshold=1)
+
+    for _ in range(3):
+        _, _, errors = _collect_papers(date(2026, 1, 22), "q", [QueuedSource()], health=health)
+
+    assert "Rate limit queue" in errors["queued"]
+    assert health.states() == {"queued": CLOSED}
+    assert HealthRegistry(tmp_path / "health.json")._sources["queued"].latencies == [2.0, 2.0, 2.0]
+
+
+def test_registries_sharing_a_file_merge_their_updates(tmp_path: Path) -> None:
+    path = tmp_path / "health.json"
+    bot, cli = HealthRegistry(path, failure_threshold=2), HealthRegistry(path, failure_threshold=2)
+
+    bot.record_success("arxiv", 1.0)
+    cli.record_failure("crossref")
+    bot.record_failure("crossref")
+
+    assert HealthRegistry(path).states() == {"arxiv": CLOSED, "crossref": OPEN}
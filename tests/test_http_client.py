@@ -0,0 +1,70 @@
+import json
+from datetime import date
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+
+from papers_digest.cache import ResponseCache
+from papers_digest.http_client import HttpClient, network_time
+from papers_digest.ratelimit import RateLimiter
+from papers_digest.sources.crossref import CrossrefSource
+
+
+class _FlakyCrossref(BaseHTTPRequestHandler):
+    """Answers the first request with 503 + Retry-After, then with one Crossref item."""
+
+    requests_seen: list[dict] = []
+
+    def do_GET(self) -> None:
+        type(self).requests_seen.append(dict(self.headers))
+        if len(self.requests_seen) == 1:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        body = json.dumps(
+            {"message": {"items": [{"DOI": "10.1/x", "title": ["Local paper"], "URL": "http://example.com/x"}]}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def crossref_server(http_server) -> str:
+    _FlakyCrossref.requests_seen = []
+    return http_server(_FlakyCrossref)
+
+
+def test_source_retries_through_shared_client(crossref_server: str, tmp_path: Path) -> None:
+    source = CrossrefSource(
+        client=HttpClient(max_retries=2, backoff=0.01),
+        base_url=crossref_server,
+        cache=ResponseCache(tmp_path / "responses.sqlite3"),
+    )
+
+    papers = list(source.fetch(date(2026, 1, 22), "local"))
+
+    assert [paper.paper_id for paper in papers] == ["10.1/x"]
+    assert len(_FlakyCrossref.requests_seen) == 2
+    assert "gzip" in _FlakyCrossref.requests_seen[-1]["Accept-Encoding"]
+
+
+def test_network_time_excludes_rate_limit_waits(crossref_server: str, tmp_path: Path) -> None:
+    limiter = RateLimiter(tmp_path / "ratelimit.sqlite3", {"127.0.0.1": (2.0, 1.0)})
+    client = HttpClient(max_retries=2, backoff=0.01, rate_limiter=limiter)
+
+    with network_time() as times:
+        client.get(crossref_server)
+        client.get(crossref_server)
+        client.get(crossref_server)
+
+    # Two requests waited about 0.5s each for a token; only the requests themselves count.
+    assert len(times) == 4
+    assert sum(times) < 0.5
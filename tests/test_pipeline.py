@@ -1,8 +1,26 @@
+import asyncio
+import threading
+import time
 from datetime import date
+from pathlib import Path
 
+import pytest
+
+from papers_digest.cache import get_summary_cache
+from papers_digest.health import HealthRegistry
 from papers_digest.models import Paper
-from papers_digest.pipeline import run_digest
+from papers_digest.pipeline import (
+    _collect_papers,
+    _summary_key,
+    arun_digest,
+    collect_papers_batch,
+    run_digest,
+    run_digest_batch,
+    stream_digest,
+)
 from papers_digest.sources.base import PaperSource
+from papers_digest.store import PaperStore
+from papers_digest.summarizer import SimpleSummarizer
 
 
 class FakeSource(PaperSource):
@@ -74,3 +92,414 @@ def test_run_digest_empty_sources() -> None:
     # Should indicate no papers found (in Russian)
     assert "не найдено" in full_digest or "2026" in full_digest
 
+
+
+class SlowSource(PaperSource):
+    def __init__(self, name: str, papers: list[Paper], delay: float, deadline: float | None = None) -> None:
+        self.name = name
+        self.deadline = deadline
+        self._papers = papers
+        self._delay = delay
+
+    def fetch(self, target_date: date, query: str):
+        for paper in self._papers:
+            time.sleep(self._delay)
+            yield paper
+
+
+def _paper(paper_id: str, source: str) -> Paper:
+    return Paper(
+        paper_id=paper_id,
+        title=f"Paper {paper_id}",
+        abstract="Abstract.",
+        authors=["A"],
+        url=f"http://example.com/{paper_id}",
+        published_date=date(2026, 1, 22),
+        source=source,
+    )
+
+
+class GatedSource(PaperSource):
+    """Yields its first paper, sets ``started`` and holds the rest back until ``release`` is set."""
+
+    def __init__(self, name: str, papers: list[Paper], deadline: float | None = None) -> None:
+        self.name = name
+        self.deadline = deadline
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._papers = papers
+
+    def fetch(self, target_date: date, query: str):
+        yield self._papers[0]
+        self.started.set()
+        self.release.wait(5)
+        yield from self._papers[1:]
+
+
+class WaitingSource(SlowSource):
+    """Yields nothing until ``other`` has started, so it only finishes if both run at once."""
+
+    def __init__(self, name: str, papers: list[Paper], other: threading.Event) -> None:
+        super().__init__(name, papers, delay=0.0)
+        self._other = other
+
+    def fetch(self, target_date: date, query: str):
+        if not self._other.wait(5):
+            raise RuntimeError("sources were not fetched concurrently")
+        yield from super().fetch(target_date, query)
+
+
+def test_collect_papers_runs_sources_concurrently_with_deadlines() -> None:
+    """A late source contributes partial results without holding up the others."""
+    late = GatedSource("late", [_paper("l1", "late"), _paper("l2", "late")], deadline=0.5)
+    fast = WaitingSource("fast", [_paper("f1", "fast"), _paper("f2", "fast")], late.started)
+
+    started = time.monotonic()
+    papers, per_source, errors = _collect_papers(date(2026, 1, 22), "q", [fast, late], deadline=10.0)
+    elapsed = time.monotonic() - started
+    late.release.set()
+
+    # Bounded by the late source's deadline, not by its five-second stall.
+    assert elapsed < 3.0
+    assert [paper.paper_id for paper in papers] == ["f1", "f2", "l1"]
+    assert per_source == {"fast": 2, "late": 1}
+    assert "late" in errors and "fast" not in errors
+
+
+class BatchingSource(PaperSource):
+    name = "batching"
+    batch_size = 2
+
+    def __init__(self, papers: list[Paper]) -> None:
+        self._papers = papers
+        self.searches: list[list[str]] = []
+
+    def fetch(self, target_date: date, query: str):
+        return self.fetch_batch(target_date, [query])
+
+    def fetch_batch(self, target_date: date, queries):
+        self.searches.append(sorted(queries))
+        return list(self._papers)
+
+
+def test_collect_papers_batch_shares_requests_between_channels() -> None:
+    """Upstream searches scale with distinct topics and results are split back per channel."""
+    graph = Paper("g", "Graph networks", "Message passing.", ["A"], "", date(2026, 1, 22), "batching")
+    vision = Paper("v", "Vision models", "Image encoders.", ["B"], "", date(2026, 1, 22), "batching")
+    source = BatchingSource([graph, vision])
+    queries = {"@a": "Graph networks", "@b": "graph  networks", "@c": "vision", "@d": "vision"}
+
+    candidates, per_source, errors = collect_papers_batch(date(2026, 1, 22), queries, [source])
+
+    assert source.searches == [["graph networks", "vision"]]
+    assert [p.paper_id for p in candidates["@a"]] == [p.paper_id for p in candidates["@b"]] == ["g"]
+    assert [p.paper_id for p in candidates["@c"]] == ["v"]
+    assert per_source == {"batching": 2}
+    assert errors == {}
+
+
+class AsyncSource(PaperSource):
+    name = "async"
+
+    def __init__(self, papers: list[Paper], stall: float) -> None:
+        self._papers = papers
+        self._stall = stall
+
+    def fetch(self, target_date: date, query: str):
+        raise AssertionError("the async pipeline must use afetch")
+
+    async def afetch(self, target_date: date, query: str):
+        """Yields the first paper at once and each later one after ``stall`` seconds."""
+        for idx, paper in enumerate(self._papers):
+            if idx:
+                await asyncio.sleep(self._stall)
+            yield paper
+
+
+def test_arun_digest_gathers_async_and_sync_sources(tmp_path: Path) -> None:
+    """Native async sources and sync sources (through the adapter) share one event loop and deadline."""
+    native = AsyncSource([_paper("a1", "async"), _paper("a2", "async")], stall=30.0)
+    adapted = SlowSource("sync", [_paper("s1", "sync")], delay=0.0)
+
+    started = time.monotonic()
+    digest_parts = asyncio.run(
+        arun_digest("paper", date(2026, 1, 22), sources=[native, adapted], summarizer=SimpleSummarizer(),
+                    collect_metrics=False, source_deadline=0.5, health=HealthRegistry(tmp_path / "health.json"))
+    )
+
+    assert time.monotonic() - started < 5.0
+    full_digest = "\n".join(digest_parts)
+    assert "Paper a1" in full_digest and "Paper s1" in full_digest
+    assert "Paper a2" not in full_digest
+
+
+class CountingSummarizer:
+    max_concurrency = 1
+    model = ""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.running = self.most = 0
+
+    def summarize(self, paper: Paper) -> str:
+        with self.lock:
+            self.running += 1
+            self.most = max(self.most, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return f"LLM summary of {paper.paper_id}"
+
+
+def test_concurrent_async_digests_share_the_provider_cap(tmp_path: Path) -> None:
+    summarizer = CountingSummarizer()
+    health = HealthRegistry(tmp_path / "health.json")
+
+    async def digests() -> None:
+        await asyncio.gather(*(
+            arun_digest(
+                "paper", date(2026, 1, 22), sources=[FakeSource([_paper(f"{key}{i}", "fake") for i in range(3)])],
+                summarizer=summarizer, collect_metrics=False, health=health,
+            )
+            for key in "ab"
+        ))
+
+    asyncio.run(digests())
+
+    assert summarizer.most == 1
+
+
+class BatchSummarizer:
+    max_concurrency = 2
+    model = ""
+    batch_size = 4
+    batch_tokens = 10_000
+
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    def summarize(self, paper: Paper) -> str:
+        return f"LLM summary of {paper.paper_id}"
+
+    def summarize_many(self, papers: list[Paper]) -> dict[str, str]:
+        self.batches.append(len(papers))
+        return {paper.paper_id: f"LLM summary of {paper.paper_id}" for paper in papers}
+
+
+def test_arun_digest_reads_the_store_and_batches_summaries(tmp_path: Path) -> None:
+    store = PaperStore(tmp_path / "papers.sqlite3")
+    store.upsert([_paper(f"p{i}", "fake") for i in range(6)])
+    summarizer = BatchSummarizer()
+
+    digest_parts = asyncio.run(
+        arun_digest("paper", date(2026, 1, 22), sources=[], summarizer=summarizer, collect_metrics=False,
+                    health=HealthRegistry(tmp_path / "health.json"), store=store)
+    )
+
+    assert sorted(summarizer.batches) == [2, 4]
+    assert "LLM summary of p5" in "\n".join(digest_parts)
+
+
+class SlowSummarizer:
+    max_concurrency = 4
+
+    def __init__(self, delays: dict[str, float] | None = None) -> None:
+        self.delays = delays or {}
+        self.calls: list[str] = []
+        self.barrier: threading.Barrier | None = None
+        self.release = threading.Event()
+        self.blocked: set[str] = set()
+
+    def summarize(self, paper: Paper) -> str:
+        self.calls.append(paper.paper_id)
+        if self.barrier is not None:
+            self.barrier.wait(5)
+        if paper.paper_id in self.blocked:
+            self.release.wait(5)
+        time.sleep(self.delays.get(paper.paper_id, 0.0))
+        if paper.paper_id == "p2":
+            raise RuntimeError("upstream timeout")
+        return f"LLM summary of {paper.paper_id}"
+
+
+def test_run_digest_summarizes_concurrently_with_per_paper_fallback(tmp_path: Path) -> None:
+    papers = [_paper(f"p{idx}", "fake") for idx in range(4)]
+    summarizer = SlowSummarizer()
+    # Every call waits for the other three, so the summaries only land if all four run at once.
+    summarizer.barrier = threading.Barrier(4)
+
+    digest = "\n".join(run_digest(
+        "paper", date(2026, 1, 22), sources=[FakeSource(papers)], summarizer=summarizer,
+        collect_metrics=False, health=HealthRegistry(tmp_path / "health.json"), summary_deadline=None,
+    ))
+
+    assert all(f"LLM summary of {paper_id}" in digest for paper_id in ["p0", "p1", "p3"])
+    assert "LLM summary of p2" not in digest
+
+
+def test_stream_digest_reuses_cached_summaries_but_not_fallbacks(tmp_path: Path) -> None:
+    papers = [_paper(f"p{idx}", "fake") for idx in range(4)]
+    kwargs = dict(sources=[FakeSource(papers)], collect_metrics=False, health=HealthRegistry(tmp_path / "health.json"))
+    run_digest("paper", date(2026, 1, 22), summarizer=SlowSummarizer(), **kwargs)
+
+    summarizer = SlowSummarizer()
+    digest = "\n".join(stream_digest("paper", date(2026, 1, 22), summarizer=summarizer, **kwargs))
+
+    assert summarizer.calls == ["p2"]  # the failed paper is asked for again
+    assert "LLM summary of p3" in digest
+
+
+def test_run_digest_meets_summary_deadline_and_backfills_cache(tmp_path: Path) -> None:
+    papers = [_paper("p0", "fake"), _paper("p1", "fake")]
+    summarizer = SlowSummarizer()
+    summarizer.blocked = {"p1"}
+    kwargs = dict(sources=[FakeSource(papers)], summarizer=summarizer, collect_metrics=False,
+                  health=HealthRegistry(tmp_path / "health.json"), summary_deadline=0.5)
+
+    started = time.monotonic()
+    digest = "\n".join(run_digest("paper", date(2026, 1, 22), **kwargs))
+
+    assert time.monotonic() - started < 3.0
+    assert "LLM summary of p0" in digest and "LLM summary of p1" not in digest
+    summarizer.release.set()
+    backfilled = time.monotonic() + 5
+    while get_summary_cache().get(_summary_key(summarizer, papers[1])) is None and time.monotonic() < backfilled:
+        time.sleep(0.01)
+    digest = "\n".join(run_digest("paper", date(2026, 1, 22), **kwargs))
+    assert sorted(summarizer.calls) == ["p0", "p1"]
+    assert "LLM summary of p1" in digest
+
+
+class EndlessSource(PaperSource):
+    name = "endless"
+
+    def __init__(self) -> None:
+        self.yielded = 0
+
+    def fetch(self, target_date: date, query: str):
+        while True:
+            self.yielded += 1
+            yield _paper(f"e{self.yielded}", "endless")
+
+
+def test_run_digest_caps_candidates_per_source_by_default(tmp_path: Path) -> None:
+    source = EndlessSource()
+
+    run_digest(
+        "paper", date(2026, 1, 22), limit=3, sources=[source], summarizer=SimpleSummarizer(),
+        collect_metrics=False, health=HealthRegistry(tmp_path / "health.json"),
+    )
+
+    assert source.yielded == 30
+
+
+class BlockedSummarizer:
+    max_concurrency = 8
+    model = ""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    def summarize(self, paper: Paper) -> str:
+        self.release.wait(5)
+        return f"LLM summary of {paper.paper_id}"
+
+
+def test_run_digest_batch_shares_one_summary_deadline(tmp_path: Path) -> None:
+    papers = [_paper("p0", "fake"), _paper("p1", "fake")]
+    summarizer = BlockedSummarizer()
+    queries = {f"@channel{i}": "paper" for i in range(5)}
+
+    started = time.monotonic()
+    digests = run_digest_batch(
+        queries, date(2026, 1, 22), sources=[FakeSource(papers)], summarizers={key: summarizer for key in queries},
+        collect_metrics=False, health=HealthRegistry(tmp_path / "health.json"), summary_deadline=1.0,
+    )
+    elapsed = time.monotonic() - started
+    summarizer.release.set()
+
+    # One key after another would take five deadlines.
+    assert elapsed < 3.0
+    assert list(digests) == list(queries)
+    assert all("LLM summary" not in "\n".join(parts) for parts in digests.values())
+
+
+def test_run_digest_batch_summarizes_shared_papers_once(tmp_path: Path) -> None:
+    papers = [_paper(f"s{i}", "fake") for i in range(4)]
+    summarizer = SlowSummarizer({paper.paper_id: 0.05 for paper in papers})
+    queries = {f"@channel{i}": "paper" for i in range(5)}
+
+    digests = run_digest_batch(
+        queries, date(2026, 1, 22), sources=[FakeSource(papers)], summarizers={key: summarizer for key in queries},
+        collect_metrics=False, health=HealthRegistry(tmp_path / "health.json"), summary_deadline=None,
+    )
+
+    assert sorted(summarizer.calls) == ["s0", "s1", "s2", "s3"]
+    assert all("LLM summary of s3" in "\n".join(parts) for parts in digests.values())
+
+
+def test_run_digest_revises_the_digest_as_late_summaries_land(tmp_path: Path) -> None:
+    papers = [_paper("p0", "fake"), _paper("p1", "fake")]
+    revisions: list[tuple[str, bool]] = []
+    done = threading.Event()
+
+    def on_revision(parts: list[str], final: bool) -> None:
+        revisions.append(("\n".join(parts), final))
+        if final:
+            done.set()
+
+    parts = run_digest(
+        "paper", date(2026, 1, 22), sources=[FakeSource(papers)], summarizer=SlowSummarizer({"p0": 0.1, "p1": 0.1}),
+        collect_metrics=False, health=HealthRegistry(tmp_path / "health.json"), summary_deadline=0,
+        on_revision=on_revision,
+    )
+
+    assert "LLM summary" not in "\n".join(parts)
+    assert done.wait(2)
+    final_digest, final = revisions[-1]
+    assert final and "LLM summary of p0" in final_digest and "LLM summary of p1" in final_digest
+
+
+class VerboseSummarizer(SlowSummarizer):
+    def summarize(self, paper: Paper) -> str:
+        if paper.paper_id in self.blocked:
+            self.release.wait(5)
+        return f"{paper.paper_id}: " + "long summary " * 120
+
+
+def test_stream_digest_yields_the_first_part_before_later_summaries(tmp_path: Path) -> None:
+    papers = [_paper(f"p{i}", "fake") for i in range(6)]
+    summarizer = VerboseSummarizer()
+    summarizer.blocked = {"p5"}
+    kwargs = dict(sources=[FakeSource(papers)], collect_metrics=False, health=HealthRegistry(tmp_path / "health.json"))
+
+    start = time.perf_counter()
+    parts = stream_digest("paper", date(2026, 1, 22), summarizer=summarizer, **kwargs)
+    first = next(parts)
+    first_at = time.perf_counter() - start
+    summarizer.release.set()
+    streamed = [first, *parts]
+
+    # p5 is held back for five seconds unless released, so the first part did not wait for it.
+    assert first_at < 3.0
+    assert "p0:" in first and "p5:" not in first
+    assert streamed == run_digest("paper", date(2026, 1, 22), summarizer=summarizer, **kwargs)
+
+
+def test_vector_ranked_batch_lists_every_paper_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PAPERS_DIGEST_RANKING", "vector")
+    titles = ["Protein folding", "Graph sampling", "Robot control"]
+    papers = [
+        Paper(f"v{i}", title, "Abstract.", ["A"], f"http://example.com/v{i}", date(2026, 1, 22), "fake")
+        for i, title in enumerate(titles)
+    ]
+
+    digests = run_digest_batch(
+        {"@a": "protein folding", "@b": "graph sampling"}, date(2026, 1, 22), limit=5,
+        sources=[FakeSource(papers)], summarizers={"@a": SimpleSummarizer(), "@b": SimpleSummarizer()},
+        collect_metrics=False, health=HealthRegistry(tmp_path / "health.json"),
+    )
+
+    for parts in digests.values():
+        digest = "\n".join(parts)
+        assert all(digest.count(title) == 1 for title in titles)
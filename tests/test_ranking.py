@@ -1,7 +1,7 @@
 from datetime import date
 
 from papers_digest.models import Paper
-from papers_digest.ranking import extract_keywords, rank_papers
+from papers_digest.ranking import CorpusIndex, ScoredPaper, extract_keywords, rank_papers, rank_scored, top_k
 
 
 def test_rank_papers_orders_by_query_match() -> None:
@@ -45,3 +45,52 @@ def test_extract_keywords_skips_query_terms() -> None:
     keywords = extract_keywords("diffusion", papers, top_k=3)
     assert "diffusion" not in keywords
 
+
+
+def test_bm25_prefers_rare_terms_and_title_matches() -> None:
+    def paper(paper_id: str, title: str, abstract: str) -> Paper:
+        return Paper(paper_id, title, abstract, ["A"], "", date(2026, 1, 22), "unit")
+
+    papers = [
+        paper("common", "Learning methods", "Learning learning learning."),
+        paper("rare-abstract", "A study", "We apply diffusion to learning."),
+        paper("rare-title", "Diffusion for speech", "A study of learning."),
+        paper("none", "Protein folding", "Structures."),
+    ]
+
+    ranked = rank_scored("diffusion learning", papers, limit=4)
+
+    assert [scored.paper.paper_id for scored in ranked] == ["rare-title", "rare-abstract", "common", "none"]
+    assert ranked[-1].score == 0.0
+
+
+def test_top_k_is_bounded_and_breaks_ties_by_input_order() -> None:
+    papers = [Paper(str(i), "Graph" if i % 3 == 0 else "Other", "", ["A"], "", date(2026, 1, 22), "unit") for i in range(30)]
+    reference = CorpusIndex(papers)
+
+    streamed = rank_scored("graph", iter(papers), limit=4, stats=reference)
+    indexed = rank_scored("graph", papers, limit=4)
+
+    assert [scored.paper.paper_id for scored in streamed] == ["0", "3", "6", "9"]
+    assert streamed == indexed
+    assert top_k((ScoredPaper(paper, 1.0) for paper in papers), 2) == [ScoredPaper(papers[0], 1.0), ScoredPaper(papers[1], 1.0)]
+
+
+def test_rank_many_matches_single_query_ranking() -> None:
+    papers = [
+        Paper("1", "Graph transformers", "Attention on graphs.", ["A"], "", date(2026, 1, 22), "unit"),
+        Paper("2", "Vision transformers", "Image patches.", ["A"], "", date(2026, 1, 22), "unit"),
+        Paper("3", "Protein folding", "Structures.", ["A"], "", date(2026, 1, 22), "unit"),
+        Paper("4", "Graph sampling", "Large graphs.", ["A"], "", date(2026, 1, 22), "unit"),
+    ]
+    queries = {"@a": "graph transformers", "@b": "Graph  Transformers", "@c": "vision", "@d": "quantum"}
+
+    ranked = CorpusIndex(papers).rank_many(queries, limit=2)
+
+    for key in ("@a", "@c"):
+        expected = rank_scored(queries[key], papers, limit=2)
+        assert [(s.paper.paper_id, round(s.score, 9)) for s in ranked[key]] == [
+            (s.paper.paper_id, round(s.score, 9)) for s in expected if s.score > 0
+        ]
+    assert ranked["@a"] == ranked["@b"]
+    assert ranked["@d"] == []
@@ -0,0 +1,36 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from papers_digest.ratelimit import RateLimiter, parse_rates
+
+
+def test_bucket_is_shared_between_limiter_instances(tmp_path: Path) -> None:
+    """Two limiters on the same file (as in two processes) draw from one bucket."""
+    path = tmp_path / "ratelimit.sqlite3"
+    rates = {"api.example.org": (20.0, 2.0)}
+    first = RateLimiter(path, rates)
+    second = RateLimiter(path, rates)
+
+    started = time.monotonic()
+    waits = [first.acquire("api.example.org"), second.acquire("api.example.org"), first.acquire("api.example.org")]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.03 < waits[2] <= 0.05
+    assert time.monotonic() - started >= 0.03
+    assert first.acquire("unlimited.example.org") == 0.0
+
+
+def test_parse_rates() -> None:
+    assert parse_rates("api.crossref.org=10:20, api.openalex.org=5") == {
+        "api.crossref.org": (10.0, 20.0),
+        "api.openalex.org": (5.0, 5.0),
+    }
+
+
+def test_zero_rates_are_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        parse_rates("api.crossref.org=0")
+    with pytest.raises(ValueError):
+        RateLimiter(tmp_path / "ratelimit.sqlite3", {"api.example.org": (0.0, 1.0)})
@@ -0,0 +1,127 @@
+import asyncio
+import io
+import json
+from datetime import date
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from papers_digest.cache import ResponseCache
+from papers_digest.http_client import AsyncHttpClient, HttpClient
+from papers_digest.sources.arxiv import entry_to_paper, iter_feed_entries
+from papers_digest.sources.base import FetchBudget
+from papers_digest.sources.openalex import OpenAlexSource
+
+_PAGES = {"*": ("c1", ["W1", "W2"]), "c1": ("c2", ["W3", "W4"]), "c2": (None, ["W5"])}
+
+
+class _PagedOpenAlex(BaseHTTPRequestHandler):
+    """Serves three cursor-linked OpenAlex pages."""
+
+    cursors: list[str] = []
+
+    def do_GET(self) -> None:
+        cursor = parse_qs(urlparse(self.path).query)["cursor"][0]
+        type(self).cursors.append(cursor)
+        next_cursor, ids = _PAGES[cursor]
+        body = json.dumps(
+            {
+                "meta": {"next_cursor": next_cursor},
+                "results": [{"id": f"https://openalex.org/{work}", "title": f"Work {work}"} for work in ids],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def openalex_source(http_server, tmp_path: Path):
+    _PagedOpenAlex.cursors = []
+    base_url = http_server(_PagedOpenAlex)
+
+    def make(**kwargs) -> OpenAlexSource:
+        return OpenAlexSource(
+            client=HttpClient(),
+            async_client=AsyncHttpClient(),
+            base_url=base_url,
+            cache=ResponseCache(tmp_path / "responses.sqlite3"),
+            page_size=2,
+            **kwargs,
+        )
+
+    return make
+
+
+def test_fetch_follows_cursor_through_all_pages(openalex_source) -> None:
+    papers = list(openalex_source().fetch(date(2026, 1, 22), "q"))
+
+    assert [paper.paper_id.rsplit("/", 1)[-1] for paper in papers] == ["W1", "W2", "W3", "W4", "W5"]
+    assert _PagedOpenAlex.cursors == ["*", "c1", "c2"]
+
+
+def test_afetch_pages_like_fetch(openalex_source) -> None:
+    async def collect() -> list[str]:
+        source = openalex_source()
+        papers = [paper.paper_id async for paper in source.afetch(date(2026, 1, 22), "q")]
+        await source.async_client.aclose()
+        return papers
+
+    papers = asyncio.run(collect())
+
+    assert [paper_id.rsplit("/", 1)[-1] for paper_id in papers] == ["W1", "W2", "W3", "W4", "W5"]
+    assert _PagedOpenAlex.cursors == ["*", "c1", "c2"]
+
+
+def test_fetch_stops_paging_when_consumer_or_budget_stops(openalex_source) -> None:
+    stream = openalex_source().fetch(date(2026, 1, 22), "q")
+    assert next(iter(stream)).paper_id.endswith("W1")
+    stream.close()
+    assert _PagedOpenAlex.cursors == ["*"]
+
+    _PagedOpenAlex.cursors = []
+    papers = list(openalex_source(budget=FetchBudget(max_items=3)).fetch(date(2026, 1, 22), "other"))
+    assert len(papers) == 4
+    assert _PagedOpenAlex.cursors == ["*", "c1"]
+
+
+_ARXIV_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>ArXiv Query</title>
+  <entry>
+    <id>http://arxiv.org/abs/2601.00001v2</id>
+    <published>2026-01-22T10:00:00Z</published>
+    <title>Sparse
+      attention at scale</title>
+    <summary> We scale sparse attention. </summary>
+    <author><name>Ada Lovelace</name></author>
+    <author><name>Alan Turing</name></author>
+    <link href="http://arxiv.org/abs/2601.00001v2" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2601.00001v2" rel="related" type="application/pdf"/>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/2601.00002v1</id>
+    <published>Wed, 21 Jan 2026 10:00:00 GMT</published>
+    <title>Older paper</title>
+    <summary>Older.</summary>
+  </entry>
+</feed>
+"""
+
+
+def test_streaming_atom_parser_builds_papers() -> None:
+    papers = [entry_to_paper(entry, "arxiv") for entry in iter_feed_entries(io.BytesIO(_ARXIV_FEED))]
+
+    assert [paper.published_date for paper in papers] == [date(2026, 1, 22), date(2026, 1, 21)]
+    first = papers[0]
+    assert first.paper_id == "http://arxiv.org/abs/2601.00001v2"
+    assert first.title == "Sparse attention at scale"
+    assert first.abstract == "We scale sparse attention."
+    assert first.authors == ["Ada Lovelace", "Alan Turing"]
+    assert first.url == "http://arxiv.org/abs/2601.00001v2"
@@ -0,0 +1,28 @@
+from datetime import date
+from pathlib import Path
+
+from papers_digest.models import Paper
+from papers_digest.pipeline import run_digest
+from papers_digest.store import PaperStore
+from papers_digest.summarizer import SimpleSummarizer
+
+
+def test_ingest_is_idempotent_and_serves_digests(tmp_path: Path) -> None:
+    day = date(2026, 1, 22)
+    store = PaperStore(tmp_path / "papers.sqlite3")
+    arxiv = Paper("http://arxiv.org/abs/2401.1v1", "Graph transformers", "", ["A"], "", day, "arxiv", arxiv_id="2401.1v1")
+    richer = Paper("s2", "Graph transformers", "Attention over graphs.", ["A"], "", day, "semantic_scholar", arxiv_id="2401.1")
+    other = Paper("W9", "Protein folding", "Structures.", ["B"], "", day, "openalex")
+
+    assert store.upsert([arxiv, other]) == 2
+    assert store.upsert([arxiv, other]) == 0
+    assert store.upsert([richer]) == 1
+
+    found = store.search("graph", day)
+    assert [paper.abstract for paper in found] == ["Attention over graphs."]
+    assert store.count(day) == 2
+
+    digest = "\n".join(
+        run_digest("graph", day, sources=[], summarizer=SimpleSummarizer(), collect_metrics=False, store=store)
+    )
+    assert "Graph transformers" in digest
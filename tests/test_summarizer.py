@@ -0,0 +1,83 @@
+import json
+import re
+from datetime import date
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from papers_digest.models import Paper
+from papers_digest.summarizer import ExtractiveSummarizer, OllamaSummarizer, token_batches
+
+
+class _FlakyOllama(BaseHTTPRequestHandler):
+    """Answers batches of four with broken JSON, smaller batches with proper JSON and single papers with text."""
+
+    batch_sizes: list[int] = []
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        ids = [int(idx) for idx in re.findall(r"^\[(\d+)\] ", request["prompt"], flags=re.MULTILINE)]
+        type(self).batch_sizes.append(len(ids) or 1)
+        if len(ids) == 4:
+            text = '{"summaries": [{"id": 1, "summ'
+        elif ids:
+            text = json.dumps({"summaries": [{"id": idx, "summary": f"batched {idx}"} for idx in ids]})
+        else:
+            text = "single"
+        body = json.dumps({"response": text}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def ollama_server(http_server) -> str:
+    _FlakyOllama.batch_sizes = []
+    return http_server(_FlakyOllama)
+
+
+def _paper(paper_id: str, abstract: str = "Short abstract.") -> Paper:
+    return Paper(paper_id, f"Paper {paper_id}", abstract, ["A"], "", date(2026, 1, 22), "unit")
+
+
+def test_token_batches_respect_budget_and_size() -> None:
+    papers = [_paper("1"), _paper("2", "x" * 3000), _paper("3"), _paper("4"), _paper("5")]
+
+    batches = token_batches(papers, max_tokens=600, max_papers=2)
+
+    assert [[paper.paper_id for paper in batch] for batch in batches] == [["1"], ["2"], ["3", "4"], ["5"]]
+
+
+def test_summarize_many_splits_malformed_batches(ollama_server: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OLLAMA_BASE_URL", ollama_server)
+    summarizer = OllamaSummarizer()
+    papers = [_paper(str(idx)) for idx in range(5)]
+
+    summaries = summarizer.summarize_many(papers)
+
+    assert _FlakyOllama.batch_sizes == [4, 2, 2, 1]
+    assert summaries == {"0": "batched 1", "1": "batched 2", "2": "batched 1", "3": "batched 2", "4": "single"}
+
+
+def test_extractive_summarizer_keeps_central_sentences_in_order() -> None:
+    abstract = (
+        "We thank the anonymous reviewers. "
+        "We propose a retrieval augmented prover for theorem proving, e.g. Lean proofs. "
+        "Code is available online. "
+        "The retrieval augmented prover improves theorem proving accuracy by 12 points."
+    )
+    papers = [_paper("1", abstract), _paper("2", ""), _paper("3", "Only one sentence")]
+
+    summaries = ExtractiveSummarizer().summarize_many(papers)
+
+    assert summaries["1"] == (
+        "We propose a retrieval augmented prover for theorem proving, e.g. Lean proofs. "
+        "The retrieval augmented prover improves theorem proving accuracy by 12 points."
+    )
+    assert summaries["2"] == "Краткое содержание недоступно."
+    assert summaries["3"] == "Only one sentence"
+    assert ExtractiveSummarizer().summarize(papers[0]) == summaries["1"]
@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+from papers_digest.models import Paper
+from papers_digest.trending import CountMinSketch, HeavyHitters, TrendTracker
+
+
+def _paper(idx: int, title: str, day: date) -> Paper:
+    return Paper(str(idx), title, "", ["A"], "", day, "unit")
+
+
+def test_sketch_never_undercounts_and_heavy_hitters_stay_bounded() -> None:
+    sketch, hitters = CountMinSketch(width=64, depth=4), HeavyHitters(capacity=4)
+    for idx in range(200):
+        key = "frequent" if idx % 2 else f"rare{idx}"
+        sketch.add(key)
+        hitters.add(key)
+
+    assert sketch.estimate("frequent") >= 100
+    assert len(hitters.counts) == 4
+    assert "frequent" in hitters.counts
+
+
+def test_rising_topics_compare_the_day_to_its_history(tmp_path: Path) -> None:
+    tracker = TrendTracker(tmp_path / "trends.sqlite3", width=256)
+    start = date(2026, 1, 1)
+    for offset in range(5):
+        day = start + timedelta(days=offset)
+        tracker.observe("robotics", day, [_paper(i, "Robot grasping policies", day) for i in range(10)])
+
+    day = start + timedelta(days=5)
+    papers = [_paper(i, "Robot grasping policies", day) for i in range(10)]
+    papers += [_paper(10 + i, "Diffusion planners", day) for i in range(4)]
+    tracker.observe("robotics", day, papers)
+    tracker.observe("robotics", day, papers)  # observing a day again does not double its counts
+
+    assert tracker.rising("robotics", limit=1, exclude=["robotics"]) == ["diffusion planners"]
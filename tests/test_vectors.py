@@ -0,0 +1,36 @@
+from datetime import date
+from pathlib import Path
+
+from papers_digest.models import Paper
+from papers_digest.vectors import VectorCorpus, VectorIndex
+
+
+def _paper(paper_id: str, title: str, abstract: str, day: date = date(2026, 1, 22)) -> Paper:
+    return Paper(paper_id, title, abstract, ["A"], "", day, "unit")
+
+
+_PAPERS = [
+    _paper("1", "Transformers for protein structure", "Attention models predict folding."),
+    _paper("2", "Graph sampling at scale", "Random walks on large graphs."),
+    _paper("3", "Reinforcement learning for robots", "Policy gradients in simulation."),
+]
+
+
+def test_vector_ranking_matches_word_variants() -> None:
+    ranked = VectorCorpus(_PAPERS).rank("transformer proteins", limit=3)
+
+    assert ranked[0].paper.paper_id == "1"
+    assert ranked[0].score > ranked[1].score
+
+
+def test_vector_index_is_persistent_idempotent_and_filters_by_date(tmp_path: Path) -> None:
+    index = VectorIndex(tmp_path / "vectors")
+    older = _paper("4", "Graph sampling at scale", "Random walks on large graphs.", date(2026, 1, 21))
+    keys = [f"unit:{paper.paper_id}" for paper in _PAPERS + [older]]
+
+    assert index.add(keys, _PAPERS + [older]) == 4
+    assert VectorIndex(tmp_path / "vectors").add(keys, _PAPERS + [older]) == 0
+
+    nearest = VectorIndex(tmp_path / "vectors").search("graph sampling", 2, published_date=date(2026, 1, 22))
+    assert nearest[0][0] == "unit:2"
+    assert "unit:4" not in [key for key, _ in nearest]